@@ -6,6 +6,7 @@ Inter-realm communication and coordination.
 
 from te_hau.awa.router import Router, Message, MessageType
 from te_hau.awa.bus import EventBus
+from te_hau.awa.transport import Transport, RedisStreamsTransport, UnixSocketTransport
 from te_hau.awa.whakapapa import WhakapapaGraph
 
 __all__ = [
@@ -13,5 +14,8 @@ __all__ = [
     'Message', 
     'MessageType',
     'EventBus',
+    'Transport',
+    'RedisStreamsTransport',
+    'UnixSocketTransport',
     'WhakapapaGraph'
 ]
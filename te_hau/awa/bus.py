@@ -4,10 +4,18 @@ Awa Event Bus
 Publish/subscribe event system for realms.
 """
 
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Set
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Pattern, Set, Union
 import asyncio
+import bisect
+import fnmatch
+import heapq
+import json
+import re
+import time
 import uuid
 
 
@@ -49,6 +57,17 @@ class Event:
             'payload': self.payload,
             'tags': list(self.tags)
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Event':
+        return cls(
+            id=data['id'],
+            name=data['name'],
+            source_realm=data['source_realm'],
+            timestamp=datetime.fromisoformat(data['timestamp']),
+            payload=data.get('payload') or {},
+            tags=set(data.get('tags') or ())
+        )
 
 
 EventHandler = Callable[[Event], Any]
@@ -63,6 +82,16 @@ class Subscription:
     handler: EventHandler
     realm: Optional[str] = None  # Filter by source realm
     tags: Set[str] = field(default_factory=set)  # Filter by tags
+    _regex: Optional[Pattern] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Compiled once; only patterns that aren't exact/prefix need it.
+        stars = self.pattern.count('*')
+        if self.pattern != '*' and stars == 1:
+            prefix, suffix = self.pattern.split('*')
+            self._regex = re.compile(re.escape(prefix) + '.*' + re.escape(suffix) + r'\Z', re.DOTALL)
+        elif stars > 1:
+            self._regex = re.compile(fnmatch.translate(self.pattern))
     
     def matches(self, event: Event) -> bool:
         """Check if this subscription matches an event."""
@@ -71,7 +100,7 @@ class Subscription:
             return False
         
         # Check tag filter
-        if self.tags and not self.tags.intersection(event.tags):
+        if self.tags and self.tags.isdisjoint(event.tags):
             return False
         
         # Check name pattern
@@ -82,18 +111,423 @@ class Subscription:
         if pattern == '*':
             return True
         
-        if '*' not in pattern:
+        if self._regex is None:
             return name == pattern
         
-        # Simple wildcard matching
-        parts = pattern.split('*')
-        if len(parts) == 2:
-            prefix, suffix = parts
-            return name.startswith(prefix) and name.endswith(suffix)
+        return self._regex.match(name) is not None
+
+
+class SubscriptionIndex:
+    """
+    Finds the subscriptions for an event without scanning all of them.
+    
+    Subscriptions are bucketed by realm filter (``None`` = any realm), then
+    by pattern shape:
+    - exact names in a dict,
+    - ``*`` in a set,
+    - ``prefix*`` patterns in a character trie walked along the event name,
+    - anything else as a compiled regex (checked one by one).
+    Tag filters are checked only on those candidates.
+    """
+    
+    _SUBS = '\0subs'
+    
+    def __init__(self):
+        self._realms: Dict[Optional[str], Dict[str, Any]] = {}
+    
+    def _bucket(self, realm: Optional[str]) -> Dict[str, Any]:
+        bucket = self._realms.get(realm)
+        if bucket is None:
+            bucket = {'exact': {}, 'all': {}, 'trie': {}, 'regex': {}}
+            self._realms[realm] = bucket
+        return bucket
+    
+    @staticmethod
+    def _is_prefix(pattern: str) -> bool:
+        return pattern.endswith('*') and '*' not in pattern[:-1] and len(pattern) > 1
+    
+    def add(self, sub: Subscription):
+        bucket = self._bucket(sub.realm or None)
+        if sub.pattern == '*':
+            bucket['all'][sub.id] = sub
+        elif '*' not in sub.pattern:
+            bucket['exact'].setdefault(sub.pattern, {})[sub.id] = sub
+        elif self._is_prefix(sub.pattern):
+            node = bucket['trie']
+            for ch in sub.pattern[:-1]:
+                node = node.setdefault(ch, {})
+            node.setdefault(self._SUBS, {})[sub.id] = sub
+        else:
+            bucket['regex'][sub.id] = sub
+    
+    def remove(self, sub: Subscription):
+        bucket = self._realms.get(sub.realm or None)
+        if bucket is None:
+            return
+        if sub.pattern == '*':
+            bucket['all'].pop(sub.id, None)
+        elif '*' not in sub.pattern:
+            subs = bucket['exact'].get(sub.pattern, {})
+            subs.pop(sub.id, None)
+            if not subs:
+                bucket['exact'].pop(sub.pattern, None)
+        elif self._is_prefix(sub.pattern):
+            path = [bucket['trie']]
+            for ch in sub.pattern[:-1]:
+                node = path[-1].get(ch)
+                if node is None:
+                    return
+                path.append(node)
+            path[-1].get(self._SUBS, {}).pop(sub.id, None)
+            if not path[-1].get(self._SUBS, True):
+                del path[-1][self._SUBS]
+            # prune empty trie branches
+            for depth in range(len(path) - 1, 0, -1):
+                if path[depth]:
+                    break
+                del path[depth - 1][sub.pattern[depth - 1]]
+        else:
+            bucket['regex'].pop(sub.id, None)
+    
+    def _candidates(self, bucket: Dict[str, Any], name: str) -> Iterator[Subscription]:
+        yield from bucket['all'].values()
+        yield from bucket['exact'].get(name, {}).values()
+        node = bucket['trie']
+        for ch in name:
+            node = node.get(ch)
+            if node is None:
+                break
+            yield from node.get(self._SUBS, {}).values()
+        for sub in bucket['regex'].values():
+            if sub._regex.match(name):
+                yield sub
+    
+    def match(self, event: Event) -> List[Subscription]:
+        """Subscriptions matching ``event`` (realm, pattern and tags)."""
+        matched = []
+        for realm in (None, event.source_realm):
+            bucket = self._realms.get(realm)
+            if bucket is None:
+                continue
+            for sub in self._candidates(bucket, event.name):
+                if sub.tags and sub.tags.isdisjoint(event.tags):
+                    continue
+                matched.append(sub)
+        return matched
+
+
+class _Subscriber:
+    """Bounded queue + worker task delivering events to one subscription."""
+    
+    def __init__(self, sub: Subscription, maxsize: int):
+        self.sub = sub
+        self.maxsize = maxsize
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.delivered = 0
+        self.errors = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+    
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self.task is None or self.task.done() or self.loop is not loop:
+            self.loop = loop
+            self.queue = asyncio.Queue(maxsize=self.maxsize)
+            self.task = loop.create_task(self._run())
+    
+    async def put(self, event: Event):
+        self._ensure_worker()
+        # Waits when the subscriber is maxsize events behind (backpressure).
+        await self.queue.put((time.monotonic(), event))
+    
+    async def _run(self):
+        queue = self.queue
+        while True:
+            queued_at, event = await queue.get()
+            lag = time.monotonic() - queued_at
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            try:
+                result = self.sub.handler(event)
+                if asyncio.iscoroutine(result):
+                    await result
+                self.delivered += 1
+            except Exception as e:
+                # Log error but don't stop the worker
+                self.errors += 1
+                print(f"Handler error for {event.name}: {e}")
+            finally:
+                queue.task_done()
+    
+    async def join(self):
+        if self.queue is not None and self.loop is asyncio.get_running_loop():
+            await self.queue.join()
+    
+    def stop(self):
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'pattern': self.sub.pattern,
+            'queued': self.queue.qsize() if self.queue is not None else 0,
+            'delivered': self.delivered,
+            'errors': self.errors,
+            'last_lag_ms': round(self.last_lag * 1000, 3),
+            'max_lag_ms': round(self.max_lag * 1000, 3),
+        }
+
+
+class _TimestampView:
+    """Sequence of history timestamps by position, for ``bisect``."""
+    
+    def __init__(self, history: 'EventHistory', start: int, stop: int):
+        self.history = history
+        self.start = start
+        self.stop = stop
+    
+    def __len__(self) -> int:
+        return self.stop - self.start
+    
+    def __getitem__(self, i: int) -> float:
+        return self.history._keys[(self.start + i) % self.history.capacity]
+
+
+class EventHistory:
+    """
+    Fixed-capacity ring buffer of recent events.
+    
+    Events are stored in preallocated slots by sequence number (oldest is
+    overwritten when full), with secondary indexes of sequence numbers by
+    event name, source realm and tag. Timestamp ranges are found by
+    bisection; events are kept in arrival order, so each is keyed by the
+    latest timestamp seen so far (an event that arrives late from another
+    bus sorts with its neighbours).
+    
+    With ``spill_path``, every event is also appended as a JSON line to a
+    segment file (rotated at ``segment_bytes``, ``max_segments`` kept), so
+    ``replay`` can return history older than the buffer or from before a
+    restart.
+    """
+    
+    def __init__(
+        self,
+        capacity: int = 1000,
+        spill_path: Union[str, Path, None] = None,
+        segment_bytes: int = 16 * 1024 * 1024,
+        max_segments: int = 8
+    ):
+        self.capacity = capacity
+        self._slots: List[Optional[Event]] = [None] * capacity
+        self._keys: List[float] = [0.0] * capacity
+        self._next = 0  # sequence number of the next event
+        self._last_key = float('-inf')
+        self._by_name: Dict[str, Deque[int]] = {}
+        self._by_realm: Dict[str, Deque[int]] = {}
+        self._by_tag: Dict[str, Deque[int]] = {}
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self._spill = None
+    
+    def __len__(self) -> int:
+        return min(self._next, self.capacity)
+    
+    def __iter__(self) -> Iterator[Event]:
+        for seq in range(self._oldest(), self._next):
+            yield self._slots[seq % self.capacity]
+    
+    def _oldest(self) -> int:
+        return max(0, self._next - self.capacity)
+    
+    @staticmethod
+    def _unindex(index: Dict[str, Deque[int]], key: str, seq: int):
+        seqs = index.get(key)
+        if seqs and seqs[0] == seq:
+            seqs.popleft()
+            if not seqs:
+                del index[key]
+    
+    def append(self, event: Event):
+        seq = self._next
+        slot = seq % self.capacity
+        old = self._slots[slot]
+        if old is not None:
+            # The overwritten event is the oldest entry in each of its indexes.
+            evicted = seq - self.capacity
+            self._unindex(self._by_name, old.name, evicted)
+            self._unindex(self._by_realm, old.source_realm, evicted)
+            for tag in old.tags:
+                self._unindex(self._by_tag, tag, evicted)
+        
+        self._last_key = max(self._last_key, event.timestamp.timestamp())
+        self._slots[slot] = event
+        self._keys[slot] = self._last_key
+        self._by_name.setdefault(event.name, deque()).append(seq)
+        self._by_realm.setdefault(event.source_realm, deque()).append(seq)
+        for tag in event.tags:
+            self._by_tag.setdefault(tag, deque()).append(seq)
+        self._next = seq + 1
+        
+        if self.spill_path is not None:
+            self._write_spill(event)
+    
+    def _seq_range(self, since: Optional[datetime], until: Optional[datetime]) -> range:
+        start, stop = self._oldest(), self._next
+        view = _TimestampView(self, start, stop)
+        lo = bisect.bisect_left(view, since.timestamp()) if since else 0
+        hi = bisect.bisect_right(view, until.timestamp()) if until else len(view)
+        return range(start + lo, start + hi)
+    
+    def _candidates(self, sub: Subscription, seqs: range) -> Iterable[int]:
+        """Newest-first sequence numbers worth checking, from the narrowest index."""
+        options = []
+        if '*' not in sub.pattern:
+            options.append(self._by_name.get(sub.pattern, ()))
+        if sub.realm:
+            options.append(self._by_realm.get(sub.realm, ()))
+        if sub.tags:
+            tagged = [self._by_tag.get(tag, ()) for tag in sub.tags]
+            if len(tagged) == 1:
+                options.append(tagged[0])
+            else:
+                options.append(_merged(tagged))
+        if not options:
+            return reversed(seqs)
+        return reversed(min(options, key=len))
+    
+    def query(
+        self,
+        pattern: str = '*',
+        realm: str = None,
+        tags: Set[str] = None,
+        since: datetime = None,
+        until: datetime = None,
+        limit: int = 100
+    ) -> List[Event]:
+        """
+        Most recent ``limit`` events matching the filters, oldest first.
         
-        # More complex patterns
-        import fnmatch
-        return fnmatch.fnmatch(name, pattern)
+        Args:
+            pattern: Event name pattern (supports * wildcards)
+            realm: Source realm to filter
+            tags: Only events with at least one of these tags
+            since: Only events at or after this time
+            until: Only events at or before this time
+            limit: Maximum events to return
+            
+        Returns:
+            List of matching events
+        """
+        sub = Subscription(id='query', pattern=pattern, handler=lambda e: None, realm=realm, tags=tags or set())
+        seqs = self._seq_range(since, until)
+        found: List[Event] = []
+        if limit <= 0 or not seqs:
+            return found
+        for seq in self._candidates(sub, seqs):
+            if seq >= seqs.stop:
+                continue
+            if seq < seqs.start:
+                break
+            event = self._slots[seq % self.capacity]
+            if sub.matches(event):
+                found.append(event)
+                if len(found) >= limit:
+                    break
+        found.reverse()
+        return found
+    
+    def _segments(self) -> List[Path]:
+        """Spill segment files, oldest first (``name.N`` are rotated, higher N is older)."""
+        path = self.spill_path
+        rotated = []
+        for candidate in path.parent.glob(path.name + '.*'):
+            suffix = candidate.name[len(path.name) + 1:]
+            if suffix.isdigit():
+                rotated.append((int(suffix), candidate))
+        rotated.sort(reverse=True)
+        segments = [p for _, p in rotated]
+        if path.exists():
+            segments.append(path)
+        return segments
+    
+    def _write_spill(self, event: Event):
+        if self._spill is None:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._spill = open(self.spill_path, 'a', encoding='utf-8')
+        self._spill.write(json.dumps(event.to_dict(), default=str, ensure_ascii=False) + '\n')
+        self._spill.flush()
+        if self._spill.tell() >= self.segment_bytes:
+            self._rotate()
+    
+    def _rotate(self):
+        self._spill.close()
+        self._spill = None
+        for n in range(self.max_segments - 1, 0, -1):
+            src = self.spill_path.with_name(f"{self.spill_path.name}.{n}")
+            if src.exists():
+                if n + 1 >= self.max_segments:
+                    src.unlink()
+                else:
+                    src.replace(self.spill_path.with_name(f"{self.spill_path.name}.{n + 1}"))
+        self.spill_path.replace(self.spill_path.with_name(f"{self.spill_path.name}.1"))
+    
+    def replay(
+        self,
+        pattern: str = '*',
+        realm: str = None,
+        since: datetime = None
+    ) -> Iterator[Event]:
+        """
+        Yield every spilled event (oldest first) matching the filters.
+        
+        Falls back to the in-memory buffer when no spill file is configured.
+        """
+        sub = Subscription(id='replay', pattern=pattern, handler=lambda e: None, realm=realm)
+        if self.spill_path is None:
+            for event in self:
+                if sub.matches(event) and (since is None or event.timestamp >= since):
+                    yield event
+            return
+        if self._spill is not None:
+            self._spill.flush()
+        for segment in self._segments():
+            with open(segment, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = Event.from_dict(json.loads(line))
+                    except (ValueError, KeyError):
+                        continue  # torn last line from a crash
+                    if sub.matches(event) and (since is None or event.timestamp >= since):
+                        yield event
+    
+    def load(self, limit: int = None):
+        """Refill the buffer from the spill file (e.g. after a restart)."""
+        if self.spill_path is None:
+            return
+        recent = deque(self.replay(), maxlen=min(limit or self.capacity, self.capacity))
+        spill, self.spill_path = self.spill_path, None
+        try:
+            for event in recent:
+                self.append(event)
+        finally:
+            self.spill_path = spill
+    
+    def close(self):
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+
+def _merged(indexes: List[Iterable[int]]) -> List[int]:
+    """Union of ascending sequence-number indexes, ascending and de-duplicated."""
+    merged: List[int] = []
+    for seq in heapq.merge(*indexes):
+        if not merged or merged[-1] != seq:
+            merged.append(seq)
+    return merged
 
 
 class EventBus:
@@ -105,13 +539,28 @@ class EventBus:
     - Tag filtering
     - Realm filtering
     - Async handlers
+    
+    Matching goes through a ``SubscriptionIndex``. Each subscription has its
+    own bounded queue and worker, so handlers run concurrently and a slow
+    one only backs up its own queue; ``publish`` waits only when a matching
+    subscriber is ``queue_size`` events behind. ``await drain()`` waits
+    until every queued event has been handled.
     """
     
-    def __init__(self, realm_name: str):
+    def __init__(
+        self,
+        realm_name: str,
+        queue_size: int = 1000,
+        max_history: int = 1000,
+        history_path: Union[str, Path, None] = None
+    ):
         self.realm_name = realm_name
+        self.queue_size = queue_size
         self.subscriptions: Dict[str, Subscription] = {}
-        self.event_history: List[Event] = []
-        self.max_history = 1000
+        self._index = SubscriptionIndex()
+        self._subscribers: Dict[str, _Subscriber] = {}
+        self.event_history = EventHistory(max_history, spill_path=history_path)
+        self.max_history = max_history
         self._connected_buses: Dict[str, 'EventBus'] = {}
     
     def subscribe(
@@ -135,20 +584,25 @@ class EventBus:
         """
         sub_id = f"sub_{uuid.uuid4().hex[:8]}"
         
-        self.subscriptions[sub_id] = Subscription(
+        sub = Subscription(
             id=sub_id,
             pattern=pattern,
             handler=handler,
             realm=realm,
             tags=tags or set()
         )
+        self.subscriptions[sub_id] = sub
+        self._index.add(sub)
+        self._subscribers[sub_id] = _Subscriber(sub, self.queue_size)
         
         return sub_id
     
     def unsubscribe(self, subscription_id: str):
         """Unsubscribe from events."""
         if subscription_id in self.subscriptions:
-            del self.subscriptions[subscription_id]
+            sub = self.subscriptions.pop(subscription_id)
+            self._index.remove(sub)
+            self._subscribers.pop(subscription_id).stop()
     
     async def publish(
         self,
@@ -178,8 +632,6 @@ class EventBus:
         
         # Store in history
         self.event_history.append(event)
-        if len(self.event_history) > self.max_history:
-            self.event_history.pop(0)
         
         # Dispatch to local subscribers
         await self._dispatch(event)
@@ -192,23 +644,25 @@ class EventBus:
         return event
     
     async def _dispatch(self, event: Event):
-        """Dispatch event to matching subscribers."""
-        for sub in self.subscriptions.values():
-            if sub.matches(event):
-                try:
-                    result = sub.handler(event)
-                    if asyncio.iscoroutine(result):
-                        await result
-                except Exception as e:
-                    # Log error but don't stop other handlers
-                    print(f"Handler error for {event.name}: {e}")
+        """Queue event for each matching subscriber."""
+        for sub in self._index.match(event):
+            subscriber = self._subscribers.get(sub.id)
+            if subscriber is not None:
+                await subscriber.put(event)
+    
+    async def drain(self):
+        """Wait until every subscriber has handled everything queued so far."""
+        for subscriber in list(self._subscribers.values()):
+            await subscriber.join()
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-subscription queue depth, delivery counts and lag."""
+        return {sub_id: s.stats() for sub_id, s in self._subscribers.items()}
     
     async def _receive(self, event: Event):
         """Receive an event from another bus."""
         # Store in history
         self.event_history.append(event)
-        if len(self.event_history) > self.max_history:
-            self.event_history.pop(0)
         
         # Dispatch locally
         await self._dispatch(event)
@@ -229,7 +683,10 @@ class EventBus:
         self,
         pattern: str = '*',
         realm: str = None,
-        limit: int = 100
+        limit: int = 100,
+        tags: Set[str] = None,
+        since: datetime = None,
+        until: datetime = None
     ) -> List[Event]:
         """
         Get event history.
@@ -238,19 +695,25 @@ class EventBus:
             pattern: Event name pattern to filter
             realm: Source realm to filter
             limit: Maximum events to return
+            tags: Only events with at least one of these tags
+            since: Only events at or after this time
+            until: Only events at or before this time
             
         Returns:
             List of matching events
         """
-        sub = Subscription(
-            id='query',
+        return self.event_history.query(
             pattern=pattern,
-            handler=lambda e: None,
-            realm=realm
+            realm=realm,
+            tags=tags,
+            since=since,
+            until=until,
+            limit=limit
         )
-        
-        matching = [e for e in self.event_history if sub.matches(e)]
-        return matching[-limit:]
+    
+    def replay_history(self, pattern: str = '*', realm: str = None, since: datetime = None) -> Iterator[Event]:
+        """Replay events from the history spill file (see ``EventHistory.replay``)."""
+        return self.event_history.replay(pattern=pattern, realm=realm, since=since)
 
 
 # Common event names
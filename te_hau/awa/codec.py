@@ -0,0 +1,137 @@
+"""
+Awa Codec
+
+Canonical encoding, keyed signing and wire framing for Awa messages.
+
+- ``canonical_json``: the one serialisation used for signatures (sorted
+  keys, compact separators, UTF-8).
+- ``Signer``: HMAC-SHA256 with the keyed context built once per key;
+  each signature copies it instead of re-hashing the key.
+- ``pack_frame`` / ``unpack_frame``: a 5-byte header (format code +
+  body length) followed by the body, as JSON or, when the libraries
+  are installed, msgpack or CBOR.
+"""
+
+from functools import lru_cache
+from typing import Any, Iterable, List, Tuple, Union
+import hashlib
+import hmac
+import json
+import struct
+
+JSON = 'json'
+MSGPACK = 'msgpack'
+CBOR = 'cbor'
+
+_FORMAT_CODES = {JSON: 0, MSGPACK: 1, CBOR: 2}
+_FORMAT_NAMES = {code: name for name, code in _FORMAT_CODES.items()}
+_HEADER = struct.Struct('>BI')
+HEADER_SIZE = _HEADER.size
+
+
+def canonical_json(value: Any) -> bytes:
+    """Deterministic JSON bytes for hashing and signing."""
+    return json.dumps(
+        value, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str
+    ).encode('utf-8')
+
+
+class Signer:
+    """HMAC-SHA256 signer for one key."""
+
+    def __init__(self, key: Union[str, bytes]):
+        key_bytes = key.encode('utf-8') if isinstance(key, str) else key
+        self._context = hmac.new(key_bytes, digestmod=hashlib.sha256)
+        self.key_id = hashlib.sha256(key_bytes).hexdigest()[:16]
+
+    def sign(self, data: bytes) -> str:
+        mac = self._context.copy()
+        mac.update(data)
+        return mac.hexdigest()
+
+    def verify(self, data: bytes, signature: str) -> bool:
+        if not isinstance(signature, str):
+            return False
+        return hmac.compare_digest(self.sign(data), signature)
+
+    def verify_batch(self, items: Iterable[Tuple[bytes, str]]) -> List[bool]:
+        """Verify many ``(data, signature)`` pairs against this key."""
+        return [self.verify(data, signature) for data, signature in items]
+
+
+@lru_cache(maxsize=64)
+def get_signer(key: Union[str, bytes]) -> Signer:
+    """Cached ``Signer`` per key."""
+    return Signer(key)
+
+
+def _codec(fmt: str):
+    if fmt == MSGPACK:
+        try:
+            import msgpack
+        except ImportError:
+            raise ImportError("msgpack package required. Install with: pip install msgpack")
+        return (
+            lambda value: msgpack.packb(value, use_bin_type=True, default=str),
+            lambda data: msgpack.unpackb(data, raw=False),
+        )
+    if fmt == CBOR:
+        try:
+            import cbor2
+        except ImportError:
+            raise ImportError("cbor2 package required. Install with: pip install cbor2")
+        return cbor2.dumps, cbor2.loads
+    if fmt == JSON:
+        return (
+            lambda value: json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8'),
+            json.loads,
+        )
+    raise ValueError(f"Unknown wire format: {fmt}")
+
+
+def dumps(value: Any, fmt: str = JSON) -> bytes:
+    return _codec(fmt)[0](value)
+
+
+def loads(data: bytes, fmt: str = JSON) -> Any:
+    return _codec(fmt)[1](data)
+
+
+def pack_frame(body: bytes, fmt: str = JSON) -> bytes:
+    """Prefix ``body`` with its format code and length."""
+    return _HEADER.pack(_FORMAT_CODES[fmt], len(body)) + body
+
+
+def unpack_header(header: bytes) -> Tuple[str, int]:
+    """``(format, body_length)`` from the first ``HEADER_SIZE`` bytes of a frame."""
+    if len(header) < HEADER_SIZE:
+        raise ValueError("Truncated frame header")
+    code, length = _HEADER.unpack(header[:HEADER_SIZE])
+    if code not in _FORMAT_NAMES:
+        raise ValueError(f"Unknown wire format code: {code}")
+    return _FORMAT_NAMES[code], length
+
+
+def unpack_frame(frame: bytes) -> Tuple[str, bytes]:
+    """``(format, body)`` of a complete frame."""
+    fmt, length = unpack_header(frame)
+    body = frame[HEADER_SIZE:HEADER_SIZE + length]
+    if len(body) != length:
+        raise ValueError("Truncated frame")
+    return fmt, body
+
+
+__all__ = [
+    'JSON',
+    'MSGPACK',
+    'CBOR',
+    'HEADER_SIZE',
+    'Signer',
+    'canonical_json',
+    'get_signer',
+    'dumps',
+    'loads',
+    'pack_frame',
+    'unpack_header',
+    'unpack_frame',
+]
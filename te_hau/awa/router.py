@@ -7,12 +7,17 @@ Message routing between realms.
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
 import asyncio
 import json
 import hashlib
 import uuid
 
+from te_hau.awa import codec
+
+if TYPE_CHECKING:
+    from te_hau.awa.transport import Transport
+
 
 class MessageType(Enum):
     """Types of inter-realm messages."""
@@ -68,6 +73,11 @@ class Message:
     payload: Dict[str, Any]
     auth: Optional[Dict[str, str]] = None
     reply_to: Optional[str] = None
+    _payload_bytes: Optional[Tuple[Dict[str, Any], bytes]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    SIGNATURE_ALG = 'hmac-sha256'
     
     @classmethod
     def create(
@@ -91,8 +101,33 @@ class Message:
             reply_to=reply_to
         )
     
-    def sign(self, bearer_key: str):
-        """Sign the message with bearer key."""
+    def payload_bytes(self) -> bytes:
+        """
+        Canonical JSON of the payload, serialised once and reused by
+        ``sign``, ``verify`` and ``to_wire``.
+        
+        The cache follows the ``payload`` object: assigning a new payload
+        re-serialises, but a payload mutated in place after signing is
+        not picked up (sign again after building it).
+        """
+        cached = self._payload_bytes
+        if cached is None or cached[0] is not self.payload:
+            cached = (self.payload, codec.canonical_json(self.payload))
+            self._payload_bytes = cached
+        return cached[1]
+    
+    def _signing_input(self) -> bytes:
+        header = codec.canonical_json({
+            'id': self.id,
+            'timestamp': self.timestamp.isoformat(),
+            'source': self.source.realm,
+            'target': self.target.realm,
+            'type': self.type.value
+        })
+        return header + b'\n' + self.payload_bytes()
+    
+    def _legacy_signature(self, bearer_key: str) -> str:
+        """Pre-HMAC ``sha256(json + key)`` signature, still accepted by ``verify``."""
         content = json.dumps({
             'id': self.id,
             'timestamp': self.timestamp.isoformat(),
@@ -102,13 +137,17 @@ class Message:
             'payload': self.payload
         }, sort_keys=True)
         
-        signature = hashlib.sha256(
+        return hashlib.sha256(
             (content + bearer_key).encode()
         ).hexdigest()
-        
+    
+    def sign(self, bearer_key: str):
+        """Sign the message with bearer key (HMAC-SHA256)."""
+        signer = codec.get_signer(bearer_key)
         self.auth = {
-            'bearer_hash': hashlib.sha256(bearer_key.encode()).hexdigest()[:16],
-            'signature': signature
+            'alg': self.SIGNATURE_ALG,
+            'bearer_hash': signer.key_id,
+            'signature': signer.sign(self._signing_input())
         }
     
     def verify(self, bearer_key: str) -> bool:
@@ -116,24 +155,19 @@ class Message:
         if not self.auth:
             return False
         
-        expected_hash = hashlib.sha256(bearer_key.encode()).hexdigest()[:16]
-        if self.auth.get('bearer_hash') != expected_hash:
+        signer = codec.get_signer(bearer_key)
+        if self.auth.get('bearer_hash') != signer.key_id:
             return False
         
-        content = json.dumps({
-            'id': self.id,
-            'timestamp': self.timestamp.isoformat(),
-            'source': self.source.realm,
-            'target': self.target.realm,
-            'type': self.type.value,
-            'payload': self.payload
-        }, sort_keys=True)
-        
-        expected_sig = hashlib.sha256(
-            (content + bearer_key).encode()
-        ).hexdigest()
+        if self.auth.get('alg') == self.SIGNATURE_ALG:
+            return signer.verify(self._signing_input(), self.auth.get('signature'))
         
-        return self.auth.get('signature') == expected_sig
+        return self.auth.get('signature') == self._legacy_signature(bearer_key)
+    
+    @classmethod
+    def verify_batch(cls, messages: Iterable['Message'], bearer_key: str) -> List[bool]:
+        """Verify a bulk delivery against one key."""
+        return [message.verify(bearer_key) for message in messages]
     
     def to_dict(self) -> Dict:
         """Convert to dictionary."""
@@ -156,6 +190,33 @@ class Message:
             'reply_to': self.reply_to
         }
     
+    def to_wire(self, fmt: str = codec.JSON) -> bytes:
+        """
+        Encode as one length-prefixed frame (see ``te_hau.awa.codec``).
+        
+        A JSON frame is the header object, a newline, then the cached
+        canonical payload bytes, so the payload is serialised once per hop
+        and the receiver verifies the signature over the bytes it got.
+        """
+        data = self.to_dict()
+        if fmt != codec.JSON:
+            return codec.pack_frame(codec.dumps(data, fmt), fmt)
+        del data['payload']
+        return codec.pack_frame(codec.dumps(data) + b'\n' + self.payload_bytes())
+    
+    @classmethod
+    def from_wire(cls, frame: bytes) -> 'Message':
+        """Decode a frame produced by ``to_wire``."""
+        fmt, body = codec.unpack_frame(frame)
+        if fmt != codec.JSON:
+            return cls.from_dict(codec.loads(body, fmt))
+        head, _, payload = body.partition(b'\n')
+        data = codec.loads(head)
+        data['payload'] = codec.loads(payload)
+        message = cls.from_dict(data)
+        message._payload_bytes = (message.payload, payload)
+        return message
+    
     @classmethod
     def from_dict(cls, data: Dict) -> 'Message':
         """Create from dictionary."""
@@ -187,15 +248,36 @@ class Router:
     Routes messages between realms.
     
     Handles message delivery, queuing, and handler dispatch.
+    
+    Realms connected in-process (``connect``) are called directly; any
+    other target goes through ``transport`` (see ``te_hau.awa.transport``),
+    which must be started with ``await router.start()``.
     """
     
-    def __init__(self, realm_name: str, bearer_key: str = None):
+    def __init__(self, realm_name: str, bearer_key: str = None, transport: 'Transport' = None):
         self.realm_name = realm_name
         self.bearer_key = bearer_key
         self.handlers: Dict[MessageType, List[MessageHandler]] = {}
         self.pending_responses: Dict[str, asyncio.Future] = {}
         self.connected_realms: Dict[str, 'Router'] = {}  # For local routing
+        self.transport = transport
+        self._running = False
+    
+    async def start(self):
+        """Start receiving from the transport (if any)."""
+        if self.transport and not self._running:
+            await self.transport.start(self)
+        self._running = True
+    
+    async def stop(self):
+        """Stop the transport and fail any requests still waiting for a reply."""
+        if self.transport and self._running:
+            await self.transport.close()
         self._running = False
+        for future in self.pending_responses.values():
+            if not future.done():
+                future.cancel()
+        self.pending_responses.clear()
     
     def on(self, msg_type: MessageType, handler: MessageHandler):
         """Register a handler for a message type."""
@@ -230,25 +312,27 @@ class Router:
         target_router = self.connected_realms.get(message.target.realm)
         
         if target_router:
-            # Local delivery
-            if wait_response:
-                future = asyncio.get_event_loop().create_future()
-                self.pending_responses[message.id] = future
-                
-                await target_router.receive(message)
-                
-                try:
-                    return await asyncio.wait_for(future, timeout=30.0)
-                except asyncio.TimeoutError:
-                    del self.pending_responses[message.id]
-                    raise TimeoutError(f"No response to message {message.id}")
-            else:
-                await target_router.receive(message)
+            deliver = target_router.receive
+        elif self.transport:
+            if not self._running:
+                raise RuntimeError("Router.start() must be awaited before sending through a transport")
+            deliver = self.transport.send
         else:
-            # Remote delivery would go here (Redis, Kafka, etc.)
             raise NotImplementedError("Remote routing requires an adapter")
         
-        return None
+        if not wait_response:
+            await deliver(message)
+            return None
+        
+        future = asyncio.get_event_loop().create_future()
+        self.pending_responses[message.id] = future
+        try:
+            await deliver(message)
+            return await asyncio.wait_for(future, timeout=30.0)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"No response to message {message.id}")
+        finally:
+            self.pending_responses.pop(message.id, None)
     
     async def receive(self, message: Message):
         """
@@ -287,6 +371,8 @@ class Router:
         target_router = self.connected_realms.get(message.target.realm)
         if target_router:
             await target_router.receive(message)
+        elif self.transport and self._running:
+            await self.transport.send(message)
     
     def connect(self, other_router: 'Router'):
         """Connect to another router (local/in-memory connection)."""
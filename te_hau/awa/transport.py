@@ -0,0 +1,461 @@
+"""
+Awa Transports
+
+Cross-process delivery for ``Router`` when the target realm is not
+connected in-process.
+
+- ``RedisStreamsTransport``: one stream per realm, read through a
+  consumer group; sends are batched into pipelined XADDs, reads use
+  XREADGROUP with COUNT, and entries are XACKed after the router has
+  handled them. Entries left unacked by a crashed consumer are reclaimed
+  with XAUTOCLAIM (at-least-once delivery).
+- ``UnixSocketTransport``: one listening socket per realm in a shared
+  directory; ``codec`` frames, acked by message id, with
+  unacked frames resent after a reconnect.
+
+Because delivery is at-least-once, handlers may see a message twice.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple, Union, TYPE_CHECKING
+import asyncio
+import os
+import socket
+import struct
+
+from te_hau.awa import codec
+from te_hau.awa.router import Message
+
+if TYPE_CHECKING:
+    from te_hau.awa.router import Router
+
+
+def encode_message(message: Message, fmt: str = codec.JSON) -> bytes:
+    return message.to_wire(fmt)
+
+
+def decode_message(frame: bytes) -> Message:
+    return Message.from_wire(frame)
+
+
+class Transport:
+    """
+    Base class for router transports.
+
+    ``Router.start`` calls ``start(router)``; inbound messages are handed to
+    ``deliver``, which runs ``router.receive`` as a task (up to
+    ``max_inflight`` at once, so a handler awaiting a reply doesn't block
+    the reader) and calls ``ack`` when it finishes.
+    """
+
+    def __init__(self, max_inflight: int = 64, wire_format: str = codec.JSON):
+        self.router: Optional['Router'] = None
+        self.max_inflight = max_inflight
+        self.wire_format = wire_format
+        self._inflight: Set[asyncio.Task] = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def start(self, router: 'Router'):
+        self.router = router
+        self._slots = asyncio.Semaphore(self.max_inflight)
+
+    async def send(self, message: Message):
+        raise NotImplementedError
+
+    async def close(self):
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def deliver(self, message: Message, ack=None):
+        """Hand an inbound message to the router; ``ack`` is awaited once it is handled."""
+        await self._slots.acquire()
+        task = asyncio.create_task(self._handle(message, ack))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _handle(self, message: Message, ack):
+        try:
+            await self.router.receive(message)
+        except Exception as e:
+            print(f"Awa transport: error handling {message.id}: {e}")
+        finally:
+            self._slots.release()
+            if ack is not None:
+                try:
+                    await ack()
+                except Exception:
+                    pass  # not acked: the message will be delivered again
+
+
+# ─────────────────────────────────────────────────────────────
+# Redis Streams
+# ─────────────────────────────────────────────────────────────
+
+class RedisStreamsTransport(Transport):
+    """
+    Redis Streams transport.
+
+    Each realm reads ``<prefix>:<realm>`` through consumer group ``group``.
+    Several processes for the same realm share its messages; give each a
+    distinct ``consumer`` name (defaults to hostname + pid).
+    """
+
+    def __init__(
+        self,
+        url: str = 'redis://localhost:6379/0',
+        client: Any = None,
+        prefix: str = 'awa:stream',
+        group: str = 'router',
+        consumer: str = None,
+        batch_size: int = 100,
+        block_ms: int = 1000,
+        claim_idle_ms: int = 30000,
+        maxlen: int = 100000,
+        max_inflight: int = 64,
+        wire_format: str = codec.JSON
+    ):
+        super().__init__(max_inflight=max_inflight, wire_format=wire_format)
+        if client is None:
+            try:
+                from redis import asyncio as aioredis
+            except ImportError:
+                raise ImportError("redis package required. Install with: pip install redis")
+            client = aioredis.from_url(url)
+        self.redis = client
+        self.prefix = prefix
+        self.group = group
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.maxlen = maxlen
+        self._outbox: List[Tuple[str, bytes, asyncio.Future]] = []
+        self._outbox_ready: Optional[asyncio.Event] = None
+        self._acks: List[bytes] = []
+        self._reader: Optional[asyncio.Task] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._closing = False
+        self._flusher_done = False
+
+    def stream_for(self, realm: str) -> str:
+        return f"{self.prefix}:{realm}"
+
+    async def start(self, router: 'Router'):
+        await super().start(router)
+        self.stream = self.stream_for(router.realm_name)
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id='0', mkstream=True)
+        except Exception as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+        self._outbox_ready = asyncio.Event()
+        self._flusher = asyncio.create_task(self._flush_loop())
+        self._reader = asyncio.create_task(self._read_loop())
+
+    async def send(self, message: Message):
+        """Queue for the next pipelined XADD batch; returns once it is written."""
+        future = asyncio.get_running_loop().create_future()
+        self._outbox.append((self.stream_for(message.target.realm), encode_message(message, self.wire_format), future))
+        self._outbox_ready.set()
+        await future
+
+    async def _flush_loop(self):
+        while True:
+            await self._outbox_ready.wait()
+            self._outbox_ready.clear()
+            while self._outbox:
+                batch, self._outbox = self._outbox[:self.batch_size], self._outbox[self.batch_size:]
+                pipe = self.redis.pipeline(transaction=False)
+                for stream, data, _ in batch:
+                    pipe.xadd(stream, {'m': data}, maxlen=self.maxlen, approximate=True)
+                try:
+                    await pipe.execute()
+                except Exception as e:
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+            if self._flusher_done:
+                return
+
+    async def _ack(self, entry_id: bytes):
+        self._acks.append(entry_id)
+
+    async def _flush_acks(self):
+        if self._acks:
+            ids, self._acks = self._acks, []
+            await self.redis.xack(self.stream, self.group, *ids)
+
+    async def _reclaim(self) -> List[Tuple[bytes, Dict]]:
+        """Entries other consumers left pending for longer than ``claim_idle_ms``."""
+        try:
+            result = await self.redis.xautoclaim(
+                self.stream, self.group, self.consumer,
+                min_idle_time=self.claim_idle_ms, start_id='0-0', count=self.batch_size
+            )
+        except Exception:
+            return []
+        return result[1] if len(result) > 1 else []
+
+    async def _read_loop(self):
+        # Our own unacked entries from a previous run come first.
+        backlog: Optional[bytes] = b'0'
+        next_claim = 0.0
+        while not self._closing:
+            try:
+                await self._flush_acks()
+                if backlog is not None:
+                    response = await self.redis.xreadgroup(
+                        self.group, self.consumer, {self.stream: backlog}, count=self.batch_size
+                    )
+                    entries = response[0][1] if response else []
+                    backlog = entries[-1][0] if entries else None
+                else:
+                    response = await self.redis.xreadgroup(
+                        self.group, self.consumer, {self.stream: '>'},
+                        count=self.batch_size, block=self.block_ms
+                    )
+                    entries = response[0][1] if response else []
+                loop_time = asyncio.get_running_loop().time()
+                if not entries and loop_time >= next_claim:
+                    next_claim = loop_time + max(self.claim_idle_ms, self.block_ms) / 2000
+                    entries = await self._reclaim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Awa transport: read error on {self.stream}: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if not entries:
+                await asyncio.sleep(0)
+                continue
+            for entry_id, fields in entries:
+                if not fields:
+                    continue  # trimmed before we claimed it
+                data = fields.get(b'm', fields.get('m'))
+                try:
+                    message = decode_message(data)
+                except (ValueError, KeyError, TypeError):
+                    await self._ack(entry_id)  # unreadable: don't redeliver forever
+                    continue
+                await self.deliver(message, ack=lambda entry_id=entry_id: self._ack(entry_id))
+
+    async def close(self):
+        self._closing = True
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+        # In-flight handlers may still send replies through the flusher.
+        await super().close()
+        if self._flusher is not None:
+            self._flusher_done = True
+            self._outbox_ready.set()
+            await self._flusher
+        await self._flush_acks()
+        result = getattr(self.redis, 'aclose', self.redis.close)()
+        if asyncio.iscoroutine(result):
+            await result
+
+
+# ─────────────────────────────────────────────────────────────
+# Unix socket
+# ─────────────────────────────────────────────────────────────
+
+# Messages travel as codec frames; acks back to the sender are
+# length-prefixed message ids.
+_ACK = struct.Struct('>I')
+
+
+async def _read_ack(reader: asyncio.StreamReader) -> str:
+    header = await reader.readexactly(_ACK.size)
+    return (await reader.readexactly(_ACK.unpack(header)[0])).decode()
+
+
+def _ack_frame(message_id: str) -> bytes:
+    data = message_id.encode()
+    return _ACK.pack(len(data)) + data
+
+
+class _Peer:
+    """
+    Outbound connection to one realm, with frames kept until acked.
+
+    If the connection drops with frames still unacked, it is re-opened in
+    the background (with backoff, until ``close``) and they are resent.
+    """
+
+    def __init__(self, path: Path, retries: int = 3):
+        self.path = path
+        self.retries = retries
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.acks: Optional[asyncio.Task] = None
+        self.recovery: Optional[asyncio.Task] = None
+        self.unacked: 'OrderedDict[str, bytes]' = OrderedDict()
+        self.lock = asyncio.Lock()
+        self.closed = False
+
+    @property
+    def connected(self) -> bool:
+        return self.writer is not None and not self.writer.is_closing() and not self.acks.done()
+
+    async def _connect(self):
+        reader, self.writer = await asyncio.open_unix_connection(str(self.path))
+        self.acks = asyncio.create_task(self._read_acks(reader))
+        # Anything not acked on the old connection goes again.
+        for frame in self.unacked.values():
+            self.writer.write(frame)
+        await self.writer.drain()
+
+    async def _read_acks(self, reader: asyncio.StreamReader):
+        try:
+            while True:
+                self.unacked.pop(await _read_ack(reader), None)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        if self.unacked and not self.closed and (self.recovery is None or self.recovery.done()):
+            self.recovery = asyncio.create_task(self._recover())
+
+    async def _recover(self):
+        delay = 0.05
+        while self.unacked and not self.closed:
+            async with self.lock:
+                if self.connected:
+                    return
+                self._disconnect()
+                try:
+                    await self._connect()
+                    return
+                except OSError:
+                    self._disconnect()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 2.0)
+
+    def _disconnect(self):
+        if self.acks is not None and self.acks is not asyncio.current_task():
+            self.acks.cancel()
+        if self.writer is not None:
+            self.writer.close()
+        self.writer = self.acks = None
+
+    async def send(self, message_id: str, frame: bytes):
+        async with self.lock:
+            self.unacked[message_id] = frame
+            for attempt in range(self.retries + 1):
+                try:
+                    if not self.connected:
+                        self._disconnect()
+                        await self._connect()  # (re)sends this frame too
+                    else:
+                        self.writer.write(frame)
+                        await self.writer.drain()
+                    return
+                except OSError:
+                    self._disconnect()
+                    if attempt == self.retries:
+                        self.unacked.pop(message_id, None)
+                        raise ConnectionError(f"Realm socket {self.path} unreachable")
+                    await asyncio.sleep(0.05 * 2 ** attempt)
+
+    async def close(self):
+        self.closed = True
+        if self.recovery is not None:
+            self.recovery.cancel()
+        writer = self.writer
+        self._disconnect()
+        if writer is not None:
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+
+class UnixSocketTransport(Transport):
+    """
+    Unix-domain socket transport for realms on the same host.
+
+    Each realm listens on ``<socket_dir>/<realm>.sock``; peers connect on
+    first send and keep the connection open.
+    """
+
+    def __init__(
+        self,
+        socket_dir: Union[str, Path] = '/tmp/awa',
+        max_inflight: int = 64,
+        wire_format: str = codec.JSON
+    ):
+        super().__init__(max_inflight=max_inflight, wire_format=wire_format)
+        self.socket_dir = Path(socket_dir)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._peers: Dict[str, _Peer] = {}
+        self._connections: Set[asyncio.StreamWriter] = set()
+
+    def path_for(self, realm: str) -> Path:
+        return self.socket_dir / f"{realm}.sock"
+
+    async def start(self, router: 'Router'):
+        await super().start(router)
+        self.socket_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(router.realm_name)
+        if path.exists():
+            path.unlink()  # stale socket from a previous run
+        self._server = await asyncio.start_unix_server(self._serve, path=str(path))
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections.add(writer)
+        write_lock = asyncio.Lock()
+
+        async def ack(message_id: str):
+            async with write_lock:
+                if not writer.is_closing():
+                    writer.write(_ack_frame(message_id))
+                    await writer.drain()
+
+        try:
+            while True:
+                header = await reader.readexactly(codec.HEADER_SIZE)
+                _, length = codec.unpack_header(header)
+                frame = header + await reader.readexactly(length)
+                try:
+                    message = decode_message(frame)
+                except (ValueError, KeyError, TypeError):
+                    continue
+                await self.deliver(message, ack=lambda message_id=message.id: ack(message_id))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):  # closed, or not speaking the protocol
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def send(self, message: Message):
+        realm = message.target.realm
+        peer = self._peers.get(realm)
+        if peer is None:
+            peer = self._peers[realm] = _Peer(self.path_for(realm))
+        await peer.send(message.id, encode_message(message, self.wire_format))
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+        # Let in-flight handlers finish (and ack, and send replies) first.
+        await super().close()
+        for writer in list(self._connections):
+            writer.close()
+        if self._server is not None:
+            await self._server.wait_closed()
+            self.path_for(self.router.realm_name).unlink(missing_ok=True)
+        for peer in self._peers.values():
+            await peer.close()
+
+
+__all__ = [
+    'Transport',
+    'RedisStreamsTransport',
+    'UnixSocketTransport',
+    'encode_message',
+    'decode_message',
+]
@@ -4,6 +4,7 @@ Awa Whakapapa Graph
 Manages realm lineage and relationships.
 """
 
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -89,12 +90,27 @@ class WhakapapaGraph:
     - Sibling relationships (same parent)
     - Arbitrary links (forks, merges, references)
     - Access control based on lineage
+    
+    Lookups are indexed: parent -> children and link adjacency maps keyed
+    by (source, target). Each node also carries a pre/post-order interval
+    label, so "is X an ancestor of Y" is two comparisons. Labels are
+    spaced out; a new realm takes a slot inside its parent's interval,
+    and the labels are only recomputed (lazily, O(N)) when that runs out
+    of room.
     """
     
+    _LABEL_GAP = 1 << 20
+    
     def __init__(self, storage_path: Optional[Path] = None):
         self.storage_path = storage_path or Path.home() / ".awaos" / "whakapapa.json"
         self.nodes: Dict[str, RealmNode] = {}
         self.links: List[RealmLink] = []
+        self._children: Dict[Optional[str], Dict[str, None]] = {}
+        self._links_out: Dict[str, Dict[str, List[RealmLink]]] = {}
+        self._links_in: Dict[str, Dict[str, List[RealmLink]]] = {}
+        self._pre: Dict[str, int] = {}
+        self._post: Dict[str, int] = {}
+        self._labels_dirty = True
         self._load()
     
     def _load(self):
@@ -106,9 +122,12 @@ class WhakapapaGraph:
             for node_data in data.get('nodes', []):
                 node = RealmNode.from_dict(node_data)
                 self.nodes[node.realm_id] = node
+                self._children.setdefault(node.parent_id or None, {})[node.realm_id] = None
             
             for link_data in data.get('links', []):
-                self.links.append(RealmLink.from_dict(link_data))
+                self._index_link(RealmLink.from_dict(link_data))
+        
+        self._labels_dirty = True
     
     def save(self):
         """Save graph to storage."""
@@ -122,6 +141,92 @@ class WhakapapaGraph:
         with open(self.storage_path, 'w') as f:
             json.dump(data, f, indent=2)
     
+    # Indexes
+    
+    def _index_link(self, link: RealmLink):
+        self.links.append(link)
+        self._links_out.setdefault(link.source_id, {}).setdefault(link.target_id, []).append(link)
+        self._links_in.setdefault(link.target_id, {}).setdefault(link.source_id, []).append(link)
+    
+    def _unindex_links(self, removed: List[RealmLink]):
+        if not removed:
+            return
+        for link in removed:
+            for index, a, b in (
+                (self._links_out, link.source_id, link.target_id),
+                (self._links_in, link.target_id, link.source_id),
+            ):
+                pair = index.get(a, {}).get(b)
+                if pair is None:
+                    continue
+                pair[:] = [l for l in pair if l is not link]
+                if not pair:
+                    del index[a][b]
+                    if not index[a]:
+                        del index[a]
+        removed_ids = {id(l) for l in removed}
+        self.links = [l for l in self.links if id(l) not in removed_ids]
+    
+    def _label_roots(self) -> List[str]:
+        """Nodes with no (known) parent, in insertion order."""
+        return [
+            realm_id for realm_id, node in self.nodes.items()
+            if not node.parent_id or node.parent_id not in self.nodes
+        ]
+    
+    def _rebuild_labels(self):
+        """Assign spaced pre/post-order labels to every node (iterative DFS)."""
+        gap = self._LABEL_GAP
+        pre: Dict[str, int] = {}
+        post: Dict[str, int] = {}
+        counter = 0
+        stack = [(root, False) for root in reversed(self._label_roots())]
+        while stack:
+            realm_id, done = stack.pop()
+            if done:
+                post[realm_id] = counter
+                counter += gap
+                continue
+            pre[realm_id] = counter
+            counter += gap
+            stack.append((realm_id, True))
+            for child_id in reversed(list(self._children.get(realm_id, ()))):
+                stack.append((child_id, False))
+        self._pre, self._post = pre, post
+        self._next_label = counter
+        self._labels_dirty = False
+    
+    def _label_new(self, realm_id: str, parent_id: Optional[str]):
+        """Give a new leaf a slot inside its parent's interval, or mark labels stale."""
+        if self._labels_dirty:
+            return
+        if not parent_id:
+            self._pre[realm_id] = self._next_label
+            self._post[realm_id] = self._next_label + self._LABEL_GAP
+            self._next_label += 2 * self._LABEL_GAP
+            return
+        siblings = [c for c in self._children.get(parent_id, ()) if c != realm_id]
+        low = self._post[siblings[-1]] if siblings else self._pre[parent_id]
+        high = self._post[parent_id]
+        if high - low < 3:
+            self._labels_dirty = True
+            return
+        third = (high - low) // 3
+        self._pre[realm_id] = low + third
+        self._post[realm_id] = low + 2 * third
+    
+    def _labels(self):
+        if self._labels_dirty:
+            self._rebuild_labels()
+        return self._pre, self._post
+    
+    def is_ancestor(self, ancestor_id: str, realm_id: str) -> bool:
+        """Whether ``ancestor_id`` is a strict ancestor of ``realm_id`` (O(1))."""
+        if ancestor_id == realm_id or ancestor_id not in self.nodes or realm_id not in self.nodes:
+            return False
+        pre, post = self._labels()
+        return pre[ancestor_id] < pre[realm_id] and post[realm_id] < post[ancestor_id]
+    
     def add_realm(
         self,
         realm_id: str,
@@ -158,6 +263,11 @@ class WhakapapaGraph:
         )
         
         self.nodes[realm_id] = node
+        self._children.setdefault(parent_id or None, {})[realm_id] = None
+        if realm_id in self._children:
+            # Realms loaded with this (then missing) parent now hang under it.
+            self._labels_dirty = True
+        self._label_new(realm_id, parent_id)
         self.save()
         
         return node
@@ -172,11 +282,23 @@ class WhakapapaGraph:
         if children:
             raise ValueError(f"Cannot remove realm with children: {children}")
         
-        del self.nodes[realm_id]
+        node = self.nodes.pop(realm_id)
+        siblings = self._children.get(node.parent_id or None)
+        if siblings is not None:
+            siblings.pop(realm_id, None)
+            if not siblings:
+                del self._children[node.parent_id or None]
+        # A removed leaf's interval is just left unused.
+        self._pre.pop(realm_id, None)
+        self._post.pop(realm_id, None)
         
         # Remove associated links
-        self.links = [l for l in self.links 
-                     if l.source_id != realm_id and l.target_id != realm_id]
+        removed = [l for targets in self._links_out.get(realm_id, {}).values() for l in targets]
+        removed += [
+            l for sources in self._links_in.get(realm_id, {}).values() for l in sources
+            if l.source_id != realm_id
+        ]
+        self._unindex_links(removed)
         
         self.save()
     
@@ -217,19 +339,15 @@ class WhakapapaGraph:
             metadata=metadata or {}
         )
         
-        self.links.append(link)
+        self._index_link(link)
         self.save()
         
         return link
     
     def remove_link(self, source_id: str, target_id: str, link_type: str = None):
         """Remove a link between realms."""
-        self.links = [
-            l for l in self.links
-            if not (l.source_id == source_id and 
-                   l.target_id == target_id and
-                   (link_type is None or l.link_type == link_type))
-        ]
+        pair = self._links_out.get(source_id, {}).get(target_id, [])
+        self._unindex_links([l for l in pair if link_type is None or l.link_type == link_type])
         self.save()
     
     def get_parent(self, realm_id: str) -> Optional[RealmNode]:
@@ -245,7 +363,7 @@ class WhakapapaGraph:
     
     def get_children(self, realm_id: str) -> List[RealmNode]:
         """Get direct children of a realm."""
-        return [n for n in self.nodes.values() if n.parent_id == realm_id]
+        return [self.nodes[c] for c in self._children.get(realm_id, ())]
     
     def get_ancestors(self, realm_id: str) -> List[RealmNode]:
         """Get all ancestors (parent chain) of a realm."""
@@ -263,15 +381,14 @@ class WhakapapaGraph:
         return ancestors
     
     def get_descendants(self, realm_id: str) -> List[RealmNode]:
-        """Get all descendants of a realm."""
+        """Get all descendants of a realm (breadth-first)."""
         descendants = []
-        queue = [realm_id]
+        queue = deque([realm_id])
         
         while queue:
-            current_id = queue.pop(0)
-            children = self.get_children(current_id)
-            descendants.extend(children)
-            queue.extend([c.realm_id for c in children])
+            for child_id in self._children.get(queue.popleft(), ()):
+                descendants.append(self.nodes[child_id])
+                queue.append(child_id)
         
         return descendants
     
@@ -284,25 +401,44 @@ class WhakapapaGraph:
         if not parent_id:
             return []
         
-        return [n for n in self.nodes.values() 
-                if n.parent_id == parent_id and n.realm_id != realm_id]
+        return [self.nodes[c] for c in self._children.get(parent_id, ()) if c != realm_id]
     
     def get_linked(self, realm_id: str, link_type: str = None) -> List[RealmNode]:
         """Get realms linked to this one."""
         linked = []
         
-        for link in self.links:
-            if link.source_id == realm_id:
-                if link_type is None or link.link_type == link_type:
-                    if link.target_id in self.nodes:
-                        linked.append(self.nodes[link.target_id])
-            elif link.bidirectional and link.target_id == realm_id:
-                if link_type is None or link.link_type == link_type:
-                    if link.source_id in self.nodes:
-                        linked.append(self.nodes[link.source_id])
+        for target_id, links in self._links_out.get(realm_id, {}).items():
+            for link in links:
+                if (link_type is None or link.link_type == link_type) and target_id in self.nodes:
+                    linked.append(self.nodes[target_id])
+        
+        for source_id, links in self._links_in.get(realm_id, {}).items():
+            if source_id == realm_id:
+                continue  # self-links were listed above
+            for link in links:
+                if link.bidirectional and (link_type is None or link.link_type == link_type):
+                    if source_id in self.nodes:
+                        linked.append(self.nodes[source_id])
         
         return linked
     
+    def get_link_permissions(self, source_id: str, target_id: str) -> Optional[Set[str]]:
+        """
+        Permissions ``source_id`` holds on ``target_id`` through links.
+        
+        Returns:
+            Union of permissions of every link from source to target (and
+            bidirectional links from target to source), or None if unlinked
+        """
+        links = list(self._links_out.get(source_id, {}).get(target_id, ()))
+        links += [l for l in self._links_out.get(target_id, {}).get(source_id, ()) if l.bidirectional]
+        if not links:
+            return None
+        permissions: Set[str] = set()
+        for link in links:
+            permissions |= link.permissions
+        return permissions
+    
     def can_access(
         self,
         source_id: str,
@@ -325,25 +461,16 @@ class WhakapapaGraph:
             return False
         
         # Check if target is descendant
-        descendants = self.get_descendants(source_id)
-        if any(d.realm_id == target_id for d in descendants):
+        if self.is_ancestor(source_id, target_id):
             return True
         
         # Check links
-        for link in self.links:
-            # Direct link
-            if link.source_id == source_id and link.target_id == target_id:
-                if required_permission:
-                    return required_permission in link.permissions or '*' in link.permissions
-                return True
-            
-            # Bidirectional link
-            if link.bidirectional and link.target_id == source_id and link.source_id == target_id:
-                if required_permission:
-                    return required_permission in link.permissions or '*' in link.permissions
-                return True
-        
-        return False
+        permissions = self.get_link_permissions(source_id, target_id)
+        if permissions is None:
+            return False
+        if required_permission:
+            return required_permission in permissions or '*' in permissions
+        return True
     
     def get_tree(self, root_id: str = None) -> Dict:
         """
@@ -371,7 +498,7 @@ class WhakapapaGraph:
             return build_tree(root_id)
         
         # Find all roots (nodes without parents)
-        roots = [n for n in self.nodes.values() if not n.parent_id]
+        roots = self.get_children(None)
         
         return {
             'roots': [build_tree(r.realm_id) for r in roots]
@@ -393,7 +520,7 @@ class WhakapapaGraph:
                 draw_node(child.realm_id, child_prefix, i == len(children) - 1)
         
         # Find roots
-        roots = [n for n in self.nodes.values() if not n.parent_id]
+        roots = self.get_children(None)
         
         for i, root in enumerate(roots):
             lines.append(f"🌱 {root.realm_name} ({root.glyph_color})")
@@ -209,6 +209,57 @@ def embed_text_sync(
         raise RuntimeError(f"Failed to get embedding from Te Pō: {e}")
 
 
+def embed_texts(
+    texts: list[str],
+    model: str = "text-embedding-3-small",
+    batch_size: int = 256,
+) -> list[list[float]]:
+    """
+    Get embeddings for many texts via Te Pō's batched embed route.
+    
+    Texts are sent ``batch_size`` at a time; Te Pō fans each request out
+    into token-capped OpenAI batches. Vectors are returned in input order.
+    
+    Args:
+        texts: Texts to embed
+        model: Model to use (passed to Te Pō)
+        batch_size: Max texts per request to Te Pō
+        
+    Returns:
+        List of embedding vectors, one per input text
+    """
+    if not texts:
+        return []
+    
+    if MOCK_AI:
+        logger.info(f"Mock mode: generating {len(texts)} deterministic embeddings")
+        return [_generate_mock_embedding(text) for text in texts]
+    
+    embeddings: list[list[float]] = []
+    try:
+        with httpx.Client(timeout=120.0) as client:
+            for start in range(0, len(texts), batch_size):
+                batch = texts[start:start + batch_size]
+                response = client.post(
+                    f"{TEPO_URL}/awa/vector/embed",
+                    headers=_get_headers(),
+                    json={"texts": batch, "model": model}
+                )
+                response.raise_for_status()
+                data = response.json()
+                vectors = data.get("embeddings", [])
+                if len(vectors) != len(batch):
+                    raise RuntimeError(
+                        f"Te Pō returned {len(vectors)} embeddings for {len(batch)} texts"
+                    )
+                embeddings.extend(vectors)
+    except httpx.HTTPError as e:
+        logger.error(f"Te Pō batch embed request failed: {e}")
+        raise RuntimeError(f"Failed to get embeddings from Te Pō: {e}")
+    
+    return embeddings
+
+
 async def complete(
     prompt: str,
     system_prompt: Optional[str] = None,
@@ -421,6 +472,48 @@ async def vector_search(
         return []
 
 
+def _paragraph_chunks(text: str, chunk_size: int) -> list[str]:
+    """
+    In-module paragraph splitter, used when Te Pō's chunker is not
+    importable (the te_hau container mounts only ./te_hau).
+    """
+    chunks = []
+    
+    # Split by paragraphs first
+    paragraphs = text.split("\n\n")
+    current_chunk = ""
+    
+    for para in paragraphs:
+        if len(current_chunk) + len(para) + 2 <= chunk_size:
+            if current_chunk:
+                current_chunk += "\n\n" + para
+            else:
+                current_chunk = para
+        else:
+            if current_chunk:
+                chunks.append(current_chunk)
+            
+            # Handle paragraphs larger than chunk_size
+            if len(para) > chunk_size:
+                # Split long paragraph
+                words = para.split()
+                current_chunk = ""
+                for word in words:
+                    if len(current_chunk) + len(word) + 1 <= chunk_size:
+                        current_chunk = current_chunk + " " + word if current_chunk else word
+                    else:
+                        if current_chunk:
+                            chunks.append(current_chunk)
+                        current_chunk = word
+            else:
+                current_chunk = para
+    
+    if current_chunk:
+        chunks.append(current_chunk)
+    
+    return chunks
+
+
 def chunk_text(
     text: str,
     chunk_size: int = 1000,
@@ -430,11 +523,15 @@ def chunk_text(
     """
     Split text into chunks for embedding.
     
+    Uses Te Pō's streaming chunker (te_po.pipeline.chunker.chunk_engine)
+    so both sides of the Awa produce identical chunks; where te_po is not
+    installed, falls back to a simpler paragraph splitter.
+    
     Args:
         text: Text to chunk
         chunk_size: Target chunk size in characters
         overlap: Overlap between chunks
-        preserve_paragraphs: Try to break at paragraph boundaries
+        preserve_paragraphs: Try to break at paragraph and sentence boundaries
         
     Returns:
         List of text chunks
@@ -442,47 +539,21 @@ def chunk_text(
     if len(text) <= chunk_size:
         return [text]
     
-    chunks = []
-    
     if preserve_paragraphs:
-        # Split by paragraphs first
-        paragraphs = text.split("\n\n")
-        current_chunk = ""
+        try:
+            from te_po.pipeline.chunker.chunk_engine import iter_chunks
+        except ImportError:
+            return _paragraph_chunks(text, chunk_size)
         
-        for para in paragraphs:
-            if len(current_chunk) + len(para) + 2 <= chunk_size:
-                if current_chunk:
-                    current_chunk += "\n\n" + para
-                else:
-                    current_chunk = para
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk)
-                
-                # Handle paragraphs larger than chunk_size
-                if len(para) > chunk_size:
-                    # Split long paragraph
-                    words = para.split()
-                    current_chunk = ""
-                    for word in words:
-                        if len(current_chunk) + len(word) + 1 <= chunk_size:
-                            current_chunk = current_chunk + " " + word if current_chunk else word
-                        else:
-                            if current_chunk:
-                                chunks.append(current_chunk)
-                            current_chunk = word
-                else:
-                    current_chunk = para
-        
-        if current_chunk:
-            chunks.append(current_chunk)
-    else:
-        # Simple character-based chunking with overlap
-        start = 0
-        while start < len(text):
-            end = min(start + chunk_size, len(text))
-            chunks.append(text[start:end])
-            start = end - overlap if end < len(text) else end
+        return list(iter_chunks(text, max_size=chunk_size, overlap=overlap))
+    
+    # Simple character-based chunking with overlap
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        chunks.append(text[start:end])
+        start = end - overlap if end < len(text) else end
     
     return chunks
 
@@ -507,6 +578,7 @@ __all__ = [
     # Core functions
     "embed_text",
     "embed_text_sync",
+    "embed_texts",
     "complete",
     "chat_completion",
     "invoke_kaitiaki",
@@ -16,6 +16,7 @@ This defines:
 import os
 import json
 import hashlib
+import hmac
 from pathlib import Path
 from typing import Optional, Dict, List, Any, Union
 from dataclasses import dataclass, field, asdict
@@ -23,6 +24,8 @@ from enum import Enum
 from datetime import datetime
 import uuid
 
+from te_hau.awa.codec import canonical_json, get_signer
+
 
 # ═══════════════════════════════════════════════════════════════
 # AWA ENVELOPE
@@ -80,6 +83,8 @@ class AwaEnvelope:
     # Metadata
     metadata: Dict[str, Any] = field(default_factory=dict)
     
+    _seal_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    
     def to_dict(self) -> Dict:
         return {
             "envelope_id": self.envelope_id,
@@ -121,8 +126,29 @@ class AwaEnvelope:
             metadata=data.get("metadata", {})
         )
     
-    def seal(self, secret: str = "") -> str:
-        """Generate mauri seal for this envelope."""
+    def _seal_content(self) -> bytes:
+        """Canonical bytes covered by the seal (cached per payload object)."""
+        cached = self._seal_cache
+        key = (self.envelope_id, self.source_kaitiaki, self.target_route, self.timestamp)
+        if cached is None or cached[0] is not self.payload or cached[1] != key:
+            content = canonical_json({
+                "envelope_id": self.envelope_id,
+                "source": self.source_kaitiaki,
+                "target": self.target_route,
+                "payload": self.payload,
+                "timestamp": self.timestamp
+            })
+            cached = (self.payload, key, content)
+            self._seal_cache = cached
+        return cached[2]
+    
+    def _compute_seal(self, secret: str = "") -> str:
+        content = self._seal_content()
+        if secret:
+            return get_signer(secret).sign(content)[:32]
+        return hashlib.sha256(content).hexdigest()[:16]
+    
+    def _legacy_seal(self, secret: str = "") -> str:
         content = json.dumps({
             "envelope_id": self.envelope_id,
             "source": self.source_kaitiaki,
@@ -132,13 +158,26 @@ class AwaEnvelope:
         }, sort_keys=True)
         
         seal_input = f"{content}:{secret}" if secret else content
-        self.mauri_seal = hashlib.sha256(seal_input.encode()).hexdigest()[:16]
+        return hashlib.sha256(seal_input.encode()).hexdigest()[:16]
+    
+    def seal(self, secret: str = "") -> str:
+        """Generate mauri seal for this envelope (HMAC-SHA256 when a secret is given)."""
+        self.mauri_seal = self._compute_seal(secret)
         return self.mauri_seal
     
     def verify_seal(self, secret: str = "") -> bool:
         """Verify the mauri seal."""
-        expected = self.seal(secret)
-        return expected == self.mauri_seal
+        if not self.mauri_seal:
+            return False
+        if hmac.compare_digest(self._compute_seal(secret), self.mauri_seal):
+            return True
+        # Seals made before the canonical encoding / HMAC change.
+        return hmac.compare_digest(self._legacy_seal(secret), self.mauri_seal)
+    
+    @staticmethod
+    def verify_seals(envelopes: List["AwaEnvelope"], secret: str = "") -> List[bool]:
+        """Verify a bulk delivery of envelopes."""
+        return [envelope.verify_seal(secret) for envelope in envelopes]
 
 
 # ═══════════════════════════════════════════════════════════════
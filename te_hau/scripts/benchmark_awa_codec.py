@@ -0,0 +1,80 @@
+"""
+Benchmark Awa message signing and encoding per hop.
+
+One hop is sign + encode on the sender and decode + verify on the
+receiver. Compares the previous sha256(json + key) scheme with
+``to_dict`` JSON against the HMAC signer with cached payload bytes and
+``to_wire`` frames.
+
+Usage:
+    python te_hau/scripts/benchmark_awa_codec.py
+    python te_hau/scripts/benchmark_awa_codec.py --payload-kb 64 --iterations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+
+from te_hau.awa import codec  # noqa: E402
+from te_hau.awa.router import Message, MessageType  # noqa: E402
+
+KEY = "bench-bearer-key"
+
+
+def legacy_hop(payload) -> int:
+    message = Message.create("te_ao", "te_po", MessageType.MEMORY_SHARE, payload)
+    message.auth = {"signature": message._legacy_signature(KEY)}
+    wire = json.dumps(message.to_dict()).encode()
+    received = Message.from_dict(json.loads(wire))
+    assert received.auth["signature"] == received._legacy_signature(KEY)
+    return len(wire)
+
+
+def hop(payload, fmt) -> int:
+    message = Message.create("te_ao", "te_po", MessageType.MEMORY_SHARE, payload)
+    message.sign(KEY)
+    wire = message.to_wire(fmt)
+    assert Message.from_wire(wire).verify(KEY)
+    return len(wire)
+
+
+def timed(fn, iterations: int):
+    size = fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1e6 / iterations, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--payload-kb", type=int, default=16)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    chunk = {"text": "Ko te reo te mauri o te mana Māori", "score": 0.91, "tags": ["reo", "mauri"]}
+    payload = {"records": [chunk] * max(1, args.payload_kb * 1024 // len(json.dumps(chunk)))}
+
+    rows = [("legacy json", lambda: legacy_hop(payload)), ("hmac json", lambda: hop(payload, codec.JSON))]
+    for fmt, module in ((codec.MSGPACK, "msgpack"), (codec.CBOR, "cbor2")):
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        rows.append((f"hmac {fmt}", lambda fmt=fmt: hop(payload, fmt)))
+
+    print(f"payload~{args.payload_kb}KiB iterations={args.iterations}")
+    for name, fn in rows:
+        per_hop, size = timed(fn, args.iterations)
+        print(f"{name:<12} {per_hop:9.1f} us/hop  {size:8d} bytes on the wire")
+
+
+if __name__ == "__main__":
+    main()
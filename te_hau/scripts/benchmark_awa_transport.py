@@ -0,0 +1,108 @@
+"""
+Benchmark inter-realm message throughput and latency for Router transports.
+
+Runs two routers in one process and measures:
+- throughput: N one-way messages sent concurrently, until all are handled
+- latency: sequential request/response round trips (p50 / p99)
+
+for the in-process connection, the Unix-socket transport and, with
+``--redis-url``, the Redis Streams transport.
+
+Usage:
+    python te_hau/scripts/benchmark_awa_transport.py
+    python te_hau/scripts/benchmark_awa_transport.py --messages 20000 --redis-url redis://localhost:6379/0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+
+from te_hau.awa.router import Message, MessageType, Router  # noqa: E402
+from te_hau.awa.transport import RedisStreamsTransport, UnixSocketTransport  # noqa: E402
+
+
+def build_pair(kind: str, socket_dir: str, redis_url: str = None):
+    if kind == "local":
+        sender, receiver = Router("te_ao"), Router("te_po")
+        sender.connect(receiver)
+        return sender, receiver
+    if kind == "unix":
+        return Router("te_ao", transport=UnixSocketTransport(socket_dir)), Router("te_po", transport=UnixSocketTransport(socket_dir))
+    prefix = f"awa:bench:{uuid.uuid4().hex[:8]}"
+    return (
+        Router("te_ao", transport=RedisStreamsTransport(redis_url, prefix=prefix, consumer="te_ao")),
+        Router("te_po", transport=RedisStreamsTransport(redis_url, prefix=prefix, consumer="te_po")),
+    )
+
+
+async def run(kind: str, messages: int, round_trips: int, payload_bytes: int, socket_dir: str, redis_url: str = None):
+    sender, receiver = build_pair(kind, socket_dir, redis_url)
+    payload = {"data": "x" * payload_bytes}
+    handled = 0
+    done = asyncio.Event()
+
+    def on_heartbeat(message):
+        nonlocal handled
+        handled += 1
+        if handled == messages:
+            done.set()
+
+    async def on_query(message):
+        await receiver.send(Message.create("te_po", "te_ao", MessageType.MEMORY_RESULT, {"results": []}, reply_to=message.id))
+
+    receiver.on(MessageType.HEARTBEAT, on_heartbeat)
+    receiver.on(MessageType.MEMORY_QUERY, on_query)
+    await receiver.start()
+    await sender.start()
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            sender.send(Message.create("te_ao", "te_po", MessageType.HEARTBEAT, payload))
+            for _ in range(messages)
+        ))
+        await done.wait()
+        throughput = messages / (time.perf_counter() - start)
+
+        latencies = []
+        for _ in range(round_trips):
+            start = time.perf_counter()
+            await sender.query_memory("te_po", "ping")
+            latencies.append((time.perf_counter() - start) * 1e6)
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        return throughput, statistics.median(latencies), p99
+    finally:
+        await sender.stop()
+        await receiver.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--round-trips", type=int, default=1000)
+    parser.add_argument("--payload-bytes", type=int, default=256)
+    parser.add_argument("--redis-url", default=None, help="Also benchmark Redis Streams against this server")
+    args = parser.parse_args()
+
+    kinds = ["local", "unix"] + (["redis"] if args.redis_url else [])
+    print(f"messages={args.messages} round_trips={args.round_trips} payload={args.payload_bytes}B")
+    with tempfile.TemporaryDirectory() as socket_dir:
+        for kind in kinds:
+            throughput, p50, p99 = asyncio.run(run(
+                kind, args.messages, args.round_trips, args.payload_bytes, socket_dir, args.redis_url
+            ))
+            print(f"{kind:<6} {throughput:10.0f} msg/s   round trip p50 {p50:8.1f} us  p99 {p99:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
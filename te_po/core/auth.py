@@ -12,6 +12,7 @@ variables, but the intent of each token is explicit:
 from __future__ import annotations
 
 import os
+import threading
 from dataclasses import dataclass
 from typing import Optional, Tuple
 
@@ -49,6 +50,28 @@ def load_tokens() -> AuthTokens:
     )
 
 
+_tokens: Optional[AuthTokens] = None
+_tokens_lock = threading.Lock()
+
+
+def get_tokens() -> AuthTokens:
+    """Process-wide cached ``load_tokens()``; call ``reload_tokens()`` after rotating env tokens."""
+    global _tokens
+    if _tokens is None:
+        with _tokens_lock:
+            if _tokens is None:
+                _tokens = load_tokens()
+    return _tokens
+
+
+def reload_tokens() -> AuthTokens:
+    """Re-read the token env vars and replace the cached tokens."""
+    global _tokens
+    with _tokens_lock:
+        _tokens = load_tokens()
+    return _tokens
+
+
 def _parse_bearer(raw_header: Optional[str]) -> Optional[str]:
     if not raw_header:
         return None
@@ -19,6 +19,8 @@ from te_po.utils.middleware.utf8_enforcer import apply_utf8_middleware
 # Core env + routers
 from te_po.core.env_loader import enforce_utf8_locale
 from te_po.core import awa_gpt, awa_realtime
+from te_po.services.supabase_service import flush_writes
+from te_po.utils.audit import flush_audit
 from te_po.routes import (
     intake,
     reo,
@@ -267,6 +269,13 @@ app.include_router(awa_realtime.router)
 async def startup_event():
     start_awa_event_loop()
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Drain queued audit events first; they feed the Supabase write-behind buffer.
+    flush_audit()
+    flush_writes()
+
 # -------------------------------------------------------------------
 # 🧪 DEV ENTRY POINT
 # -------------------------------------------------------------------
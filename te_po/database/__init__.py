@@ -6,6 +6,7 @@ from te_po.database.postgres import (
     db_fetchone,
     db_fetchall,
     db_query,
+    pool_stats,
 )
 
-__all__ = ["get_pool", "db_execute", "db_fetchone", "db_fetchall", "db_query"]
+__all__ = ["get_pool", "db_execute", "db_fetchone", "db_fetchall", "db_query", "pool_stats"]
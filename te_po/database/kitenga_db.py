@@ -1,14 +1,23 @@
 """
 Kitenga Schema Database Connector
 Connects Kitenga Whiro to the kitenga schema tables in Supabase PostgreSQL.
+
+Connections come from the shared psycopg pool in ``te_po.database.postgres``
+rather than a fresh connect per call. High-volume writers have bulk
+variants that load rows with a single ``COPY``: ``log_events``,
+``log_memory_events``, ``save_chat_logs`` and ``save_ocr_logs``.
 """
+import base64
+import json
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 from datetime import datetime
-import psycopg2
-from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 from dotenv import load_dotenv
+from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
+
+from te_po.database.postgres import get_pool, pool_stats
 
 load_dotenv()
 
@@ -18,26 +27,26 @@ SCHEMA = "kitenga"
 
 @contextmanager
 def get_connection():
-    """Context manager for database connections."""
-    conn = psycopg2.connect(DATABASE_URL)
-    try:
+    """Borrow a connection from the shared pool (returned on exit)."""
+    pool = get_pool()
+    if pool is None:
+        raise RuntimeError("PostgreSQL pool not initialized (DATABASE_URL not set)")
+    with pool.connection() as conn:
         yield conn
-    finally:
-        conn.close()
 
 
 @contextmanager  
 def get_cursor(conn=None):
-    """Context manager for database cursors with RealDictCursor."""
+    """Context manager for database cursors returning dict rows."""
     if conn:
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = conn.cursor(row_factory=dict_row)
         try:
             yield cur
         finally:
             cur.close()
     else:
         with get_connection() as conn:
-            cur = conn.cursor(cursor_factory=RealDictCursor)
+            cur = conn.cursor(row_factory=dict_row)
             try:
                 yield cur
                 conn.commit()
@@ -45,6 +54,175 @@ def get_cursor(conn=None):
                 cur.close()
 
 
+def _copy_rows(table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    """Stream ``rows`` into ``kitenga.<table>`` with one COPY; returns the row count."""
+    count = 0
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            with cur.copy(f"COPY {SCHEMA}.{table} ({', '.join(columns)}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+                    count += 1
+        conn.commit()
+    return count
+
+
+# ==================== SEARCH ====================
+
+# Weight of trigram word similarity relative to ts_rank_cd (catches typos and
+# partial words the tsquery misses).
+SEARCH_TRGM_WEIGHT = float(os.getenv("KITENGA_SEARCH_TRGM_WEIGHT", "0.5"))
+# Candidates per signal fed into hybrid rank fusion.
+SEARCH_HYBRID_CANDIDATES = int(os.getenv("KITENGA_SEARCH_HYBRID_CANDIDATES", "200"))
+_RRF_K = 60
+# context_memory.embedding is vector(1536) (migration 004), so memory is
+# embedded with a model of that width, independent of OPENAI_EMBED_MODEL.
+MEMORY_EMBED_MODEL = os.getenv("KITENGA_MEMORY_EMBED_MODEL", "text-embedding-3-small")
+MEMORY_EMBEDDING_DIM = 1536
+_HEADLINE = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=8"
+
+
+def _vector_literal(vec: Optional[Sequence[float]]) -> Optional[str]:
+    if not vec:
+        return None
+    return "[" + ",".join(repr(float(x)) for x in vec) + "]"
+
+
+def _memory_vector(vec: Optional[Sequence[float]]) -> Optional[Sequence[float]]:
+    """``vec`` if it fits ``context_memory.embedding``, else None."""
+    if vec is not None and len(vec) == MEMORY_EMBEDDING_DIM:
+        return vec
+    return None
+
+
+def _encode_cursor(score: float, row_id: Any) -> str:
+    raw = json.dumps([float(score), str(row_id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: Optional[str]) -> tuple:
+    if not cursor:
+        return None, None
+    try:
+        score, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(score), str(row_id)
+    except Exception as exc:
+        raise ValueError(f"Invalid search cursor: {cursor!r}") from exc
+
+
+def next_cursor(rows: List[Dict], limit: int) -> Optional[str]:
+    """Cursor for the page after ``rows`` (None when this was the last page)."""
+    if len(rows) < limit or not rows:
+        return None
+    return rows[-1].get("cursor")
+
+
+# Keyset page over ``ranked`` (score DESC, id ASC), then headline only the page rows.
+_PAGE_SQL = """
+    page AS (
+        SELECT * FROM ranked
+        WHERE %(after_score)s::float8 IS NULL
+           OR score < %(after_score)s::float8
+           OR (score = %(after_score)s::float8 AND id > %(after_id)s::uuid)
+        ORDER BY score DESC, id
+        LIMIT %(limit)s
+    )
+    SELECT page.*, ts_headline('simple', coalesce(page.{headline_column}, ''), q.tsq, %(headline)s) AS snippet
+    FROM page, q
+    ORDER BY page.score DESC, page.id
+"""
+
+
+def _run_search(sql: str, params: Dict[str, Any]) -> List[Dict]:
+    with get_cursor() as cur:
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+    for row in rows:
+        row["cursor"] = _encode_cursor(row["score"], row["id"])
+    return rows
+
+
+def _ranked_search(
+    table: str,
+    columns: Sequence[str],
+    trgm_column: str,
+    query: str,
+    limit: int,
+    after: Optional[str],
+) -> List[Dict]:
+    after_score, after_id = _decode_cursor(after)
+    cols = ", ".join(f"t.{c}" for c in columns)
+    sql = f"""
+        WITH q AS (SELECT websearch_to_tsquery('simple', %(q)s) AS tsq),
+        ranked AS (
+            SELECT {cols},
+                   (ts_rank_cd(t.search_tsv, q.tsq)
+                    + %(trgm_weight)s * word_similarity(%(q)s, coalesce(t.{trgm_column}, '')))::float8 AS score
+            FROM {SCHEMA}.{table} t, q
+            WHERE t.search_tsv @@ q.tsq OR %(q)s <%% t.{trgm_column}
+        ),
+    """ + _PAGE_SQL.format(headline_column="content")
+    return _run_search(sql, {
+        "q": query,
+        "trgm_weight": SEARCH_TRGM_WEIGHT,
+        "after_score": after_score,
+        "after_id": after_id,
+        "limit": limit,
+        "headline": _HEADLINE,
+    })
+
+
+def _hybrid_memory_search(
+    query: str,
+    query_embedding: Sequence[float],
+    limit: int,
+    after: Optional[str],
+) -> List[Dict]:
+    """FTS + pgvector in one query, fused by reciprocal rank (k=60)."""
+    after_score, after_id = _decode_cursor(after)
+    sql = f"""
+        WITH q AS (SELECT websearch_to_tsquery('simple', %(q)s) AS tsq),
+        fts AS (
+            SELECT m.id, row_number() OVER (
+                       ORDER BY ts_rank_cd(m.search_tsv, q.tsq)
+                                + %(trgm_weight)s * word_similarity(%(q)s, coalesce(m.content, '')) DESC
+                   ) AS rnk
+            FROM {SCHEMA}.context_memory m, q
+            WHERE m.search_tsv @@ q.tsq OR %(q)s <%% m.content
+            ORDER BY rnk
+            LIMIT %(candidates)s
+        ),
+        vec AS (
+            SELECT m.id, row_number() OVER (ORDER BY m.embedding <=> %(emb)s::vector) AS rnk
+            FROM {SCHEMA}.context_memory m
+            WHERE m.embedding IS NOT NULL
+            ORDER BY m.embedding <=> %(emb)s::vector
+            LIMIT %(candidates)s
+        ),
+        fused AS (
+            SELECT coalesce(fts.id, vec.id) AS id,
+                   (coalesce(1.0 / (%(rrf_k)s + fts.rnk), 0)
+                    + coalesce(1.0 / (%(rrf_k)s + vec.rnk), 0))::float8 AS score
+            FROM fts FULL OUTER JOIN vec ON fts.id = vec.id
+        ),
+        ranked AS (
+            SELECT m.id, m.content, m.metadata, m.created_at, fused.score
+            FROM fused JOIN {SCHEMA}.context_memory m ON m.id = fused.id
+        ),
+    """ + _PAGE_SQL.format(headline_column="content")
+    return _run_search(sql, {
+        "q": query,
+        "emb": _vector_literal(query_embedding),
+        "trgm_weight": SEARCH_TRGM_WEIGHT,
+        "candidates": SEARCH_HYBRID_CANDIDATES,
+        "rrf_k": _RRF_K,
+        "after_score": after_score,
+        "after_id": after_id,
+        "limit": limit,
+        "headline": _HEADLINE,
+    })
+
+
 # ==================== LOGS ====================
 
 def log_event(event: str, detail: str, source: str = "kitenga_whiro", data: dict = None) -> str:
@@ -55,12 +233,24 @@ def log_event(event: str, detail: str, source: str = "kitenga_whiro", data: dict
                 INSERT INTO {SCHEMA}.logs (event, detail, source, data)
                 VALUES (%s, %s, %s, %s)
                 RETURNING id
-            """, (event, detail, source, data or {}))
+            """, (event, detail, source, Jsonb(data or {})))
             result = cur.fetchone()
             conn.commit()
             return str(result['id'])
 
 
+def log_events(entries: Iterable[Dict[str, Any]]) -> int:
+    """Bulk ``log_event``: dicts with event, detail, optional source and data."""
+    return _copy_rows(
+        "logs",
+        ("event", "detail", "source", "data"),
+        (
+            (e["event"], e["detail"], e.get("source") or "kitenga_whiro", Jsonb(e.get("data") or {}))
+            for e in entries
+        ),
+    )
+
+
 def get_recent_logs(limit: int = 50, source: str = None) -> List[Dict]:
     """Get recent log entries."""
     with get_cursor() as cur:
@@ -80,29 +270,86 @@ def get_recent_logs(limit: int = 50, source: str = None) -> List[Dict]:
 
 # ==================== MEMORY ====================
 
-def store_memory(content: str, metadata: dict = None) -> str:
-    """Store context memory."""
+def store_memory(content: str, metadata: dict = None, embedding: Sequence[float] = None) -> str:
+    """Store context memory (optionally with its embedding for hybrid search)."""
+    if embedding is not None and _memory_vector(embedding) is None:
+        raise ValueError(f"Memory embeddings must have {MEMORY_EMBEDDING_DIM} dimensions, got {len(embedding)}")
+    columns, values = ["content", "metadata"], [content, Jsonb(metadata or {})]
+    if embedding:
+        columns.append("embedding")
+        values.append(_vector_literal(embedding))
+    placeholders = ", ".join("%s::vector" if c == "embedding" else "%s" for c in columns)
     with get_connection() as conn:
         with get_cursor(conn) as cur:
             cur.execute(f"""
-                INSERT INTO {SCHEMA}.context_memory (content, metadata)
-                VALUES (%s, %s)
+                INSERT INTO {SCHEMA}.context_memory ({', '.join(columns)})
+                VALUES ({placeholders})
                 RETURNING id
-            """, (content, metadata or {}))
+            """, values)
             result = cur.fetchone()
             conn.commit()
             return str(result['id'])
 
 
-def search_memory(query: str, limit: int = 10) -> List[Dict]:
-    """Search context memory by text (basic ILIKE search)."""
-    with get_cursor() as cur:
-        cur.execute(f"""
-            SELECT * FROM {SCHEMA}.context_memory 
-            WHERE content ILIKE %s
-            ORDER BY created_at DESC LIMIT %s
-        """, (f'%{query}%', limit))
-        return cur.fetchall()
+def search_memory(
+    query: str,
+    limit: int = 10,
+    after: str = None,
+    mode: str = "fts",
+    query_embedding: Sequence[float] = None,
+) -> List[Dict]:
+    """
+    Ranked search over context memory (see migrations/004_kitenga_text_search.sql).
+
+    ``mode="fts"`` ranks by ``ts_rank_cd`` plus trigram word similarity;
+    ``mode="hybrid"`` fuses that ranking with pgvector cosine similarity to
+    ``query_embedding`` (reciprocal rank fusion), and falls back to FTS when
+    the embedding is missing or not ``MEMORY_EMBEDDING_DIM`` wide. Rows carry
+    ``score`` and a highlighted ``snippet``; pass ``next_cursor(rows)`` as
+    ``after`` for the next page.
+    """
+    if mode == "hybrid" and _memory_vector(query_embedding) is not None:
+        return _hybrid_memory_search(query, query_embedding, limit, after)
+    return _ranked_search(
+        "context_memory",
+        ("id", "content", "metadata", "created_at"),
+        trgm_column="content",
+        query=query,
+        limit=limit,
+        after=after,
+    )
+
+
+def memory_without_embeddings(limit: int = 100) -> List[Dict]:
+    """Oldest context memory rows that have no embedding yet (for backfill)."""
+    with get_connection() as conn:
+        with get_cursor(conn) as cur:
+            cur.execute(f"""
+                SELECT id, content FROM {SCHEMA}.context_memory
+                WHERE embedding IS NULL
+                ORDER BY created_at
+                LIMIT %s
+            """, (limit,))
+            return cur.fetchall()
+
+
+def set_memory_embeddings(pairs: Iterable[Tuple[str, Sequence[float]]]) -> int:
+    """Write ``(memory_id, embedding)`` pairs; returns the number of rows updated."""
+    rows = []
+    for memory_id, embedding in pairs:
+        if _memory_vector(embedding) is None:
+            raise ValueError(f"Memory embeddings must have {MEMORY_EMBEDDING_DIM} dimensions, got {len(embedding)}")
+        rows.append((_vector_literal(embedding), memory_id))
+    if not rows:
+        return 0
+    with get_connection() as conn:
+        with get_cursor(conn) as cur:
+            cur.executemany(
+                f"UPDATE {SCHEMA}.context_memory SET embedding = %s::vector WHERE id = %s",
+                rows,
+            )
+        conn.commit()
+    return len(rows)
 
 
 def log_memory_event(source: str, ref_id: str, event_type: str, summary: str, details: dict = None) -> str:
@@ -113,12 +360,24 @@ def log_memory_event(source: str, ref_id: str, event_type: str, summary: str, de
                 INSERT INTO {SCHEMA}.memory_log (source, ref_id, event_type, summary, details)
                 VALUES (%s, %s, %s, %s, %s)
                 RETURNING id
-            """, (source, ref_id, event_type, summary, details or {}))
+            """, (source, ref_id, event_type, summary, Jsonb(details or {})))
             result = cur.fetchone()
             conn.commit()
             return str(result['id'])
 
 
+def log_memory_events(entries: Iterable[Dict[str, Any]]) -> int:
+    """Bulk ``log_memory_event``: dicts with source, ref_id, event_type, summary, details."""
+    return _copy_rows(
+        "memory_log",
+        ("source", "ref_id", "event_type", "summary", "details"),
+        (
+            (e["source"], e["ref_id"], e["event_type"], e["summary"], Jsonb(e.get("details") or {}))
+            for e in entries
+        ),
+    )
+
+
 # ==================== CHAT ====================
 
 def save_chat_log(session_id: str, user_message: str, assistant_reply: str, 
@@ -131,12 +390,31 @@ def save_chat_log(session_id: str, user_message: str, assistant_reply: str,
                 (session_id, thread_id, user_message, assistant_reply, mode, metadata)
                 VALUES (%s, %s, %s, %s, %s, %s)
                 RETURNING id
-            """, (session_id, thread_id, user_message, assistant_reply, mode, metadata or {}))
+            """, (session_id, thread_id, user_message, assistant_reply, mode, Jsonb(metadata or {})))
             result = cur.fetchone()
             conn.commit()
             return str(result['id'])
 
 
+def save_chat_logs(entries: Iterable[Dict[str, Any]]) -> int:
+    """Bulk ``save_chat_log``: dicts with session_id, user_message, assistant_reply, ..."""
+    return _copy_rows(
+        "chat_logs",
+        ("session_id", "thread_id", "user_message", "assistant_reply", "mode", "metadata"),
+        (
+            (
+                e["session_id"],
+                e.get("thread_id"),
+                e["user_message"],
+                e["assistant_reply"],
+                e.get("mode") or "chat",
+                Jsonb(e.get("metadata") or {}),
+            )
+            for e in entries
+        ),
+    )
+
+
 def get_chat_history(session_id: str, limit: int = 50) -> List[Dict]:
     """Get chat history for a session."""
     with get_cursor() as cur:
@@ -158,21 +436,22 @@ def store_taonga(title: str, content: str, metadata: dict = None) -> str:
                 INSERT INTO {SCHEMA}.taonga (title, content, metadata)
                 VALUES (%s, %s, %s)
                 RETURNING id
-            """, (title, content, metadata or {}))
+            """, (title, content, Jsonb(metadata or {})))
             result = cur.fetchone()
             conn.commit()
             return str(result['id'])
 
 
-def search_taonga(query: str, limit: int = 10) -> List[Dict]:
-    """Search taonga by title or content."""
-    with get_cursor() as cur:
-        cur.execute(f"""
-            SELECT * FROM {SCHEMA}.taonga 
-            WHERE title ILIKE %s OR content ILIKE %s
-            ORDER BY created_at DESC LIMIT %s
-        """, (f'%{query}%', f'%{query}%', limit))
-        return cur.fetchall()
+def search_taonga(query: str, limit: int = 10, after: str = None) -> List[Dict]:
+    """Ranked search over taonga titles (weighted higher) and content; see ``search_memory``."""
+    return _ranked_search(
+        "taonga",
+        ("id", "title", "content", "metadata", "created_at"),
+        trgm_column="title",
+        query=query,
+        limit=limit,
+        after=after,
+    )
 
 
 def get_taonga_by_id(taonga_id: str) -> Optional[Dict]:
@@ -194,12 +473,21 @@ def save_ocr_log(file_name: str, text_extracted: str, metadata: dict = None) ->
                 INSERT INTO {SCHEMA}.ocr_logs (file_name, text_extracted, metadata)
                 VALUES (%s, %s, %s)
                 RETURNING id
-            """, (file_name, text_extracted, metadata or {}))
+            """, (file_name, text_extracted, Jsonb(metadata or {})))
             result = cur.fetchone()
             conn.commit()
             return str(result['id'])
 
 
+def save_ocr_logs(entries: Iterable[Dict[str, Any]]) -> int:
+    """Bulk ``save_ocr_log``: dicts with file_name, text_extracted, optional metadata."""
+    return _copy_rows(
+        "ocr_logs",
+        ("file_name", "text_extracted", "metadata"),
+        ((e["file_name"], e["text_extracted"], Jsonb(e.get("metadata") or {})) for e in entries),
+    )
+
+
 # ==================== PIPELINE ====================
 
 def create_pipeline_run(source: str, status: str = "pending", metadata: dict = None) -> str:
@@ -210,7 +498,7 @@ def create_pipeline_run(source: str, status: str = "pending", metadata: dict = N
                 INSERT INTO {SCHEMA}.pipeline_runs (source, status, metadata)
                 VALUES (%s, %s, %s)
                 RETURNING id
-            """, (source, status, metadata or {}))
+            """, (source, status, Jsonb(metadata or {})))
             result = cur.fetchone()
             conn.commit()
             return str(result['id'])
@@ -224,7 +512,7 @@ def update_pipeline_run(run_id: str, status: str, **kwargs) -> bool:
     for key in ['raw_path', 'clean_path', 'chunk_ids', 'vector_batch_id', 'metadata']:
         if key in kwargs:
             updates.append(f"{key} = %s")
-            values.append(kwargs[key])
+            values.append(Jsonb(kwargs[key]) if key == "metadata" else kwargs[key])
     
     values.append(run_id)
     
@@ -284,7 +572,7 @@ def log_whakapapa(id: str, title: str, category: str, summary: str,
                     data = EXCLUDED.data,
                     updated_at = NOW()
                 RETURNING id
-            """, (id, title, category, author, summary, content_type, data or {}))
+            """, (id, title, category, author, summary, content_type, Jsonb(data or {})))
             result = cur.fetchone()
             conn.commit()
             return str(result['id'])
@@ -335,7 +623,8 @@ def test_connection() -> Dict[str, Any]:
             "connected": True,
             "schema": SCHEMA,
             "tables": tables,
-            "table_count": len(tables)
+            "table_count": len(tables),
+            "pool": pool_stats(),
         }
     except Exception as e:
         return {
@@ -13,6 +13,9 @@ try:
 except ImportError:
     ConnectionPool = None
 
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "2"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+
 # Global pool instance
 _pool: Optional[ConnectionPool] = None
 
@@ -40,8 +43,8 @@ def _build_pool() -> Optional[ConnectionPool]:
         
         pool = ConnectionPool(
             db_url,
-            min_size=2,
-            max_size=10,
+            min_size=DB_POOL_MIN,
+            max_size=DB_POOL_MAX,
             timeout=5,
         )
         return pool
@@ -59,6 +62,16 @@ def get_pool() -> Optional[ConnectionPool]:
     return _pool
 
 
+def pool_stats() -> Dict[str, Any]:
+    """Current pool gauges (size, idle, waiting) plus cumulative counters."""
+    pool = _pool
+    if pool is None:
+        return {"initialized": False}
+    stats = dict(pool.get_stats())
+    stats["initialized"] = True
+    return stats
+
+
 @contextmanager
 def get_connection():
     """Context manager for getting a connection from the pool."""
@@ -0,0 +1,40 @@
+-- Full-text + trigram search for kitenga.context_memory and kitenga.taonga,
+-- plus an optional embedding column on context_memory for hybrid recall.
+--
+-- The 'simple' text search config is used on purpose: English stemming and
+-- stop words mangle te reo Māori (e.g. "a", "i", "he" are meaningful).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS vector;
+
+-- context_memory ----------------------------------------------------------
+
+ALTER TABLE kitenga.context_memory
+    ADD COLUMN IF NOT EXISTS search_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple', coalesce(content, ''))) STORED;
+
+ALTER TABLE kitenga.context_memory
+    ADD COLUMN IF NOT EXISTS embedding vector(1536);
+
+CREATE INDEX IF NOT EXISTS idx_context_memory_tsv
+    ON kitenga.context_memory USING gin (search_tsv);
+CREATE INDEX IF NOT EXISTS idx_context_memory_trgm
+    ON kitenga.context_memory USING gin (content gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_context_memory_embedding
+    ON kitenga.context_memory USING hnsw (embedding vector_cosine_ops);
+
+-- taonga ------------------------------------------------------------------
+
+ALTER TABLE kitenga.taonga
+    ADD COLUMN IF NOT EXISTS search_tsv tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_taonga_tsv
+    ON kitenga.taonga USING gin (search_tsv);
+CREATE INDEX IF NOT EXISTS idx_taonga_title_trgm
+    ON kitenga.taonga USING gin (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_taonga_content_trgm
+    ON kitenga.taonga USING gin (content gin_trgm_ops);
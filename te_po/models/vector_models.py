@@ -9,6 +9,8 @@ class EmbedRequest(BaseModel):
 class SearchRequest(BaseModel):
     query: str
     top_k: Optional[int] = 5
+    mode: Optional[str] = None  # "exact" | "ann"
+    nprobe: Optional[int] = None
 
 
 class VectorResult(BaseModel):
@@ -1,15 +1,178 @@
-def chunk_text(text: str, max_len: int = 800) -> list[str]:
-    words = text.split(" ")
-    chunks = []
-    buf = []
+"""
+Streaming text chunker.
+
+``iter_chunks`` makes a single pass over the input, splitting it into
+paragraphs, then sentences, then (for oversized sentences) words, and
+packs those segments into chunks no larger than ``max_size``. Size is
+measured in characters or in estimated tokens. Consecutive chunks can
+share ``overlap`` worth of trailing segments. Chunks are yielded as soon
+as they are complete, so embedding can start before the input is fully
+read.
+
+This module is dependency-free so Te Hau can share it.
+"""
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Callable, Deque, Iterable, Iterator, List, Tuple
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?…])[\"'”’)\]]*\s+")
+
+PARAGRAPH_SEP = "\n\n"
+SENTENCE_SEP = " "
 
-    for w in words:
-        buf.append(w)
-        if len(" ".join(buf)) > max_len:
-            chunks.append(" ".join(buf))
-            buf = []
 
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token)."""
+    return max(1, (len(text) + 3) // 4)
+
+
+def _measure(unit: str) -> Callable[[str], int]:
+    if unit == "chars":
+        return len
+    if unit == "tokens":
+        return estimate_tokens
+    raise ValueError(f"Unknown chunk size unit: {unit!r} (expected 'chars' or 'tokens')")
+
+
+def _split_oversized(segment: str, max_size: int, size_of: Callable[[str], int]) -> Iterator[str]:
+    """Break a segment that alone exceeds ``max_size`` into word runs (or hard slices)."""
+    buf: List[str] = []
+    buf_size = 0
+    for word in segment.split():
+        word_size = size_of(word)
+        if word_size > max_size:
+            if buf:
+                yield " ".join(buf)
+                buf, buf_size = [], 0
+            step = max_size if size_of is len else max_size * 4
+            for start in range(0, len(word), step):
+                yield word[start:start + step]
+            continue
+        extra = word_size + (1 if buf else 0)
+        if buf and buf_size + extra > max_size:
+            yield " ".join(buf)
+            buf, buf_size = [], 0
+            extra = word_size
+        buf.append(word)
+        buf_size += extra
     if buf:
-        chunks.append(" ".join(buf))
+        yield " ".join(buf)
+
+
+def _paragraphs(source: str | Iterable[str]) -> Iterator[str]:
+    """Yield paragraphs from a string or a stream of text pieces."""
+    if isinstance(source, str):
+        source = (source,)
+    pending = ""
+    for piece in source:
+        if not piece:
+            continue
+        # A break can only start in the trailing whitespace of what we already had.
+        scan_from = len(pending.rstrip())
+        pending += piece
+        start = 0
+        for match in _PARAGRAPH_BREAK.finditer(pending, scan_from):
+            para = pending[start:match.start()].strip()
+            if para:
+                yield para
+            start = match.end()
+        if start:
+            # The remainder may continue in the next piece.
+            pending = pending[start:]
+    if pending.strip():
+        yield pending.strip()
 
-    return chunks
+
+def _segments(
+    source: str | Iterable[str],
+    max_size: int,
+    size_of: Callable[[str], int],
+    respect_sentences: bool,
+) -> Iterator[Tuple[str, str]]:
+    """Yield ``(separator_before, segment)`` pairs no larger than ``max_size``."""
+    for para in _paragraphs(source):
+        sep = PARAGRAPH_SEP
+        sentences = _SENTENCE_END.split(para) if respect_sentences else [para]
+        for sentence in sentences:
+            sentence = " ".join(sentence.split())
+            if not sentence:
+                continue
+            pieces = (
+                _split_oversized(sentence, max_size, size_of)
+                if size_of(sentence) > max_size
+                else (sentence,)
+            )
+            for piece in pieces:
+                yield sep, piece
+                sep = SENTENCE_SEP
+
+
+def iter_chunks(
+    source: str | Iterable[str],
+    max_size: int = 800,
+    overlap: int = 0,
+    unit: str = "chars",
+    respect_sentences: bool = True,
+) -> Iterator[str]:
+    """
+    Lazily chunk ``source`` (a string or an iterable of text pieces).
+
+    Args:
+        source: Text, or a stream of text pieces (e.g. pages).
+        max_size: Maximum chunk size in ``unit``.
+        overlap: Approximate amount (in ``unit``) of trailing text repeated
+            at the start of the next chunk; whole segments only.
+        unit: ``"chars"`` or ``"tokens"`` (estimated, ~4 chars/token).
+        respect_sentences: Break at sentence ends inside paragraphs.
+    """
+    if max_size <= 0:
+        raise ValueError("max_size must be positive")
+    size_of = _measure(unit)
+    overlap = max(0, min(overlap, max_size // 2))
+
+    window: Deque[Tuple[str, str, int]] = deque()  # (sep, segment, cost)
+    window_size = 0
+    fresh = False  # window holds text not yet emitted
+    counts_seps = size_of is len
+
+    def _render() -> str:
+        parts: List[str] = []
+        for idx, (sep, segment, _) in enumerate(window):
+            if idx:
+                parts.append(sep)
+            parts.append(segment)
+        return "".join(parts)
+
+    for sep, segment in _segments(source, max_size, size_of, respect_sentences):
+        seg_size = size_of(segment)
+        cost = seg_size + (len(sep) if counts_seps else 0)
+        if window and window_size + cost > max_size:
+            if fresh:
+                yield _render()
+            # Keep whole trailing segments up to ``overlap`` for the next chunk.
+            kept: Deque[Tuple[str, str, int]] = deque()
+            kept_size = 0
+            while window and kept_size + window[-1][2] <= overlap:
+                item = window.pop()
+                kept.appendleft(item)
+                kept_size += item[2]
+            window = kept
+            window_size = kept_size
+            while window and window_size + cost > max_size:
+                window_size -= window.popleft()[2]
+            fresh = False
+        if not window:
+            cost = seg_size
+        window.append((sep, segment, cost))
+        window_size += cost
+        fresh = True
+
+    if window and fresh:
+        yield _render()
+
+
+def chunk_text(text: str, max_len: int = 800) -> list[str]:
+    return list(iter_chunks(text, max_size=max_len))
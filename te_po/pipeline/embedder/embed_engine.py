@@ -1,5 +1,121 @@
-from te_po.utils.openai_client import generate_embedding
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Sequence
+
+from te_po.pipeline.chunker.chunk_engine import estimate_tokens
+from te_po.utils.openai_client import generate_embedding, generate_embeddings
+
+# OpenAI accepts up to 2048 inputs / ~300k tokens per embeddings request; stay well below.
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "128"))
+EMBED_BATCH_TOKENS = int(os.getenv("EMBED_BATCH_TOKENS", "60000"))
+EMBED_MAX_CONCURRENCY = int(os.getenv("EMBED_MAX_CONCURRENCY", "4"))
 
 
 def embed_text(txt: str) -> list[float]:
     return list(generate_embedding(txt))
+
+
+def _batched(
+    texts: Iterable[str],
+    max_batch_size: int,
+    max_batch_tokens: int,
+) -> Iterator[list[tuple[int, str]]]:
+    """
+    Lazily group ``(index, text)`` pairs into batches capped by item count
+    and estimated tokens. A single text over the token cap is sent alone.
+    """
+    current: list[tuple[int, str]] = []
+    current_tokens = 0
+    for idx, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (len(current) >= max_batch_size or current_tokens + tokens > max_batch_tokens):
+            yield current
+            current = []
+            current_tokens = 0
+        current.append((idx, text))
+        current_tokens += tokens
+    if current:
+        yield current
+
+
+def plan_batches(
+    texts: Sequence[str],
+    max_batch_size: int = EMBED_BATCH_SIZE,
+    max_batch_tokens: int = EMBED_BATCH_TOKENS,
+) -> list[list[int]]:
+    """Indices of ``texts`` grouped the way ``embed_texts`` will send them."""
+    return [
+        [idx for idx, _ in batch]
+        for batch in _batched(texts, max_batch_size, max_batch_tokens)
+    ]
+
+
+def _embed_batch(batch: list[tuple[int, str]], model: str | None) -> list[list[float]]:
+    # The embeddings API rejects empty strings.
+    vectors = generate_embeddings([text or " " for _, text in batch], model=model)
+    return [list(vec) for vec in vectors]
+
+
+def iter_embeddings(
+    texts: Iterable[str],
+    model: str | None = None,
+    max_batch_size: int | None = None,
+    max_batch_tokens: int | None = None,
+    max_concurrency: int | None = None,
+) -> Iterator[tuple[str, list[float]]]:
+    """
+    Stream ``(text, vector)`` pairs in input order while ``texts`` is still
+    being produced (e.g. straight from ``chunk_engine.iter_chunks``).
+
+    A batch is submitted as soon as it fills; at most ``max_concurrency``
+    batches are in flight, after which reading from ``texts`` pauses until
+    the oldest batch has been yielded.
+    """
+    workers = max(1, max_concurrency or EMBED_MAX_CONCURRENCY)
+    pending: deque = deque()
+
+    def _drain_oldest() -> Iterator[tuple[str, list[float]]]:
+        batch, future = pending.popleft()
+        for (_, text), vec in zip(batch, future.result()):
+            yield text, vec
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embed") as pool:
+        for batch in _batched(
+            texts,
+            max_batch_size or EMBED_BATCH_SIZE,
+            max_batch_tokens or EMBED_BATCH_TOKENS,
+        ):
+            pending.append((batch, pool.submit(_embed_batch, batch, model)))
+            while len(pending) > workers:
+                yield from _drain_oldest()
+        while pending:
+            yield from _drain_oldest()
+
+
+def embed_texts(
+    texts: Sequence[str],
+    model: str | None = None,
+    max_batch_size: int | None = None,
+    max_batch_tokens: int | None = None,
+    max_concurrency: int | None = None,
+) -> list[list[float]]:
+    """
+    Embed many texts with as few OpenAI round-trips as possible.
+
+    Texts are grouped into size- and token-capped batches, up to
+    ``max_concurrency`` batches are in flight at once, and the returned
+    vectors line up with ``texts`` by index.
+    """
+    return [
+        vec
+        for _, vec in iter_embeddings(
+            texts,
+            model=model,
+            max_batch_size=max_batch_size,
+            max_batch_tokens=max_batch_tokens,
+            max_concurrency=max_concurrency,
+        )
+    ]
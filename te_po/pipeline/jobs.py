@@ -17,20 +17,35 @@ from te_po.pipeline.custom_queue import (
 )
 from te_po.pipeline.metrics import track_job
 from te_po.pipeline.job_tracking import track_pipeline_job
+from te_po.pipeline.progress import publish_progress
 from te_po.database import db_execute
+from te_po.services.supabase_service import flush_writes, queue_update
+from te_po.utils.audit import flush_audit
 from te_po.utils.supabase_client import get_client
 from te_po.core.env_loader import get_queue_mode
 
 SUPA = get_client()
 
 
-def _update_job(job_id: str, data: Dict[str, Any]):
+def _update_job(job_id: str, data: Dict[str, Any], final: bool = False):
+    """
+    Record a status transition: publish it live and write it to pipeline_jobs
+    (write-behind; final ones flush immediately). Stage/percent updates in
+    between go through ``_report`` only.
+    """
+    progress = data.get("progress") or {}
+    publish_progress(job_id, progress.get("stage", ""), progress.get("percent", 0), status=data.get("status"))
     if SUPA is None:
         return
-    try:
-        SUPA.table("pipeline_jobs").update(data).eq("id", job_id).execute()
-    except Exception:
-        return
+    queue_update("pipeline_jobs", {"id": job_id}, data)
+    if final:
+        flush_audit()
+        flush_writes()
+
+
+def _report(job_id: str, stage: str, percent: int) -> None:
+    """Live progress for subscribers; never touches the database."""
+    publish_progress(job_id, stage, percent, status="running")
 
 
 @track_job
@@ -52,22 +67,31 @@ def process_document(file_path: str, job_id: str, source: str = "queue") -> Dict
         data = path.read_bytes()
 
         # Mark ingestion
-        _update_job(job_id, {"progress": {"stage": "pipeline", "percent": 25}})
+        _report(job_id, "pipeline", 25)
 
-        # Check cancellation before heavy work
+        # Check cancellation before heavy work (after our own buffered updates land)
         try:
             if SUPA:
+                flush_writes()
                 status_row = (
                     SUPA.table("pipeline_jobs").select("status").eq("id", job_id).limit(1).execute()
                 )
                 row_data = getattr(status_row, "data", None) or []
                 if row_data and row_data[0].get("status") == "cancelled":
-                    _update_job(job_id, {"status": "cancelled", "progress": {"stage": "cancelled", "percent": 100}})
+                    _update_job(
+                        job_id, {"status": "cancelled", "progress": {"stage": "cancelled", "percent": 100}}, final=True
+                    )
                     return {"status": "cancelled"}
         except Exception:
             pass
 
-        result = run_pipeline(data, filename=path.name, source=source, generate_summary=True)
+        result = run_pipeline(
+            data,
+            filename=path.name,
+            source=source,
+            generate_summary=True,
+            progress=lambda stage, percent: _report(job_id, stage, percent),
+        )
 
         _update_job(
             job_id,
@@ -77,6 +101,7 @@ def process_document(file_path: str, job_id: str, source: str = "queue") -> Dict
                 "result": result,
                 "duration_sec": round(time.time() - start, 2),
             },
+            final=True,
         )
         return result
     except Exception as exc:
@@ -87,6 +112,7 @@ def process_document(file_path: str, job_id: str, source: str = "queue") -> Dict
                 "progress": {"stage": "error", "percent": 100},
                 "result": {"error": str(exc)},
             },
+            final=True,
         )
         # Dead-letter enqueue
         if dead_queue:
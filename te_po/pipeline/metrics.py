@@ -7,7 +7,7 @@ import logging
 from typing import Any
 
 try:
-    from prometheus_client import Counter, Histogram
+    from prometheus_client import Counter, Gauge, Histogram
 except ImportError:  # pragma: no cover
     class _DummyMetric:
         def __init__(self, *args: Any, **kwargs: Any) -> None:  # pragma: no cover
@@ -19,7 +19,14 @@ except ImportError:  # pragma: no cover
         def observe(self, value: float) -> None:  # pragma: no cover
             pass
 
+        def set_function(self, fn) -> None:  # pragma: no cover
+            pass
+
+        def labels(self, *args: Any, **kwargs: Any) -> "_DummyMetric":  # pragma: no cover
+            return self
+
     Counter = _DummyMetric
+    Gauge = _DummyMetric
     Histogram = _DummyMetric
 
 try:
@@ -31,6 +38,27 @@ jobs_total = Counter("jobs_total", "Total pipeline jobs processed")
 jobs_failed = Counter("jobs_failed", "Pipeline jobs that failed")
 job_duration = Histogram("job_duration_seconds", "Pipeline job duration seconds")
 
+read_cache_hits = Counter("read_cache_hits", "Supabase read cache hits", ["table", "tier"])
+read_cache_misses = Counter("read_cache_misses", "Supabase read cache misses", ["table"])
+read_cache_invalidations = Counter("read_cache_invalidations", "Supabase read cache table invalidations", ["table"])
+
+
+def _pool_stat(key: str):
+    def read() -> float:
+        from te_po.database.postgres import pool_stats
+
+        return float(pool_stats().get(key, 0) or 0)
+
+    return read
+
+
+db_pool_size = Gauge("db_pool_size", "Open PostgreSQL pool connections")
+db_pool_available = Gauge("db_pool_available", "Idle PostgreSQL pool connections")
+db_pool_waiting = Gauge("db_pool_requests_waiting", "Callers waiting for a PostgreSQL pool connection")
+db_pool_size.set_function(_pool_stat("pool_size"))
+db_pool_available.set_function(_pool_stat("pool_available"))
+db_pool_waiting.set_function(_pool_stat("requests_waiting"))
+
 
 def track_job(func):
     @wraps(func)
@@ -66,4 +94,12 @@ def log_memory_usage(stage: str):
     )
 
 
-__all__ = ["track_job", "jobs_total", "jobs_failed", "job_duration"]
+__all__ = [
+    "track_job",
+    "jobs_total",
+    "jobs_failed",
+    "job_duration",
+    "db_pool_size",
+    "db_pool_available",
+    "db_pool_waiting",
+]
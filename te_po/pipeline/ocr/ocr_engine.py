@@ -1,22 +1,10 @@
-import subprocess
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List
 
-from te_po.core.config import settings
 from te_po.pipeline.ocr.stealth_engine import StealthOCR
 
-
-def _tesseract_available(path: Optional[str]) -> bool:
-    try:
-        subprocess.run(
-            [path or "tesseract", "-v"],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=False,
-        )
-        return True
-    except Exception:
-        return False
+_scanners = {True: StealthOCR(), False: StealthOCR()}
+_scanners[False].cultural_encoding_active = False
 
 
 def run_ocr(image_bytes: bytes, mode: str = "research", apply_encoding: bool = True) -> Dict[str, Any]:
@@ -26,14 +14,17 @@ def run_ocr(image_bytes: bytes, mode: str = "research", apply_encoding: bool = T
     - mode: "research" or "taonga"
     - apply_encoding: when False, bypass cultural encoding
     """
-    try:
-        scanner = StealthOCR()
-        if not apply_encoding:
-            scanner.cultural_encoding_active = False
+    return run_ocr_many([image_bytes], mode=mode, apply_encoding=apply_encoding)[0]
 
-        result = scanner.real_scan(image_bytes, prefer_offline=True)
-        result["timestamp"] = datetime.utcnow().isoformat() + "Z"
-        result["mode"] = mode
-        return result
+
+def run_ocr_many(images: List[bytes], mode: str = "research", apply_encoding: bool = True) -> List[Dict[str, Any]]:
+    """Batch ``run_ocr``: all images share the pooled tesseract workers."""
+    try:
+        results = _scanners[bool(apply_encoding)].real_scan_many(list(images), prefer_offline=True)
     except Exception as exc:
-        return {"text": "", "error": str(exc)}
+        return [{"text": "", "error": str(exc)} for _ in images]
+    stamp = datetime.utcnow().isoformat() + "Z"
+    for result in results:
+        result["timestamp"] = stamp
+        result["mode"] = mode
+    return results
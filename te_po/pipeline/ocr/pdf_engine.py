@@ -0,0 +1,200 @@
+"""
+Parallel PDF text extraction.
+
+Pages are split into ranges and farmed out to a shared process pool;
+each worker opens the PDF once, extracts text with pdfplumber and renders
+image-only pages to PNG. Page text is streamed back in page order, with
+image-only pages OCR'd by local tesseract under a separate concurrency
+budget (tesseract is itself multi-threaded, so running one per core just
+thrashes).
+
+Small documents are handled inline; the pool only pays off once there
+are several ranges to spread across cores.
+"""
+from __future__ import annotations
+
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "8"))
+PDF_OCR_CONCURRENCY = int(os.getenv("PDF_OCR_CONCURRENCY", "2"))
+PDF_OCR_RESOLUTION = int(os.getenv("PDF_OCR_RESOLUTION", "200"))
+# Pages with fewer extracted characters than this are treated as image-only.
+PDF_OCR_MIN_CHARS = int(os.getenv("PDF_OCR_MIN_CHARS", "16"))
+
+
+@dataclass
+class PdfPage:
+    """Text of one page; ``method`` is ``"text"``, ``"ocr"`` or ``"empty"``."""
+
+    number: int
+    text: str
+    method: str
+
+
+# (page number, extracted text, PNG bytes of an image-only page or None)
+_RawPage = Tuple[int, str, Optional[bytes]]
+
+
+def _extract_range(path: str, start: int, stop: int, render: bool, resolution: int) -> List[_RawPage]:
+    """Worker: extract pages ``[start, stop)`` of the PDF at ``path``."""
+    import pdfplumber
+
+    out: List[_RawPage] = []
+    with pdfplumber.open(path) as pdf:
+        for number in range(start, min(stop, len(pdf.pages))):
+            page = pdf.pages[number]
+            try:
+                text = (page.extract_text() or "").strip()
+            except Exception:
+                text = ""
+            image = None
+            if render and len(text) < PDF_OCR_MIN_CHARS and page.images:
+                try:
+                    png = io.BytesIO()
+                    page.to_image(resolution=resolution).original.save(png, format="PNG")
+                    image = png.getvalue()
+                except Exception:
+                    image = None
+            out.append((number, text, image))
+            page.flush_cache()
+    return out
+
+
+def _page_count(path: str) -> int:
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+_pool: ProcessPoolExecutor | None = None
+_ocr_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: the parent runs threads (io_pool, RQ heartbeats) that fork would copy mid-lock.
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, PDF_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _ocr_executor() -> ThreadPoolExecutor:
+    global _ocr_pool
+    with _pool_lock:
+        if _ocr_pool is None:
+            _ocr_pool = ThreadPoolExecutor(max_workers=max(1, PDF_OCR_CONCURRENCY), thread_name_prefix="pdf-ocr")
+        return _ocr_pool
+
+
+def _ocr_pngs(images: List[bytes]) -> List[str]:
+    from te_po.pipeline.ocr.tesseract_pool import get_tesseract_pool
+
+    return get_tesseract_pool().scan_many(images)
+
+
+@contextmanager
+def _as_path(source: bytes | str | Path):
+    """Workers need a path; spill in-memory PDFs to a temp file once."""
+    if not isinstance(source, (bytes, bytearray)):
+        yield str(source)
+        return
+    fd, tmp = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(source)
+        yield tmp
+    finally:
+        os.unlink(tmp)
+
+
+def iter_pdf_pages(
+    source: bytes | str | Path,
+    ocr: bool = True,
+    workers: int | None = None,
+    pages_per_task: int | None = None,
+) -> Iterator[PdfPage]:
+    """
+    Stream the pages of a PDF (bytes or path) in order.
+
+    Args:
+        source: PDF bytes or a filesystem path.
+        ocr: OCR image-only pages with local tesseract.
+        workers: Process count; ``1`` extracts inline without the pool.
+        pages_per_task: Pages handed to a worker at a time.
+    """
+    try:
+        import pdfplumber  # noqa: F401
+    except Exception:
+        return
+
+    workers = PDF_WORKERS if workers is None else workers
+    per_task = max(1, pages_per_task or PDF_PAGES_PER_TASK)
+
+    with _as_path(source) as path:
+        try:
+            total = _page_count(path)
+        except Exception:
+            return
+        ranges = [(start, start + per_task) for start in range(0, total, per_task)]
+
+        if workers <= 1 or len(ranges) <= 1:
+            def _submit(start: int, stop: int) -> Future:
+                fut: Future = Future()
+                fut.set_result(_extract_range(path, start, stop, ocr, PDF_OCR_RESOLUTION))
+                return fut
+        else:
+            pool = _process_pool()
+
+            def _submit(start: int, stop: int) -> Future:
+                return pool.submit(_extract_range, path, start, stop, ocr, PDF_OCR_RESOLUTION)
+
+        # Keep a bounded number of ranges in flight so memory stays flat on huge PDFs.
+        in_flight = max(2, workers * 2)
+        pending: deque = deque()
+        todo = iter(ranges)
+        for start, stop in todo:
+            pending.append(_submit(start, stop))
+            if len(pending) >= in_flight:
+                break
+
+        while pending:
+            raw_pages = pending.popleft().result()
+            for start, stop in todo:
+                pending.append(_submit(start, stop))
+                break
+            scanned = [(number, image) for number, _, image in raw_pages if image is not None]
+            ocr_texts: dict = {}
+            if scanned:
+                # One batched tesseract call per range, under the OCR concurrency budget.
+                texts = _ocr_executor().submit(_ocr_pngs, [image for _, image in scanned]).result()
+                ocr_texts = {number: text.strip() for (number, _), text in zip(scanned, texts)}
+            for number, text, _ in raw_pages:
+                if ocr_texts.get(number):
+                    yield PdfPage(number, ocr_texts[number], "ocr")
+                else:
+                    yield PdfPage(number, text, "text" if text else "empty")
+
+
+def extract_pdf_text(source: bytes | str | Path, ocr: bool = True) -> str:
+    """All non-empty page texts joined by blank lines."""
+    return "\n\n".join(p.text for p in iter_pdf_pages(source, ocr=ocr) if p.text).strip()
+
+
+__all__ = ["PdfPage", "iter_pdf_pages", "extract_pdf_text", "PDF_WORKERS", "PDF_OCR_CONCURRENCY"]
@@ -4,11 +4,11 @@ import base64
 import hashlib
 import json
 import re
-import subprocess
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from te_po.core.config import settings
+from te_po.pipeline.ocr.pdf_engine import iter_pdf_pages
+from te_po.pipeline.ocr.tesseract_pool import get_tesseract_pool
 from te_po.utils.openai_client import DEFAULT_VISION_MODEL, client
 
 # Optional PDF/text helpers
@@ -70,18 +70,28 @@ class StealthOCR:
         """
         Real OCR: tesseract (eng+mri) first, fallback to OpenAI vision, then cultural protection.
         """
-        result = self._real_tesseract_scan(image_data) if prefer_offline else {"text_extracted": "", "confidence": 0}
-        if not result.get("text_extracted"):
-            result = self._real_vision_scan(image_data)
-
-        wrapped = {
-            "text_extracted": result.get("text_extracted") or "",
-            "confidence": result.get("confidence", 0),
-            "method_used": result.get("method_used"),
-        }
-        wrapped = self._apply_cultural_protection(wrapped)
-        wrapped["raw_text"] = result.get("text_extracted") or ""
-        return wrapped
+        return self.real_scan_many([image_data], prefer_offline=prefer_offline)[0]
+
+    def real_scan_many(self, images: List[bytes], prefer_offline: bool = True) -> List[Dict[str, Any]]:
+        """Batch form of ``real_scan``: one shared tesseract pass, vision only for the misses."""
+        if prefer_offline:
+            results = self._real_tesseract_scan_many(images)
+        else:
+            results = [{"text_extracted": "", "confidence": 0} for _ in images]
+
+        out = []
+        for image_data, result in zip(images, results):
+            if not result.get("text_extracted"):
+                result = self._real_vision_scan(image_data)
+            wrapped = {
+                "text_extracted": result.get("text_extracted") or "",
+                "confidence": result.get("confidence", 0),
+                "method_used": result.get("method_used"),
+            }
+            wrapped = self._apply_cultural_protection(wrapped)
+            wrapped["raw_text"] = result.get("text_extracted") or ""
+            out.append(wrapped)
+        return out
 
     def psycheract_scan(self, image_data: bytes, prefer_offline: bool = True) -> Dict[str, Any]:
         """Alias for real_scan to keep legacy naming."""
@@ -104,10 +114,10 @@ class StealthOCR:
                     "method_used": "error",
                 }
             try:
-                with pdfplumber.open(str(path)) as pdf:
-                    pages = [p.extract_text() or "" for p in pdf.pages]
-                text = "\n\n".join(pages).strip()
-                res = {"text_extracted": text, "confidence": 90 if text else 0, "method_used": "pdf_extract"}
+                pages = list(iter_pdf_pages(path, ocr=prefer_offline))
+                text = "\n\n".join(p.text for p in pages if p.text).strip()
+                method = "pdf_extract+ocr" if any(p.method == "ocr" for p in pages) else "pdf_extract"
+                res = {"text_extracted": text, "confidence": 90 if text else 0, "method_used": method}
                 return self._apply_cultural_protection(res) if apply_encoding else res
             except Exception as exc:
                 return {"text_extracted": f"[pdf error] {exc}", "confidence": 0, "method_used": "error"}
@@ -122,36 +132,26 @@ class StealthOCR:
 
     # Tesseract + vision primitives
     def _tesseract_available(self) -> bool:
-        try:
-            subprocess.run(
-                [settings.tesseract_path or "tesseract", "-v"],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=False,
-            )
-            return True
-        except Exception:
-            return False
+        return get_tesseract_pool().available()
 
     def _real_tesseract_scan(self, image_data: bytes) -> Dict[str, Any]:
-        if not self._tesseract_available():
-            return {"text_extracted": "", "confidence": 0, "method_used": "tesseract_missing"}
+        return self._real_tesseract_scan_many([image_data])[0]
+
+    def _real_tesseract_scan_many(self, images: List[bytes]) -> List[Dict[str, Any]]:
+        pool = get_tesseract_pool()
+        if not pool.available():
+            return [{"text_extracted": "", "confidence": 0, "method_used": "tesseract_missing"} for _ in images]
         try:
-            proc = subprocess.run(
-                [settings.tesseract_path or "tesseract", "stdin", "stdout", "-l", "eng+mri"],
-                input=image_data,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                check=False,
-            )
-            text = proc.stdout.decode(errors="ignore").strip()
-            return {
-                "text_extracted": text,
-                "confidence": 85 if text else 0,
-                "method_used": "offline_tesseract",
-            }
+            texts = pool.scan_many(images)
         except Exception as exc:
-            return {"text_extracted": f"[tesseract error] {exc}", "confidence": 0, "method_used": "error"}
+            return [
+                {"text_extracted": f"[tesseract error] {exc}", "confidence": 0, "method_used": "error"}
+                for _ in images
+            ]
+        return [
+            {"text_extracted": text, "confidence": 85 if text else 0, "method_used": "offline_tesseract"}
+            for text in texts
+        ]
 
     def _real_vision_scan(self, image_data: bytes) -> Dict[str, Any]:
         if client is None:
@@ -0,0 +1,219 @@
+"""
+Shared tesseract OCR workers.
+
+Starting tesseract and loading the ``eng+mri`` traineddata dominates the
+cost of OCR'ing a small image, so this module avoids paying it per image:
+
+- the availability probe runs once per binary path and is cached;
+- with ``tesserocr`` installed (it is in ``requirements.txt``; the image
+  needs ``libtesseract-dev``, ``libleptonica-dev``, ``pkg-config`` and
+  ``tesseract-ocr-mri``), a bounded pool of worker processes each keeps
+  one ``PyTessBaseAPI`` (languages loaded) alive for its lifetime;
+- otherwise (e.g. a local install without the C headers) images are
+  grouped and each group goes through a single tesseract CLI run via a
+  file list, so the language data is loaded once per group rather than
+  once per image. Groups run concurrently up to ``OCR_WORKERS`` but are
+  never smaller than ``OCR_MIN_GROUP``, so small requests share one
+  process.
+"""
+from __future__ import annotations
+
+import io
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from te_po.core.config import settings
+
+try:
+    import tesserocr  # type: ignore
+except Exception:  # pragma: no cover - optional accelerator
+    tesserocr = None
+
+OCR_LANG = os.getenv("OCR_LANG", "eng+mri")
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
+OCR_BATCH_SIZE = int(os.getenv("OCR_BATCH_SIZE", "16"))
+# Below this many images per CLI run, start-up outweighs running in parallel.
+OCR_MIN_GROUP = int(os.getenv("OCR_MIN_GROUP", "4"))
+OCR_TIMEOUT = float(os.getenv("OCR_TIMEOUT", "120"))
+
+_PAGE_SEPARATOR = "\f"
+
+
+@lru_cache(maxsize=None)
+def tesseract_available(path: str | None = None) -> bool:
+    """Probe the tesseract binary once per path."""
+    binary = path or "tesseract"
+    if shutil.which(binary) is None and not Path(binary).is_file():
+        return False
+    try:
+        proc = subprocess.run(
+            [binary, "--version"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+            timeout=10,
+        )
+        return proc.returncode == 0
+    except Exception:
+        return False
+
+
+# ----------------------------------------------------------------------
+# tesserocr worker processes
+# ----------------------------------------------------------------------
+
+_worker_api = None
+
+
+def _init_worker(lang: str) -> None:
+    global _worker_api
+    _worker_api = tesserocr.PyTessBaseAPI(lang=lang)
+
+
+def _worker_scan(image: bytes) -> str:
+    from PIL import Image
+
+    with Image.open(io.BytesIO(image)) as img:
+        _worker_api.SetImage(img)
+        return (_worker_api.GetUTF8Text() or "").strip()
+
+
+# ----------------------------------------------------------------------
+# Pool
+# ----------------------------------------------------------------------
+
+
+class TesseractPool:
+    """OCR many images while paying tesseract start-up as rarely as possible."""
+
+    def __init__(
+        self,
+        binary: str | None = None,
+        lang: str = OCR_LANG,
+        workers: int = OCR_WORKERS,
+        batch_size: int = OCR_BATCH_SIZE,
+        use_api: bool | None = None,
+    ):
+        self.binary = binary or settings.tesseract_path or "tesseract"
+        self.lang = lang
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.use_api = tesserocr is not None if use_api is None else use_api
+        self._procs: Optional[ProcessPoolExecutor] = None
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        return self.use_api or tesseract_available(self.binary)
+
+    # -- executors -----------------------------------------------------
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._procs is None:
+                self._procs = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.lang,),
+                )
+            return self._procs
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tesseract")
+            return self._threads
+
+    # -- CLI batch path ------------------------------------------------
+
+    def _run_cli(self, args: List[str], stdin: bytes | None = None) -> str:
+        proc = subprocess.run(
+            [self.binary, *args, "stdout", "-l", self.lang],
+            input=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=False,
+            timeout=OCR_TIMEOUT,
+        )
+        return proc.stdout.decode(errors="ignore")
+
+    def _scan_group(self, images: Sequence[bytes]) -> List[str]:
+        if len(images) == 1:
+            return [self._run_cli(["stdin"], stdin=images[0]).strip()]
+        with tempfile.TemporaryDirectory(prefix="ocr-batch-") as tmp:
+            paths = []
+            for idx, image in enumerate(images):
+                path = Path(tmp) / f"{idx:05d}.img"
+                path.write_bytes(image)
+                paths.append(str(path))
+            listing = Path(tmp) / "images.txt"
+            listing.write_text("\n".join(paths) + "\n", encoding="utf-8")
+            output = self._run_cli([str(listing)])
+        pages = output.split(_PAGE_SEPARATOR)
+        if pages and not pages[-1].strip():
+            pages.pop()
+        if len(pages) != len(images):
+            # Multi-frame images (e.g. TIFF) break the one-page-per-image mapping.
+            return [self._run_cli(["stdin"], stdin=image).strip() for image in images]
+        return [page.strip() for page in pages]
+
+    # -- public API ----------------------------------------------------
+
+    def scan_many(self, images: Sequence[bytes]) -> List[str]:
+        """OCR ``images``; returns one text per image, in order ("" on failure)."""
+        if not images:
+            return []
+        if not self.available():
+            return ["" for _ in images]
+        if self.use_api:
+            groups = [[image] for image in images]
+            futures = [self._process_pool().submit(_worker_scan, image) for image in images]
+        else:
+            size = self.batch_size
+            if len(images) < size * self.workers:
+                # Spread batches across workers instead of one long CLI run,
+                # but keep small ones together: one start-up beats several.
+                size = max(min(OCR_MIN_GROUP, size), -(-len(images) // self.workers))
+            groups = [images[i:i + size] for i in range(0, len(images), size)]
+            futures = [self._thread_pool().submit(self._scan_group, group) for group in groups]
+
+        texts: List[str] = []
+        for group, future in zip(groups, futures):
+            try:
+                result = future.result()
+            except Exception:
+                result = None
+            if result is None:
+                texts.extend("" for _ in group)
+            elif isinstance(result, str):
+                texts.append(result)
+            else:
+                texts.extend(result)
+        return texts
+
+    def scan(self, image: bytes) -> str:
+        return self.scan_many([image])[0]
+
+
+_pool: Optional[TesseractPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_tesseract_pool() -> TesseractPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = TesseractPool()
+        return _pool
+
+
+__all__ = ["TesseractPool", "get_tesseract_pool", "tesseract_available", "OCR_LANG", "OCR_WORKERS"]
@@ -1,21 +1,23 @@
 import base64
 import hashlib
-import io
 import json
 import os
 import re
 import uuid
-from typing import Any, Dict, Tuple
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Tuple
 
 from te_po.mauri import MAURI
 from te_po.pipeline.cleaner.text_cleaner import clean_text
-from te_po.pipeline.chunker.chunk_engine import chunk_text
-from te_po.pipeline.embedder.embed_engine import embed_text
-from te_po.pipeline.ocr.ocr_engine import run_ocr
+from te_po.pipeline.chunker.chunk_engine import iter_chunks
+from te_po.pipeline.embedder.embed_engine import iter_embeddings
+from te_po.pipeline.ocr.ocr_engine import run_ocr, run_ocr_many
+from te_po.pipeline.ocr.pdf_engine import extract_pdf_text
+from te_po.pipeline.staged import Stage, StagedPipeline, io_pool
 from te_po.stealth_ocr import AUTHOR_TAG, annotate_payload, pipeline_context, protect_text
 from te_po.pipeline.supabase_writer.writer import save_chunk
 from te_po.services.local_storage import save, timestamp
-from te_po.services.vector_service import push_chunk_embedding
+from te_po.services.vector_service import push_chunk_embeddings
 from te_po.services.supabase_service import (
     record_file_metadata,
     upload_bytes,
@@ -27,8 +29,7 @@ from te_po.services.supabase_service import (
 from te_po.utils.openai_client import (
     client as oa_client,
     DEFAULT_BACKEND_MODEL,
-    generate_text,
-    last_openai_run_id,
+    generate_text_with_run,
 )
 from te_po.pipeline.metrics import log_memory_usage
 
@@ -40,31 +41,10 @@ AUDIO_EXT = {".wav", ".mp3", ".m4a"}
 
 def _extract_pdf_text(file_bytes: bytes) -> str:
     """
-    Extract text from PDF using pdfplumber only (fast path).
-    OCR fallback is intentionally disabled here to avoid long-running tesseract/image conversions.
-    If a PDF is image-only, prefer uploading images directly or add a dedicated OCR path.
+    Extract text from every page of a PDF. Pages are processed in parallel
+    worker processes; image-only pages fall back to local tesseract OCR.
     """
-    text_parts: list[str] = []
-    PAGE_LIMIT = 10  # cap to avoid long-running extraction on huge PDFs
-
-    try:
-        import pdfplumber
-    except Exception:
-        pdfplumber = None
-
-    if pdfplumber:
-        try:
-            with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-                for idx, page in enumerate(pdf.pages):
-                    if idx >= PAGE_LIMIT:
-                        break
-                    extracted = page.extract_text() or ""
-                    if extracted.strip():
-                        text_parts.append(extracted.strip())
-        except Exception:
-            pass
-
-    return "\n\n".join(text_parts).strip()
+    return extract_pdf_text(file_bytes)
 
 
 def _persist_raw(
@@ -129,8 +109,7 @@ def _html_to_text(raw: str) -> str:
         return re.sub(r"<[^>]+>", " ", raw)
 
 
-def _note_openai_run(pipeline_meta: Dict[str, Any]) -> None:
-    run_id = last_openai_run_id()
+def _note_openai_run(pipeline_meta: Dict[str, Any], run_id: str | None) -> None:
     if not run_id:
         return
     pipeline_meta.setdefault("openai_run_ids", [])
@@ -138,6 +117,36 @@ def _note_openai_run(pipeline_meta: Dict[str, Any]) -> None:
         pipeline_meta["openai_run_ids"].append(run_id)
 
 
+def _start_summaries(cleaned: str) -> Tuple[Future, Future]:
+    """
+    Kick off the short and long summaries concurrently on the I/O pool.
+    Each future resolves to ``(text, openai_run_id)``.
+    """
+    short = io_pool.submit(
+        generate_text_with_run,
+        [
+            {"role": "system", "content": "Summarize the following text succinctly in 3-6 sentences."},
+            {"role": "user", "content": cleaned[:12000]},
+        ],
+        model=DEFAULT_BACKEND_MODEL,
+        max_tokens=500,
+    )
+    # Longer contextual summary for storage/research
+    long = io_pool.submit(
+        generate_text_with_run,
+        [
+            {
+                "role": "system",
+                "content": "Provide a richer summary (approx 800-1200 words) capturing key themes, entities, timelines, and locations. Keep it culturally respectful.",
+            },
+            {"role": "user", "content": cleaned[:20000]},
+        ],
+        model=DEFAULT_BACKEND_MODEL,
+        max_tokens=1800,
+    )
+    return short, long
+
+
 def run_pipeline(
     file_bytes: bytes,
     filename: str | None = None,
@@ -145,14 +154,19 @@ def run_pipeline(
     generate_summary: bool = False,
     mode: str | None = None,
     allow_taonga_store: bool = False,
+    progress: Callable[[str, int], None] | None = None,
 ) -> dict[str, Any]:
+    """``progress(stage, percent)`` is called as each stage completes (e.g. live job progress)."""
     log_memory_usage("start of pipeline")
+    report = progress or (lambda stage, percent: None)
 
     pipeline_run_id = str(uuid.uuid4())
     pipeline_meta = pipeline_context(pipeline_run_id)
 
     taonga_restricted = (mode or source) == "taonga" and not allow_taonga_store
-    raw_file, raw_upload, raw_encoded = _persist_raw(
+    # Raw upload runs in the background while text is extracted.
+    raw_future = io_pool.submit(
+        _persist_raw,
         file_bytes,
         filename,
         source,
@@ -165,8 +179,6 @@ def run_pipeline(
         or "unknown"
     )
 
-    log_memory_usage("after raw file persistence")
-
     # Detect file type and extract text accordingly
     ext = ""
     if "." in name:
@@ -174,6 +186,12 @@ def run_pipeline(
 
     ocr_meta_records: list[dict[str, Any]] = []
 
+    def _unsupported(reason: str) -> Dict[str, Any]:
+        # The raw upload was started before type detection; finish it (and
+        # surface its errors) before returning.
+        raw_future.result()
+        return {"status": "unsupported", "reason": reason, "file": filename}
+
     def _protect_and_record(text_value: str, label: str) -> str:
         if not text_value:
             return text_value
@@ -212,56 +230,58 @@ def run_pipeline(
         if ext in {".html", ".htm"}:
             # OCR any embedded base64 images before stripping HTML
             base64_images = re.findall(r"data:image/[^;]+;base64,([A-Za-z0-9+/=]+)", raw_text, flags=re.IGNORECASE)
+            decoded_images = []
             for b64img in base64_images[:5]:  # cap to avoid overload
                 try:
-                    img_bytes = base64.b64decode(b64img)
-                    ocr_result = run_ocr(img_bytes, mode=mode or source, apply_encoding=True)
-                    if ocr_result.get("protected_text"):
-                        raw_text += "\n\n" + (ocr_result.get("protected_text") or "")
-                    ocr_meta_records.append(
-                        {
-                            "method_used": ocr_result.get("method_used"),
-                            "confidence": ocr_result.get("confidence"),
-                            "cultural_content": ocr_result.get("cultural_content"),
-                            "stealth_encoded": ocr_result.get("stealth_encoded"),
-                            "protected_text": ocr_result.get("protected_text"),
-                            "protection_metadata": ocr_result.get("metadata"),
-                        }
-                    )
+                    decoded_images.append(base64.b64decode(b64img))
                 except Exception:
                     continue
+            # One pooled OCR pass for every embedded image.
+            for ocr_result in run_ocr_many(decoded_images, mode=mode or source, apply_encoding=True):
+                if ocr_result.get("error"):
+                    continue
+                if ocr_result.get("protected_text"):
+                    raw_text += "\n\n" + (ocr_result.get("protected_text") or "")
+                ocr_meta_records.append(
+                    {
+                        "method_used": ocr_result.get("method_used"),
+                        "confidence": ocr_result.get("confidence"),
+                        "cultural_content": ocr_result.get("cultural_content"),
+                        "stealth_encoded": ocr_result.get("stealth_encoded"),
+                        "protected_text": ocr_result.get("protected_text"),
+                        "protection_metadata": ocr_result.get("metadata"),
+                    }
+                )
             raw_text = _html_to_text(raw_text)
         raw_text = _protect_and_record(raw_text, "text_input" if ext not in {".html", ".htm"} else "html_extraction")
     elif ext in PDF_EXT:
         raw_text = _extract_pdf_text(file_bytes)
         if not raw_text:
-            return {
-                "status": "unsupported",
-                "reason": "PDF text could not be extracted (install pypdf or check file)",
-                "file": filename,
-            }
+            return _unsupported("PDF text could not be extracted (install pypdf or check file)")
         raw_text = _protect_and_record(raw_text, "pdf_extraction")
     elif ext in AUDIO_EXT:
-        return {
-            "status": "unsupported",
-            "reason": "Audio transcription not implemented in this pipeline",
-            "file": filename,
-        }
+        return _unsupported("Audio transcription not implemented in this pipeline")
     else:
-        return {
-            "status": "unsupported",
-            "reason": f"Unsupported file type: {ext or 'unknown'}",
-            "file": filename,
-        }
+        return _unsupported(f"Unsupported file type: {ext or 'unknown'}")
 
+    report("extracted", 35)
     cleaned = clean_text(raw_text)
-    clean_file, clean_upload = _persist_clean_text(
+    report("cleaned", 40)
+    clean_future = io_pool.submit(
+        _persist_clean_text,
         cleaned,
         source,
         allow_supabase=not taonga_restricted,
     )
 
-    chunks = chunk_text(cleaned)
+    # Summaries only need the cleaned text, so they run alongside chunk embedding.
+    summary_futures = None
+    if generate_summary and oa_client is not None:
+        summary_futures = _start_summaries(cleaned)
+
+    raw_file, raw_upload, raw_encoded = raw_future.result()
+    log_memory_usage("after raw file persistence")
+
     meta = {
         "source": source,
         "glyph": glyph,
@@ -269,32 +289,53 @@ def run_pipeline(
         "mode": mode or source,
     }
     meta.update(pipeline_meta)
+    embedding_metadata = {"source": source, "glyph": glyph}
+    embedding_metadata.update(pipeline_meta)
 
-    stored_chunks = []
-    vector_batch_id = None
-    for chunk in chunks:
-        embedding = embed_text(chunk)
+    def _store(item: Tuple[str, list]) -> Dict[str, Any]:
+        chunk, embedding = item
         chunk_record = save_chunk(chunk, embedding, meta)
-        chunk_hash = hashlib.sha256(chunk.encode("utf-8", errors="ignore")).hexdigest()
-        embedding_metadata = {"source": source, "glyph": glyph}
-        embedding_metadata.update(pipeline_meta)
-        remote = push_chunk_embedding(
-            chunk_id=chunk_record["id"],
-            text=chunk,
-            embedding=embedding,
-            metadata=embedding_metadata,
-        )
-        stored_chunks.append(
-            {
-                "id": chunk_record["id"],
-                "path": chunk_record["path"],
-                "length": len(chunk),
-                "hash": chunk_hash,
-                "remote": remote,
-            }
-        )
-    if not vector_batch_id and isinstance(remote, dict):
-        vector_batch_id = remote.get("batch_id")
+        return {
+            "chunk": chunk,
+            "embedding": embedding,
+            "record": chunk_record,
+            "hash": hashlib.sha256(chunk.encode("utf-8", errors="ignore")).hexdigest(),
+        }
+
+    # chunk -> embed (batched, streaming) -> local store, with a bounded
+    # queue between stages so slow disk writes back up embedding.
+    chunk_pipeline = StagedPipeline([Stage("store", _store, workers=2)])
+    stored = chunk_pipeline.run(iter_embeddings(iter_chunks(cleaned)))
+    report("embedded", 70)
+
+    # One bulk upload + file batch for the whole run instead of two API calls per chunk.
+    remote = push_chunk_embeddings(
+        [
+            {"chunk_id": item["record"]["id"], "text": item["chunk"], "embedding": item["embedding"]}
+            for item in stored
+        ],
+        metadata=embedding_metadata,
+        run_id=pipeline_run_id,
+    )
+    vector_batch_id = remote.get("batch_id")
+    report("vector_push", 85)
+    stored_chunks = [
+        {
+            "id": item["record"]["id"],
+            "path": item["record"]["path"],
+            "length": len(item["chunk"]),
+            "hash": item["hash"],
+            "remote": {
+                "pushed": remote.get("pushed"),
+                "reason": remote.get("reason"),
+                "batch_id": vector_batch_id,
+                "file_id": remote.get("chunk_files", {}).get(item["record"]["id"]),
+            },
+        }
+        for item in stored
+    ]
+
+    clean_file, clean_upload = clean_future.result()
 
     log_payload = annotate_payload(
         {
@@ -329,30 +370,12 @@ def run_pipeline(
 
     summary_result = None
     summary_long = None
-    if generate_summary and oa_client is not None:
+    if summary_futures is not None:
         try:
-            summary_result = generate_text(
-                [
-                    {"role": "system", "content": "Summarize the following text succinctly in 3-6 sentences."},
-                    {"role": "user", "content": cleaned[:12000]},
-                ],
-                model=DEFAULT_BACKEND_MODEL,
-                max_tokens=500,
-            )
-            _note_openai_run(pipeline_meta)
-            # Longer contextual summary for storage/research
-            summary_long = generate_text(
-                [
-                    {
-                        "role": "system",
-                        "content": "Provide a richer summary (approx 800-1200 words) capturing key themes, entities, timelines, and locations. Keep it culturally respectful.",
-                    },
-                    {"role": "user", "content": cleaned[:20000]},
-                ],
-                model=DEFAULT_BACKEND_MODEL,
-                max_tokens=1800,
-            )
-            _note_openai_run(pipeline_meta)
+            summary_result, run_id = summary_futures[0].result()
+            _note_openai_run(pipeline_meta, run_id)
+            summary_long, run_id = summary_futures[1].result()
+            _note_openai_run(pipeline_meta, run_id)
         except Exception:
             summary_result = None
             summary_long = None
@@ -0,0 +1,264 @@
+"""
+Live pipeline job progress.
+
+Workers call ``publish_progress(job_id, stage, percent, status)``; clients
+follow jobs through ``subscribe`` (used by the SSE endpoints in
+``routes/pipeline``) instead of polling ``pipeline_jobs``. Only status
+transitions are written to the database; stage/percent updates live here.
+
+Two transports share one interface:
+- ``RedisProgressBroker`` (``QUEUE_MODE=rq``): events go out on Redis
+  pub/sub channel ``tepo:progress:<job_id>`` and the latest event per job
+  is kept under ``tepo:progress:last:<job_id>`` (``PROGRESS_TTL`` seconds),
+  so API processes see worker progress and late subscribers get the
+  current state without a DB read.
+- ``InProcessProgressBroker`` (inline mode, or no Redis): the same, within
+  one process; latest events and batches expire after ``PROGRESS_TTL``
+  seconds without updates.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+PROGRESS_TTL = int(os.getenv("PROGRESS_TTL", "86400"))
+PROGRESS_HEARTBEAT = float(os.getenv("PROGRESS_HEARTBEAT", "15"))
+TERMINAL_STATUSES = {"done", "error", "cancelled", "finished", "failed"}
+_PREFIX = "tepo:progress"
+
+
+def make_event(job_id: str, stage: str, percent: int, status: Optional[str] = None, **extra: Any) -> Dict[str, Any]:
+    event = {"job_id": job_id, "stage": stage, "percent": int(percent), "ts": time.time()}
+    if status:
+        event["status"] = status
+    event.update(extra)
+    return event
+
+
+def is_terminal(event: Optional[Dict[str, Any]]) -> bool:
+    return bool(event) and event.get("status") in TERMINAL_STATUSES
+
+
+class InProcessProgressBroker:
+    """Thread-safe fan-out to asyncio subscribers in this process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._batches: Dict[str, List[str]] = {}
+        # key -> monotonic expiry, in last-touched order (dicts keep insertion order)
+        self._expires: Dict[Tuple[str, str], float] = {}
+        self._subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        job_id = event["job_id"]
+        with self._lock:
+            status = event.get("status") or (self._latest.get(job_id) or {}).get("status")
+            if status:
+                event = {**event, "status": status}
+            self._latest[job_id] = event
+            self._touch("job", job_id)
+            subscribers = list(self._subscribers.get(job_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                pass  # subscriber's loop has closed
+
+    def _touch(self, kind: str, key: str) -> None:
+        """Refresh ``key``'s TTL and evict whatever has expired (caller holds the lock)."""
+        now = time.monotonic()
+        self._expires.pop((kind, key), None)
+        self._expires[(kind, key)] = now + PROGRESS_TTL
+        while self._expires:
+            oldest = next(iter(self._expires))
+            if self._expires[oldest] > now:
+                break
+            del self._expires[oldest]
+            (self._latest if oldest[0] == "job" else self._batches).pop(oldest[1], None)
+
+    def latest(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._latest.get(job_id)
+
+    def register_batch(self, batch_id: str, job_ids: Iterable[str]) -> None:
+        ids = list(job_ids)
+        if not ids:
+            return
+        with self._lock:
+            self._batches.setdefault(batch_id, []).extend(ids)
+            self._touch("batch", batch_id)
+
+    def batch_jobs(self, batch_id: str) -> List[str]:
+        with self._lock:
+            return list(self._batches.get(batch_id, []))
+
+    async def _listen(self, job_ids: List[str], queue: asyncio.Queue):
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            for job_id in job_ids:
+                self._subscribers.setdefault(job_id, set()).add(entry)
+        return entry
+
+    def _unlisten(self, job_ids: List[str], entry) -> None:
+        with self._lock:
+            for job_id in job_ids:
+                subs = self._subscribers.get(job_id)
+                if subs is not None:
+                    subs.discard(entry)
+                    if not subs:
+                        del self._subscribers[job_id]
+
+    async def subscribe(self, job_ids: List[str], heartbeat: float = PROGRESS_HEARTBEAT) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield the current state of each job, then live events until every
+        job is terminal. Yields ``None`` as a heartbeat when idle.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        entry = await self._listen(job_ids, queue)
+        try:
+            async for event in _drain(self, job_ids, queue, heartbeat):
+                yield event
+        finally:
+            self._unlisten(job_ids, entry)
+
+
+class RedisProgressBroker:
+    """Redis pub/sub transport (workers and API in different processes)."""
+
+    def __init__(self, redis_conn, url: Optional[str] = None) -> None:
+        self.redis = redis_conn
+        self.url = url
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        job_id = event["job_id"]
+        if not event.get("status"):
+            previous = self.latest(job_id)
+            if previous and previous.get("status"):
+                event = {**event, "status": previous["status"]}
+        payload = json.dumps(event, default=str)
+        try:
+            pipe = self.redis.pipeline()
+            pipe.set(f"{_PREFIX}:last:{job_id}", payload, ex=PROGRESS_TTL)
+            pipe.publish(f"{_PREFIX}:{job_id}", payload)
+            pipe.execute()
+        except Exception:
+            pass  # progress is best-effort; status transitions still reach the DB
+
+    def latest(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = self.redis.get(f"{_PREFIX}:last:{job_id}")
+        except Exception:
+            return None
+        return json.loads(raw) if raw else None
+
+    def register_batch(self, batch_id: str, job_ids: Iterable[str]) -> None:
+        ids = list(job_ids)
+        if not ids:
+            return
+        try:
+            key = f"{_PREFIX}:batch:{batch_id}"
+            pipe = self.redis.pipeline()
+            pipe.rpush(key, *ids)
+            pipe.expire(key, PROGRESS_TTL)
+            pipe.execute()
+        except Exception:
+            pass
+
+    def batch_jobs(self, batch_id: str) -> List[str]:
+        try:
+            return [j.decode() if isinstance(j, bytes) else j for j in self.redis.lrange(f"{_PREFIX}:batch:{batch_id}", 0, -1)]
+        except Exception:
+            return []
+
+    def _async_client(self):
+        from redis import asyncio as aioredis
+
+        if self.url:
+            return aioredis.from_url(self.url)
+        kwargs = self.redis.connection_pool.connection_kwargs
+        return aioredis.Redis(host=kwargs.get("host", "localhost"), port=kwargs.get("port", 6379), db=kwargs.get("db", 0), password=kwargs.get("password"))
+
+    async def subscribe(self, job_ids: List[str], heartbeat: float = PROGRESS_HEARTBEAT) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        client = self._async_client()
+        pubsub = client.pubsub()
+        queue: asyncio.Queue = asyncio.Queue()
+        await pubsub.subscribe(*(f"{_PREFIX}:{job_id}" for job_id in job_ids))
+
+        async def pump() -> None:
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    try:
+                        queue.put_nowait(json.loads(message["data"]))
+                    except ValueError:
+                        continue
+
+        reader = asyncio.create_task(pump())
+        try:
+            async for event in _drain(self, job_ids, queue, heartbeat):
+                yield event
+        finally:
+            reader.cancel()
+            try:
+                await pubsub.unsubscribe()
+                await pubsub.close()
+                await client.close()
+            except Exception:
+                pass
+
+
+async def _drain(broker, job_ids: List[str], queue: asyncio.Queue, heartbeat: float):
+    """Snapshot first (subscription is already live, so nothing is missed), then events."""
+    pending = set(job_ids)
+    for job_id in job_ids:
+        snapshot = broker.latest(job_id)
+        if snapshot:
+            yield snapshot
+            if is_terminal(snapshot):
+                pending.discard(job_id)
+    while pending:
+        try:
+            event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+        except asyncio.TimeoutError:
+            yield None
+            continue
+        yield event
+        if is_terminal(event):
+            pending.discard(event.get("job_id"))
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_progress_broker():
+    """Redis broker in RQ mode when Redis is configured, else the in-process one."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            from te_po.core.env_loader import get_queue_mode
+            from te_po.pipeline.custom_queue import redis_conn
+
+            if get_queue_mode() == "rq" and redis_conn is not None:
+                _broker = RedisProgressBroker(redis_conn, url=os.getenv("REDIS_URL"))
+            else:
+                _broker = InProcessProgressBroker()
+        return _broker
+
+
+def publish_progress(job_id: str, stage: str, percent: int, status: Optional[str] = None, **extra: Any) -> None:
+    get_progress_broker().publish(make_event(job_id, stage, percent, status, **extra))
+
+
+__all__ = [
+    "InProcessProgressBroker",
+    "RedisProgressBroker",
+    "get_progress_broker",
+    "publish_progress",
+    "is_terminal",
+    "TERMINAL_STATUSES",
+]
@@ -4,6 +4,7 @@ from typing import List, Dict
 
 from te_po.pipeline.embedder.embed_engine import embed_text
 from te_po.services.local_storage import list_files, load
+from te_po.services.vector_index import get_index, index_available
 
 
 def _cosine(a: List[float], b: List[float]) -> float:
@@ -15,6 +16,17 @@ def _cosine(a: List[float], b: List[float]) -> float:
 
 def research_query(query: str, limit: int = 10) -> list[Dict]:
     query_embedding = embed_text(query)
+    if index_available():
+        return [
+            {
+                "id": meta.get("id"),
+                "text": meta.get("text"),
+                "metadata": meta.get("metadata", {}),
+                "score": score,
+            }
+            for _, score, meta in get_index("chunks").search(query_embedding, limit)
+        ]
+
     matches: list[Dict] = []
     for filename in list_files("chunks"):
         data_raw = load("chunks", filename)
@@ -0,0 +1,143 @@
+"""
+Staged pipeline engine: bounded queues between thread-pooled stages.
+
+Items flow ``source -> stage[0] -> stage[1] -> ...``. Each stage runs
+``workers`` threads that pull from a bounded input queue, so a slow stage
+(e.g. vector pushes) applies backpressure all the way to the source
+instead of letting work pile up in memory. Results come back in source
+order.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List
+
+logger = logging.getLogger("te_po.pipeline.staged")
+
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "64"))
+PIPELINE_IO_WORKERS = int(os.getenv("PIPELINE_IO_WORKERS", "8"))
+
+_STOP = object()
+
+# Shared pool for one-off background I/O (uploads, summaries) started by run_pipeline.
+io_pool = ThreadPoolExecutor(max_workers=PIPELINE_IO_WORKERS, thread_name_prefix="pipeline-io")
+
+
+@dataclass
+class Stage:
+    """One step of a staged pipeline."""
+
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+    processed: int = 0
+    busy_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, elapsed: float) -> None:
+        with self._lock:
+            self.processed += 1
+            self.busy_seconds += elapsed
+
+
+class StagedPipeline:
+    """Run items through ``stages`` concurrently with bounded hand-off queues."""
+
+    def __init__(self, stages: List[Stage], queue_size: int = PIPELINE_QUEUE_SIZE):
+        if not stages:
+            raise ValueError("StagedPipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+
+    def run(self, source: Iterable[Any]) -> List[Any]:
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results: Dict[int, Any] = {}
+        results_lock = threading.Lock()
+        failed = threading.Event()
+        errors: List[BaseException] = []
+
+        def _put(q: queue.Queue, item: Any) -> bool:
+            # Blocking put that gives up once another stage has failed.
+            while not failed.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _worker(idx: int, stage: Stage) -> None:
+            inbox = queues[idx]
+            outbox = queues[idx + 1] if idx + 1 < len(queues) else None
+            while True:
+                item = inbox.get()
+                if item is _STOP:
+                    return
+                if failed.is_set():
+                    continue  # drain without processing
+                seq, value = item
+                start = time.perf_counter()
+                try:
+                    value = stage.fn(value)
+                except BaseException as exc:  # noqa: BLE001 - re-raised in caller
+                    errors.append(exc)
+                    failed.set()
+                    logger.warning("stage %s failed: %s", stage.name, exc)
+                    continue
+                stage.record(time.perf_counter() - start)
+                if outbox is None:
+                    with results_lock:
+                        results[seq] = value
+                else:
+                    _put(outbox, (seq, value))
+
+        threads: List[List[threading.Thread]] = []
+        for idx, stage in enumerate(self.stages):
+            group = [
+                threading.Thread(
+                    target=_worker,
+                    args=(idx, stage),
+                    name=f"stage-{stage.name}-{n}",
+                    daemon=True,
+                )
+                for n in range(max(1, stage.workers))
+            ]
+            for thread in group:
+                thread.start()
+            threads.append(group)
+
+        count = 0
+        try:
+            for seq, value in enumerate(source):
+                if not _put(queues[0], (seq, value)):
+                    break
+                count = seq + 1
+        except BaseException as exc:  # noqa: BLE001 - source failures surface like stage failures
+            errors.append(exc)
+            failed.set()
+        finally:
+            # Shut stages down in order so every item already queued is handled.
+            for idx, group in enumerate(threads):
+                for _ in group:
+                    queues[idx].put(_STOP)
+                for thread in group:
+                    thread.join()
+
+        if errors:
+            raise errors[0]
+        return [results[seq] for seq in range(count)]
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {"stage": s.name, "workers": s.workers, "processed": s.processed, "busy_seconds": round(s.busy_seconds, 3)}
+            for s in self.stages
+        ]
+
+
+__all__ = ["Stage", "StagedPipeline", "io_pool", "PIPELINE_IO_WORKERS", "PIPELINE_QUEUE_SIZE"]
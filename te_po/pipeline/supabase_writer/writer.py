@@ -2,6 +2,7 @@ import json
 import uuid
 
 from te_po.services.local_storage import save, timestamp
+from te_po.services.vector_index import index_record
 
 
 def save_chunk(chunk: str, embedding: list[float], meta: dict) -> str:
@@ -14,4 +15,14 @@ def save_chunk(chunk: str, embedding: list[float], meta: dict) -> str:
     }
     filename = f"{payload['id']}.json"
     path = save("chunks", filename, json.dumps(payload, indent=2))
+    index_record(
+        "chunks",
+        embedding,
+        {
+            "id": payload["id"],
+            "text": chunk,
+            "metadata": meta,
+            "ts": payload["saved_at"],
+        },
+    )
     return {"id": payload["id"], "path": path}
@@ -95,8 +95,9 @@ class KaitiakiregisterResponse(BaseModel):
 
 
 class VectorEmbedRequest(BaseModel):
-    """Generate embeddings."""
-    text: str
+    """Generate embeddings for one text or a batch of texts."""
+    text: Optional[str] = None
+    texts: Optional[List[str]] = None
     model: Optional[str] = None
 
 
@@ -394,18 +395,29 @@ async def list_kaitiaki():
 async def generate_embeddings(req: VectorEmbedRequest):
     """
     Generate embeddings for text.
-    Uses configured embedding model (OpenAI).
+    Send `texts` to embed a batch in as few OpenAI calls as possible.
     """
+    from fastapi.concurrency import run_in_threadpool
+    from te_po.pipeline.embedder.embed_engine import embed_texts, estimate_tokens
+    from te_po.utils.openai_client import DEFAULT_EMBED_MODEL
+
+    if req.texts is None and req.text is None:
+        raise HTTPException(status_code=400, detail="Provide 'text' or 'texts'.")
+    texts = req.texts if req.texts is not None else [req.text]
     try:
-        # TODO: Call embedding service
-        logger.info(f"Generated embedding for text ({len(req.text)} chars)")
+        vectors = await run_in_threadpool(embed_texts, texts, req.model)
+        logger.info(f"Generated {len(vectors)} embeddings")
 
-        return {
-            "embedding": [0.0] * 1536,  # Placeholder
-            "model": req.model or "text-embedding-3-small",
-            "dimension": 1536,
-            "tokens_used": len(req.text.split())
+        result = {
+            "model": req.model or DEFAULT_EMBED_MODEL,
+            "dimension": len(vectors[0]) if vectors else 0,
+            "tokens_used": sum(estimate_tokens(t) for t in texts),
         }
+        if req.texts is not None:
+            result["embeddings"] = vectors
+        else:
+            result["embedding"] = vectors[0] if vectors else []
+        return result
     except Exception as e:
         logger.error(f"Embedding generation failed: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -274,13 +274,11 @@ async def scan_cards(
     scanner = StealthOCR()
     scanner.cultural_encoding_active = False  # avoid cultural encoding for trading cards
 
-    def run_scan(img_bytes: bytes | None):
-        if not img_bytes:
-            return None
-        return scanner.real_scan(img_bytes)
-
-    front_scan = run_scan(front_bytes)
-    back_scan = run_scan(back_bytes)
+    # Front and back go through the pooled tesseract workers together.
+    images = [img for img in (front_bytes, back_bytes) if img]
+    scans = iter(await asyncio.to_thread(scanner.real_scan_many, images))
+    front_scan = next(scans) if front_bytes else None
+    back_scan = next(scans) if back_bytes else None
     merged_text = " ".join(
         filter(None, [front_scan.get("text_extracted") if front_scan else "", back_scan.get("text_extracted") if back_scan else ""])
     )
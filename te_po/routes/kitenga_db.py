@@ -3,13 +3,15 @@ Kitenga Schema API Routes
 Exposes the kitenga schema database to the API.
 """
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from te_po.database.kitenga_db import (
     # Logs
-    log_event, get_recent_logs,
+    log_event, log_events, get_recent_logs,
     # Memory
-    store_memory, search_memory, log_memory_event,
+    store_memory, search_memory, log_memory_event, next_cursor,
+    MEMORY_EMBED_MODEL, MEMORY_EMBEDDING_DIM,
     # Chat
     save_chat_log, get_chat_history,
     # Taonga
@@ -23,8 +25,9 @@ from te_po.database.kitenga_db import (
     # Whakapapa
     log_whakapapa,
     # Stats
-    get_schema_stats, test_connection
+    get_schema_stats, test_connection, pool_stats
 )
+from te_po.utils import openai_client
 
 router = APIRouter(prefix="/kitenga/db", tags=["Kitenga Schema"])
 
@@ -61,6 +64,8 @@ class TaongaRequest(BaseModel):
 class SearchRequest(BaseModel):
     query: str
     limit: int = 10
+    after: Optional[str] = None  # cursor from the previous page's next_cursor
+    mode: str = "fts"  # "fts" or "hybrid" (memory only: FTS fused with pgvector)
 
 
 class WhakapapaRequest(BaseModel):
@@ -73,6 +78,20 @@ class WhakapapaRequest(BaseModel):
     author: str = "kitenga_whiro"
 
 
+def _memory_embedding(text: str) -> Optional[List[float]]:
+    """
+    Embedding for ``kitenga.context_memory``, or None when OpenAI is not
+    configured, the call fails, or the vector is not the column's width.
+    """
+    if openai_client.client is None:
+        return None  # the offline fallback vector would not fit the column
+    try:
+        vec = list(openai_client.generate_embedding(text, model=MEMORY_EMBED_MODEL))
+    except Exception:
+        return None
+    return vec if len(vec) == MEMORY_EMBEDDING_DIM else None
+
+
 # ==================== ROUTES ====================
 
 @router.get("/status")
@@ -87,6 +106,12 @@ async def kitenga_db_stats():
     return get_schema_stats()
 
 
+@router.get("/pool")
+async def kitenga_db_pool():
+    """Connection pool gauges (size, idle, waiting, usage counters)."""
+    return pool_stats()
+
+
 # --- Logs ---
 
 @router.post("/logs")
@@ -96,6 +121,13 @@ async def create_log(req: LogEventRequest):
     return {"id": log_id, "status": "logged"}
 
 
+@router.post("/logs/bulk")
+async def create_logs_bulk(reqs: List[LogEventRequest]):
+    """Create many kitenga.logs entries with one COPY."""
+    count = log_events(req.model_dump() for req in reqs)
+    return {"count": count, "status": "logged"}
+
+
 @router.get("/logs/recent")
 async def recent_logs(limit: int = 50, source: str = None):
     """Get recent log entries."""
@@ -107,16 +139,29 @@ async def recent_logs(limit: int = 50, source: str = None):
 
 @router.post("/memory")
 async def create_memory(req: MemoryRequest):
-    """Store context memory."""
-    mem_id = store_memory(req.content, req.metadata)
-    return {"id": mem_id, "status": "stored"}
+    """
+    Store context memory with its embedding, so hybrid search can find it.
+    Rows stored while OpenAI is unavailable are picked up by
+    ``scripts/backfill_memory_embeddings.py``.
+    """
+    embedding = await run_in_threadpool(_memory_embedding, req.content)
+    mem_id = store_memory(req.content, req.metadata, embedding=embedding)
+    return {"id": mem_id, "status": "stored", "embedded": embedding is not None}
 
 
 @router.post("/memory/search")
 async def search_memory_route(req: SearchRequest):
-    """Search context memory."""
-    results = search_memory(req.query, req.limit)
-    return {"results": results, "count": len(results)}
+    """Search context memory (ranked, highlighted, keyset-paginated)."""
+    mode, query_embedding = req.mode, None
+    if mode == "hybrid":
+        query_embedding = await run_in_threadpool(_memory_embedding, req.query)
+        if query_embedding is None:
+            mode = "fts"  # offline or wrong width: plain ranked text search
+    try:
+        results = search_memory(req.query, req.limit, after=req.after, mode=mode, query_embedding=query_embedding)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"results": results, "count": len(results), "mode": mode, "next_cursor": next_cursor(results, req.limit)}
 
 
 # --- Chat ---
@@ -158,9 +203,12 @@ async def get_taonga(taonga_id: str):
 
 @router.post("/taonga/search")
 async def search_taonga_route(req: SearchRequest):
-    """Search taonga."""
-    results = search_taonga(req.query, req.limit)
-    return {"results": results, "count": len(results)}
+    """Search taonga (ranked, highlighted, keyset-paginated)."""
+    try:
+        results = search_taonga(req.query, req.limit, after=req.after)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"results": results, "count": len(results), "next_cursor": next_cursor(results, req.limit)}
 
 
 # --- Pipeline ---
@@ -1,9 +1,6 @@
-from pathlib import Path
-from typing import Any
-
 from fastapi import APIRouter, HTTPException, Query
 
-from te_po.services.local_storage import DIRS
+from te_po.services.event_log import get_audit_log
 
 router = APIRouter(prefix="/logs", tags=["Logs"])
 
@@ -12,31 +9,18 @@ router = APIRouter(prefix="/logs", tags=["Logs"])
 async def recent_logs(
     limit: int = Query(50, ge=1, le=500),
     contains: str | None = Query(None, description="Filter by substring in event/detail"),
+    since: str | None = Query(None, description="ISO timestamp (inclusive)"),
+    until: str | None = Query(None, description="ISO timestamp (exclusive)"),
 ):
     """Return the most recent audit events (reverse chronological)."""
-    audit_path = DIRS["logs"] / "project_audit.jsonl"
-    if not audit_path.exists():
-        return {"events": []}
+    log = get_audit_log()
     try:
-        lines = audit_path.read_text(encoding="utf-8").splitlines()
+        if since or until:
+            events = log.between(since, until, limit=limit, newest_first=True, contains=contains)
+        elif contains:
+            events = log.search(contains, limit)
+        else:
+            events = log.tail(limit)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Failed to read logs: {exc}")
-
-    events: list[dict[str, Any]] = []
-    for line in reversed(lines):
-        if not line.strip():
-            continue
-        try:
-            import json
-
-            obj = json.loads(line)
-        except Exception:
-            continue
-        if contains:
-            haystack = f"{obj.get('event','')} {obj.get('detail','')}"
-            if contains.lower() not in haystack.lower():
-                continue
-        events.append(obj)
-        if len(events) >= limit:
-            break
     return {"events": events}
@@ -1,6 +1,8 @@
 import json
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Header, status
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Header, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from te_po.core.auth import require_pipeline_or_service
 from te_po.pipeline.services.api import handle_pipeline_run
 from typing import List
@@ -8,9 +10,10 @@ import uuid
 import shutil
 from pathlib import Path
 
-from te_po.pipeline.custom_queue import redis_conn, urgent_queue, default_queue, slow_queue, dead_queue
+from te_po.pipeline.custom_queue import redis_conn, urgent_queue, default_queue, slow_queue, dead_queue, pipeline_queue
 from te_po.pipeline.jobs import process_document, enqueue_for_pipeline
 from te_po.pipeline.job_tracking import get_job_status, get_recent_jobs
+from te_po.pipeline.progress import get_progress_broker, publish_progress
 from te_po.database import db_execute, db_fetchone
 from te_po.utils.audit import log_event
 from te_po.utils.supabase_client import get_client
@@ -120,11 +123,12 @@ async def enqueue_pipeline(
             }).execute()
         except Exception:
             pass
+    publish_progress(db_job_id, "queued", 0, status="queued")
 
     # Process based on queue mode
     if mode == "inline":
-        # Run immediately in-process
-        result = enqueue_for_pipeline(str(local_path), db_job_id, pages=pages)
+        # Run in-process, off the event loop so progress streams keep flowing
+        result = await run_in_threadpool(enqueue_for_pipeline, str(local_path), db_job_id, pages=pages)
         if result.get("error"):
             # Update DB with error status
             try:
@@ -237,6 +241,7 @@ async def enqueue_batch(files: List[UploadFile] = File(...)):
                 SUPA.table("pipeline_jobs").update({"batch_id": batch_id}).eq("id", res["job_id"]).execute()
             except Exception:
                 pass
+    get_progress_broker().register_batch(batch_id, job_ids)
     return {"batch_id": batch_id, "job_ids": job_ids}
 
 
@@ -259,11 +264,48 @@ async def cancel_job(job_id: str):
         raise HTTPException(status_code=503, detail="Supabase client not configured")
     try:
         SUPA.table("pipeline_jobs").update({"status": "cancelled"}).eq("id", job_id).execute()
+        publish_progress(job_id, "cancelled", 100, status="cancelled")
         return {"ok": True}
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+def _sse(request: Request, job_ids: List[str]) -> StreamingResponse:
+    async def events():
+        async for event in get_progress_broker().subscribe(job_ids):
+            if await request.is_disconnected():
+                break
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: progress\ndata: {json.dumps(event, default=str)}\n\n"
+        yield "event: end\ndata: {}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/progress/{job_id}/stream")
+async def stream_job_progress(job_id: str, request: Request):
+    """
+    Server-sent events for one job: current state first, then each stage /
+    percent update as workers publish it; the stream ends when the job does.
+    """
+    return _sse(request, [job_id])
+
+
+@router.get("/batch/{batch_id}/stream")
+async def stream_batch_progress(batch_id: str, request: Request):
+    """Server-sent progress events for every job in a batch (ends when all finish)."""
+    job_ids = get_progress_broker().batch_jobs(batch_id)
+    if not job_ids:
+        raise HTTPException(status_code=404, detail="Unknown batch")
+    return _sse(request, job_ids)
+
+
 @router.get("/health/queue")
 async def queue_health():
     """
@@ -1,35 +1,23 @@
 import json
 from pathlib import Path
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
 
-from te_po.state.read_state import get_private_state, get_public_state, get_state_version
+from te_po.services.event_log import get_ledger_log
+from te_po.state.read_state import get_state_response
 
 router = APIRouter(prefix="/logs", tags=["Logs"])
 
 
 @router.get("/ledger")
-async def ledger(limit: int = 200):
+async def ledger(limit: int = 200, contains: str | None = None):
     """Return recent carving ledger entries from Mauri state."""
-    ledger_path = Path(__file__).resolve().parents[2] / "mauri" / "state" / "te_po_carving_log.jsonl"
-    if not ledger_path.exists():
-        return {"events": []}
+    log = get_ledger_log()
     try:
-        lines = ledger_path.read_text(encoding="utf-8").splitlines()
+        events = log.search(contains, limit) if contains else log.tail(limit)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Failed to read ledger: {exc}")
-
-    events = []
-    for line in reversed(lines):
-        if not line.strip():
-            continue
-        try:
-            events.append(json.loads(line))
-        except Exception:
-            continue
-        if len(events) >= limit:
-            break
     return {"events": events}
 
 
@@ -45,19 +33,28 @@ async def state():
         raise HTTPException(status_code=500, detail=f"Failed to read state: {exc}")
 
 
+def _cached_state_response(request: Request, view: str) -> Response:
+    body, etag = get_state_response(view)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in {tag.strip() for tag in if_none_match.split(",")} or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/state/public", response_class=JSONResponse)
-async def get_public_state_endpoint():
+async def get_public_state_endpoint(request: Request):
     """Fetch the public project state."""
-    return get_public_state()
+    return _cached_state_response(request, "public")
 
 
 @router.get("/state/private", response_class=JSONResponse)
-async def get_private_state_endpoint():
+async def get_private_state_endpoint(request: Request):
     """Fetch the private project state. Protected by BearerAuthMiddleware."""
-    return get_private_state()
+    return _cached_state_response(request, "private")
 
 
 @router.get("/state/version", response_class=JSONResponse)
-async def get_state_version_endpoint():
+async def get_state_version_endpoint(request: Request):
     """Fetch the current state version."""
-    return get_state_version()
+    return _cached_state_response(request, "version")
@@ -6,6 +6,7 @@ from fastapi import APIRouter
 from te_po.core.config import settings
 from te_po.utils.openai_client import client
 from te_po.utils.supabase_client import get_client
+from te_po.utils.read_cache import get_read_cache
 import socket
 
 router = APIRouter(tags=["Status"])
@@ -22,6 +23,12 @@ async def status():
     }
 
 
+@router.get("/status/read-cache")
+async def status_read_cache():
+    """Hit rate and size of the Supabase read-through cache."""
+    return get_read_cache().stats()
+
+
 @router.get("/status/openai")
 async def status_openai():
     """Check OpenAI readiness (key present, optional vector store reachable)."""
@@ -1,10 +1,10 @@
 from fastapi import APIRouter, Body, HTTPException, Query
 from te_po.core.config import settings
 from te_po.utils.openai_client import client
-from te_po.services.vector_service import embed_text, search_text
+from te_po.services.vector_service import GLYPH, embed_text, search_text
+from te_po.services.vector_log import get_vector_log
+from te_po.utils.embedding_cache import get_embedding_cache
 from te_po.models.vector_models import EmbedRequest, SearchRequest
-from pathlib import Path
-import json
 
 router = APIRouter(prefix="/vector", tags=["Vector"])
 
@@ -16,7 +16,7 @@ async def vector_embed(payload: EmbedRequest = Body(...)):
 
 @router.post("/search")
 async def vector_search(payload: SearchRequest = Body(...)):
-    return search_text(payload.query, payload.top_k or 5)
+    return search_text(payload.query, payload.top_k or 5, mode=payload.mode, nprobe=payload.nprobe)
 
 
 @router.post("/retrieval-test")
@@ -27,27 +27,19 @@ async def vector_retrieval_test(
     return search_text(payload.query, payload.top_k or 3)
 
 
+@router.get("/cache-stats")
+async def vector_cache_stats():
+    """Hit/miss counters and size of the local embedding cache."""
+    return get_embedding_cache().stats()
+
+
 @router.get("/recent")
 async def vector_recent(limit: int = Query(5, ge=1, le=20)):
     """
-    Return recent vector logs saved locally (te_po/storage/openai/<glyph>.json).
+    Return recent vector logs saved locally (te_po/storage/openai/<glyph>_log/<glyph>.*.jsonl).
     Useful for UI 'recent vectors' display.
     """
-    log_dir = Path(__file__).resolve().parents[1] / "storage" / "openai"
-    entries = []
-    if log_dir.exists():
-        for f in sorted(log_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True):
-            try:
-                data = json.loads(f.read_text(encoding="utf-8") or "[]")
-                if isinstance(data, list):
-                    entries.extend(data)
-                elif isinstance(data, dict):
-                    entries.append(data)
-            except Exception:
-                continue
-            if len(entries) >= limit:
-                break
-    return {"entries": entries[:limit]}
+    return {"entries": get_vector_log(GLYPH).tail(limit)}
 
 
 @router.get("/batch-status")
@@ -57,15 +49,26 @@ async def vector_batch_status(
         None, description="Override vector store id; defaults to OPENAI_VECTOR_STORE_ID env"
     ),
 ):
-    """Check the status of a vector store file batch (GA OpenAI API)."""
+    """
+    Check the status of a vector store file batch (GA OpenAI API).
+
+    The locally logged view of the batch (chunks, file ids, status at
+    enqueue time) is returned under ``local``, or on its own when OpenAI
+    is not configured.
+    """
+    local = get_vector_log(GLYPH).batch_summary(batch_id)
     if client is None:
+        if local["chunks"]:
+            return {"id": batch_id, "status": local["status"], "local": local}
         raise HTTPException(status_code=503, detail="OpenAI client not configured.")
-    vs_id = vector_store_id or settings.openai_vector_store_id
+    vs_id = vector_store_id or settings.openai_vector_store_id or local["vector_store_id"]
     if not vs_id:
         raise HTTPException(status_code=400, detail="Vector store id not configured.")
     try:
         resp = client.vector_stores.file_batches.retrieve(batch_id, vector_store_id=vs_id)
         payload = resp.model_dump() if hasattr(resp, "model_dump") else resp
+        if isinstance(payload, dict):
+            payload["local"] = local
         return payload
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Failed to fetch batch: {exc}")
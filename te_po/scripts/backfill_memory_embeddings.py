@@ -0,0 +1,53 @@
+"""
+Embed kitenga.context_memory rows that were stored without an embedding,
+so hybrid memory search (FTS fused with pgvector) can rank them.
+
+Rows written before migration 004, or while OpenAI was unavailable, have
+``embedding IS NULL``; this fills them in batches with
+``KITENGA_MEMORY_EMBED_MODEL`` (1536 dimensions).
+
+Usage:
+    python te_po/scripts/backfill_memory_embeddings.py
+    python te_po/scripts/backfill_memory_embeddings.py --batch 50 --max-rows 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+
+from te_po.database.kitenga_db import (  # noqa: E402
+    MEMORY_EMBED_MODEL,
+    memory_without_embeddings,
+    set_memory_embeddings,
+)
+from te_po.utils import openai_client  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch", type=int, default=100, help="Rows per embedding request")
+    parser.add_argument("--max-rows", type=int, default=None, help="Stop after this many rows")
+    args = parser.parse_args()
+
+    if openai_client.client is None:
+        sys.exit("OpenAI client not configured; nothing embedded.")
+
+    done = 0
+    while args.max_rows is None or done < args.max_rows:
+        size = args.batch if args.max_rows is None else min(args.batch, args.max_rows - done)
+        rows = memory_without_embeddings(size)
+        if not rows:
+            break
+        vectors = openai_client.generate_embeddings([r["content"] or "" for r in rows], model=MEMORY_EMBED_MODEL)
+        done += set_memory_embeddings((str(r["id"]), vec) for r, vec in zip(rows, vectors))
+        print(f"embedded {done} row(s)")
+    print(f"done: {done} context memory row(s) embedded with {MEMORY_EMBED_MODEL}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark the IVF-flat ANN index against exact search (recall@k and latency).
+
+Usage:
+    python te_po/scripts/benchmark_ann.py                        # synthetic 100k x 256
+    python te_po/scripts/benchmark_ann.py --rows 1000000 --dim 128
+    python te_po/scripts/benchmark_ann.py --stage openai         # a local store index
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+
+from te_po.services.ann_index import ArraySource, IVFIndex, _exact_top_k, _normalise, recall_at_k  # noqa: E402
+
+
+def synthetic(rows: int, dim: int, clusters: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=rows)
+    data = centres[labels] + 0.35 * rng.normal(size=(rows, dim)).astype(np.float32)
+    queries = centres[rng.integers(0, clusters, size=100)] + 0.35 * rng.normal(size=(100, dim))
+    return data, queries.astype(np.float32)
+
+
+def _ms_per_query(fn, queries) -> float:
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="*", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--stage", choices=("openai", "chunks"), help="Benchmark a local store index")
+    args = parser.parse_args()
+
+    if args.stage:
+        from te_po.services.vector_index import get_index
+
+        source = get_index(args.stage)
+        mat = np.asarray(source.vectors())
+        if not len(mat):
+            print(f"{args.stage}: index is empty")
+            return
+        rng = np.random.default_rng(0)
+        queries = mat[rng.choice(len(mat), size=min(100, len(mat)), replace=False)]
+        index = IVFIndex(source, min_train_rows=1)
+    else:
+        data, queries = synthetic(args.rows, args.dim, args.clusters)
+        source = ArraySource(data)
+        mat = source.vectors()
+        index = IVFIndex(source, min_train_rows=1)
+
+    start = time.perf_counter()
+    index.sync()
+    print(f"rows={len(mat)} dim={mat.shape[1]} nlist={index.nlist} train={time.perf_counter() - start:.2f}s")
+
+    exact_ms = _ms_per_query(lambda q: _exact_top_k(mat @ _normalise(q)[0], args.k), queries)
+    print(f"exact        {exact_ms:8.3f} ms/query  recall@{args.k}=1.000")
+    for nprobe in args.nprobe:
+        ann_ms = _ms_per_query(lambda q: index.search(q, args.k, nprobe=nprobe), queries)
+        recall = recall_at_k(source, index, queries, k=args.k, nprobe=nprobe)
+        print(f"nprobe={nprobe:<5} {ann_ms:8.3f} ms/query  recall@{args.k}={recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
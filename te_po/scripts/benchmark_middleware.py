@@ -0,0 +1,148 @@
+"""
+Benchmark per-request overhead of the auth + Unicode middlewares.
+
+Compares the previous ``BaseHTTPMiddleware`` implementations (copied here
+for reference) with the pure-ASGI ones, driving the ASGI app in-process so
+no network or server time is included.
+
+Usage:
+    python te_po/scripts/benchmark_middleware.py
+    python te_po/scripts/benchmark_middleware.py --requests 20000 --body-kb 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+
+from starlette.applications import Starlette  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+from starlette.responses import Response  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+from te_po.core.auth import classify_identity, load_tokens, require_token  # noqa: E402
+from te_po.stealth_ocr import pipeline_token_hash  # noqa: E402
+from te_po.utils.middleware.auth_middleware import BearerAuthMiddleware, reload_auth  # noqa: E402
+from te_po.utils.middleware.utf8_enforcer import (  # noqa: E402
+    UnicodeEnforcerMiddleware,
+    _composes_with_previous,
+    _ensure_locale,
+)
+
+
+class LegacyBearerAuth(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        auth_header = request.headers.get("authorization")
+        tokens = load_tokens()
+        pipeline_token_hash()
+        if not tokens.any_active:
+            return await call_next(request)
+        require_token(auth_header, tokens.human or tokens.pipeline or tokens.service, token_label="global access")
+        role, token_used = classify_identity(tokens, auth_header)
+        request.state.identity_role = role
+        request.state.token_used = token_used
+        request.state.human_identity = os.getenv("HUMAN_IDENTITY")
+        request.state.trace_id = os.getenv("TRACE_ID")
+        return await call_next(request)
+
+
+class LegacyUnicodeEnforcer(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        content_type = request.headers.get("content-type", "")
+        if content_type.startswith("text/") or "application/json" in content_type:
+            body = await request.body()
+            request._body = unicodedata.normalize("NFC", body.decode("utf-8")).encode("utf-8")
+        _ensure_locale()
+        response = await call_next(request)
+        response.headers.setdefault("Content-Language", "mi_NZ.UTF-8")
+        return response
+
+
+async def endpoint(request: Request) -> Response:
+    await request.body()
+    return Response(b"ok", media_type="text/plain")
+
+
+def build(auth_cls=None, unicode_cls=None) -> Starlette:
+    app = Starlette(routes=[Route("/bench", endpoint, methods=["POST"])])
+    if auth_cls:
+        app.add_middleware(auth_cls)
+    if unicode_cls:
+        app.add_middleware(unicode_cls)
+    return app
+
+
+async def drive(app, requests: int, body: bytes, chunk: int) -> float:
+    headers = [(b"content-type", b"application/json"), (b"authorization", b"Bearer bench")]
+    chunks = [body[i:i + chunk] for i in range(0, len(body), chunk)] or [b""]
+
+    async def one() -> None:
+        pending = list(chunks)
+
+        async def receive():
+            if pending:
+                part = pending.pop(0)
+                return {"type": "http.request", "body": part, "more_body": bool(pending)}
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            return None
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/bench",
+            "raw_path": b"/bench",
+            "query_string": b"",
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 1234),
+            "server": ("127.0.0.1", 80),
+        }
+        await app(scope, receive, send)
+
+    for _ in range(min(200, requests)):
+        await one()
+    start = time.perf_counter()
+    for _ in range(requests):
+        await one()
+    return (time.perf_counter() - start) * 1e6 / requests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--body-kb", type=int, default=4, help="Request body size (KiB)")
+    parser.add_argument("--chunk-kb", type=int, default=64, help="ASGI receive chunk size (KiB)")
+    args = parser.parse_args()
+
+    os.environ["HUMAN_BEARER_KEY"] = "bench"
+    reload_auth()
+    _composes_with_previous()
+    unit = '{"text": "kia ora Māori whanau"}'
+    body = (unit * (args.body_kb * 1024 // len(unit) + 1)).encode("utf-8")[: args.body_kb * 1024]
+    chunk = args.chunk_kb * 1024
+
+    baseline = asyncio.run(drive(build(), args.requests, body, chunk))
+    legacy = asyncio.run(drive(build(LegacyBearerAuth, LegacyUnicodeEnforcer), args.requests, body, chunk))
+    current = asyncio.run(drive(build(BearerAuthMiddleware, UnicodeEnforcerMiddleware), args.requests, body, chunk))
+    print(f"requests={args.requests} body={len(body)}B chunk={chunk}B")
+    print(f"no middleware        {baseline:9.1f} us/request")
+    print(f"BaseHTTPMiddleware   {legacy:9.1f} us/request  (+{legacy - baseline:.1f})")
+    print(f"pure ASGI            {current:9.1f} us/request  (+{current - baseline:.1f})")
+
+
+if __name__ == "__main__":
+    main()
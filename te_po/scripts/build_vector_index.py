@@ -0,0 +1,48 @@
+"""
+Build the local mmap vector indexes from the legacy JSON records.
+
+Usage:
+    python te_po/scripts/build_vector_index.py                # migrate missing indexes
+    python te_po/scripts/build_vector_index.py --rebuild      # drop and rebuild all
+    python te_po/scripts/build_vector_index.py --stage chunks # one stage only
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+
+from te_po.services.vector_index import VectorIndex, migrate_json_records  # noqa: E402
+
+STAGES = ("openai", "chunks")
+
+
+def build(stage: str, rebuild: bool = False) -> None:
+    index = VectorIndex(stage)
+    if index.exists():
+        if not rebuild:
+            print(f"{stage}: index exists ({len(index)} rows); use --rebuild to recreate")
+            return
+        shutil.rmtree(index.path)
+        index = VectorIndex(stage)
+    written = migrate_json_records(index, stage)
+    print(f"{stage}: indexed {written} record(s) -> {index.path}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stage", choices=STAGES, help="Only build this stage")
+    parser.add_argument("--rebuild", action="store_true", help="Drop existing index first")
+    args = parser.parse_args()
+
+    for stage in [args.stage] if args.stage else STAGES:
+        build(stage, rebuild=args.rebuild)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Migrate legacy ``<glyph>.json`` vector logs to the append-only JSONL log
+and compact existing log segments.
+
+Usage:
+    python te_po/scripts/compact_vector_log.py                  # migrate + compact the configured glyph
+    python te_po/scripts/compact_vector_log.py --dedupe         # keep only the newest record per chunk
+    python te_po/scripts/compact_vector_log.py --glyph other    # a different glyph's log
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT))
+
+from te_po.services.local_storage import DIRS  # noqa: E402
+from te_po.services.vector_log import VectorLog, migrate_array_log, migrate_flat_segments  # noqa: E402
+from te_po.services.vector_service import GLYPH  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--glyph", default=GLYPH, help="Log name (defaults to the mauri glyph)")
+    parser.add_argument("--dedupe", action="store_true", help="Keep only the newest record per chunk/entry id")
+    parser.add_argument("--migrate-only", action="store_true", help="Skip compaction")
+    args = parser.parse_args()
+
+    log = VectorLog(args.glyph)
+    moved = migrate_flat_segments(log, DIRS["openai"])
+    if moved:
+        print(f"{args.glyph}: moved {moved} segment(s) into {log.root.name}/")
+    legacy = DIRS["openai"] / f"{args.glyph}.json"
+    if legacy.exists():
+        moved = migrate_array_log(log, legacy)
+        print(f"{args.glyph}: migrated {moved} record(s) from {legacy.name}")
+    if args.migrate_only:
+        return
+    result = log.compact(dedupe=args.dedupe)
+    print(
+        f"{args.glyph}: {result['records']} record(s), "
+        f"{result['segments_before']} -> {result['segments_after']} segment(s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+IVF-flat approximate nearest-neighbour index for the local vector stores.
+
+The index partitions rows of an append-only source matrix (see
+``vector_index.VectorIndex``) into ``nlist`` clusters with spherical
+k-means. A query scores the centroids, scans only the ``nprobe`` closest
+clusters exactly, and returns the best ``k``. ``nprobe`` is the
+recall/latency knob: ``nprobe == nlist`` is an exact search.
+
+Persistence (when ``path`` is given):
+
+    ivf.json       {"nlist": 256, "trained_rows": 65536}
+    centroids.npy  float32 (nlist, dim)
+    assign.i32     append-only cluster id per source row
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Protocol, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+logger = logging.getLogger("te_po.ann_index")
+
+ANN_MIN_TRAIN_ROWS = int(os.getenv("ANN_MIN_TRAIN_ROWS", "4096"))
+ANN_DEFAULT_NPROBE = int(os.getenv("ANN_NPROBE", "8"))
+# Retrain once the source has grown this many times past the training set.
+ANN_RETRAIN_FACTOR = float(os.getenv("ANN_RETRAIN_FACTOR", "4"))
+_ASSIGN_BLOCK = 65536
+
+
+class MatrixSource(Protocol):
+    def vectors(self) -> Any:  # (n, dim) float32, L2-normalised, append-only
+        ...
+
+
+def _exact_top_k(scores, k: int) -> List[Tuple[int, float]]:
+    if not len(scores) or k <= 0:
+        return []
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return [(int(row), float(scores[row])) for row in top]
+
+
+def _normalise(mat):
+    mat = np.asarray(mat, dtype=np.float32)
+    if mat.ndim == 1:
+        mat = mat.reshape(1, -1)
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+def _assign(mat, centroids):
+    """Nearest centroid (max dot product) for each row, in bounded blocks."""
+    out = np.empty(len(mat), dtype=np.int32)
+    for start in range(0, len(mat), _ASSIGN_BLOCK):
+        block = np.asarray(mat[start:start + _ASSIGN_BLOCK], dtype=np.float32)
+        out[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+def train_centroids(mat, nlist: int, iterations: int = 15, sample: int | None = None, seed: int = 0):
+    """Spherical k-means on (a sample of) ``mat``; returns (nlist, dim) unit centroids."""
+    rng = np.random.default_rng(seed)
+    n = len(mat)
+    nlist = max(1, min(nlist, n))
+    sample = min(n, sample or nlist * 64)
+    rows = np.sort(rng.choice(n, size=sample, replace=False)) if sample < n else np.arange(n)
+    data = np.asarray(mat[rows], dtype=np.float32)
+    centroids = data[rng.choice(len(data), size=nlist, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _assign(data, centroids)
+        order = np.argsort(labels, kind="stable")
+        counts = np.bincount(labels, minlength=nlist)
+        present = counts > 0
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        sums = np.zeros_like(centroids)
+        sums[present] = np.add.reduceat(data[order], starts[present], axis=0)
+        empty = ~present
+        if empty.any():
+            # Re-seed empty clusters with random points.
+            sums[empty] = data[rng.choice(len(data), size=int(empty.sum()))]
+        centroids = _normalise(sums)
+    return centroids
+
+
+class IVFIndex:
+    """Inverted-file index over an append-only, normalised source matrix."""
+
+    def __init__(
+        self,
+        source: MatrixSource,
+        path: str | Path | None = None,
+        nlist: int | None = None,
+        nprobe: int = ANN_DEFAULT_NPROBE,
+        min_train_rows: int = ANN_MIN_TRAIN_ROWS,
+    ):
+        if np is None:
+            raise RuntimeError("numpy is required for the ANN index.")
+        self.source = source
+        self.path = Path(path) if path else None
+        self._requested_nlist = nlist
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train_rows = min_train_rows
+        self._lock = threading.RLock()
+        self._centroids = None
+        self._trained_rows = 0
+        self._assigned = 0
+        self._lists: List[List[Any]] = []
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        if not self.path or not (self.path / "ivf.json").exists():
+            return
+        try:
+            info = json.loads((self.path / "ivf.json").read_text(encoding="utf-8"))
+            centroids = np.load(self.path / "centroids.npy")
+            assign = np.fromfile(self.path / "assign.i32", dtype=np.int32)
+        except (OSError, ValueError) as exc:
+            logger.warning("ANN index at %s unreadable, will retrain: %s", self.path, exc)
+            return
+        self.nlist = int(info.get("nlist") or len(centroids))
+        self._centroids = centroids.astype(np.float32)
+        self._trained_rows = int(info.get("trained_rows") or 0)
+        self._rebuild_lists(assign)
+
+    def _save_model(self, assign) -> None:
+        if not self.path:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        np.save(self.path / "centroids.npy", self._centroids)
+        assign.astype(np.int32).tofile(self.path / "assign.i32")
+        (self.path / "ivf.json").write_text(
+            json.dumps({"nlist": self.nlist, "trained_rows": self._trained_rows}),
+            encoding="utf-8",
+        )
+
+    def _append_assignments(self, assign) -> None:
+        if self.path:
+            with open(self.path / "assign.i32", "ab") as fh:
+                fh.write(assign.astype(np.int32).tobytes())
+
+    # ------------------------------------------------------------------
+    # Build / incremental insert
+    # ------------------------------------------------------------------
+
+    def _rebuild_lists(self, assign) -> None:
+        order = np.argsort(assign, kind="stable").astype(np.int64)
+        bounds = np.searchsorted(assign[order], np.arange(self.nlist + 1))
+        self._lists = [[order[bounds[i]:bounds[i + 1]]] for i in range(self.nlist)]
+        self._assigned = len(assign)
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    def train(self) -> None:
+        """(Re)train centroids over the whole source and reassign every row."""
+        with self._lock:
+            mat = self.source.vectors()
+            n = len(mat)
+            if not n:
+                return
+            nlist = self._requested_nlist or max(1, int(np.sqrt(n)))
+            self._centroids = train_centroids(mat, nlist)
+            self.nlist = len(self._centroids)
+            self._trained_rows = n
+            assign = _assign(mat, self._centroids)
+            self._rebuild_lists(assign)
+            self._save_model(assign)
+            logger.info("ANN index trained: %d rows, %d lists", n, self.nlist)
+
+    def sync(self) -> int:
+        """
+        Bring the index up to date with the source: train once enough rows
+        exist, retrain after large growth, otherwise assign only new rows.
+        Returns the number of indexed rows.
+        """
+        with self._lock:
+            mat = self.source.vectors()
+            n = len(mat)
+            if n < self._assigned:
+                # Source shrank (e.g. pruned); assignments no longer line up.
+                self.reset()
+            if not self.trained:
+                if n >= self.min_train_rows:
+                    self.train()
+                return self._assigned
+            if self._trained_rows and n >= self._trained_rows * ANN_RETRAIN_FACTOR:
+                self.train()
+                return self._assigned
+            if n > self._assigned:
+                new = _assign(mat[self._assigned:n], self._centroids)
+                rows = np.arange(self._assigned, n, dtype=np.int64)
+                for lid in np.unique(new):
+                    self._lists[lid].append(rows[new == lid])
+                self._append_assignments(new)
+                self._assigned = n
+            return self._assigned
+
+    def reset(self) -> None:
+        with self._lock:
+            self._centroids = None
+            self._trained_rows = 0
+            self._assigned = 0
+            self._lists = []
+            if self.path:
+                for name in ("ivf.json", "centroids.npy", "assign.i32"):
+                    (self.path / name).unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _candidates(self, lids) -> Any:
+        parts = []
+        for lid in lids:
+            pieces = self._lists[lid]
+            if len(pieces) > 8:
+                # Compact posting lists that have accumulated many small appends.
+                pieces[:] = [np.concatenate(pieces)]
+            parts.extend(pieces)
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int = 5,
+        nprobe: int | None = None,
+    ) -> List[Tuple[int, float]]:
+        """Approximate top-k ``(row, score)``; exact while the index is untrained."""
+        with self._lock:
+            self.sync()
+            mat = self.source.vectors()
+            if not len(mat) or len(query) != mat.shape[1]:
+                return []
+            q = _normalise(query)[0]
+            if not self.trained:
+                return _exact_top_k(mat @ q, k)
+            probe = max(1, min(nprobe or self.nprobe, self.nlist))
+            centroid_scores = self._centroids @ q
+            lids = np.argpartition(-centroid_scores, probe - 1)[:probe]
+            rows = self._candidates(lids)
+            rows = rows[rows < len(mat)]
+            if not len(rows):
+                return []
+            rows.sort()  # sequential reads from the memory map
+            scores = np.asarray(mat[rows], dtype=np.float32) @ q
+            return [(int(rows[i]), score) for i, score in _exact_top_k(scores, k)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sizes = [sum(len(p) for p in pieces) for pieces in self._lists]
+            return {
+                "trained": self.trained,
+                "nlist": self.nlist,
+                "nprobe": self.nprobe,
+                "indexed_rows": self._assigned,
+                "trained_rows": self._trained_rows,
+                "largest_list": max(sizes) if sizes else 0,
+            }
+
+
+def recall_at_k(
+    source: MatrixSource,
+    index: IVFIndex,
+    queries,
+    k: int = 10,
+    nprobe: int | None = None,
+) -> float:
+    """Fraction of exact top-k rows that the ANN search also returns."""
+    mat = source.vectors()
+    found = 0
+    for q in queries:
+        exact = {row for row, _ in _exact_top_k(mat @ _normalise(q)[0], k)}
+        approx = {row for row, _ in index.search(q, k, nprobe=nprobe)}
+        found += len(exact & approx)
+    return found / (k * len(queries)) if len(queries) else 1.0
+
+
+class ArraySource:
+    """In-memory ``MatrixSource`` over a fixed matrix (benchmarks, offline tables)."""
+
+    def __init__(self, matrix):
+        self._matrix = _normalise(matrix) if len(matrix) else np.zeros((0, 0), dtype=np.float32)
+
+    def vectors(self):
+        return self._matrix
+
+
+__all__ = [
+    "ArraySource",
+    "IVFIndex",
+    "MatrixSource",
+    "recall_at_k",
+    "train_centroids",
+]
@@ -64,10 +64,10 @@ def retrieve_context(query: str, session_id: str, top_k: int = 5) -> List[Dict[s
     """
     Retrieve top-K chat turns for this session_id using local embeddings (cosine similarity).
     """
-    from te_po.utils.openai_client import client as oa_client
+    from te_po.utils.openai_client import client as oa_client, generate_embedding
 
     try:
-        q_embed = oa_client.embeddings.create(model="text-embedding-3-small", input=query).data[0].embedding if oa_client else None
+        q_embed = generate_embedding(query, model="text-embedding-3-small") if oa_client else None
     except Exception:
         q_embed = None
 
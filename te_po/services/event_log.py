@@ -0,0 +1,506 @@
+"""
+Size-rotated JSONL event logs (project audit log, Mauri carving ledger).
+
+The active file keeps its historical name (``project_audit.jsonl``); once
+it passes ``EVENT_LOG_MAX_BYTES`` it is renamed to
+``project_audit.00001.jsonl`` (then ``00002`` …) and a fresh active file
+starts. Only ``EVENT_LOG_MAX_SEGMENTS`` rotated files are kept.
+
+Readers never load a whole file:
+- ``tail(limit)`` reads backwards from EOF in blocks and parses only the
+  lines it returns;
+- ``between(since, until)`` bisects a sparse ``(ts, offset)`` index kept in
+  a ``<file>.idx`` sidecar, then reads forward from that offset (or, with
+  ``newest_first``, walks the indexed chunks backwards up to ``limit``);
+- ``search(text)`` narrows candidates with an in-memory trigram index over
+  the ``event``/``detail`` fields and checks only those lines.
+
+Files are identified by inode plus a hash of their first line, so
+indexes survive rotation renames but not inode reuse after a segment is
+pruned. All indexes extend incrementally from the byte they last
+reached; entries for files that are gone are dropped on refresh.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import zlib
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from te_po.services.local_storage import DIRS
+
+EVENT_LOG_MAX_BYTES = int(os.getenv("EVENT_LOG_MAX_BYTES", str(32 * 1024 * 1024)))
+EVENT_LOG_MAX_SEGMENTS = int(os.getenv("EVENT_LOG_MAX_SEGMENTS", "20"))
+EVENT_LOG_INDEX_STRIDE = int(os.getenv("EVENT_LOG_INDEX_STRIDE", "256"))
+_BLOCK = 64 * 1024
+
+MAURI_LEDGER = Path(__file__).resolve().parents[2] / "mauri" / "state" / "te_po_carving_log.jsonl"
+
+
+def _normalise_ts(value: Any) -> str:
+    """ISO-8601 UTC string so timestamps compare lexicographically."""
+    if not value:
+        return ""
+    text = str(value)
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return text
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _haystack(record: Dict[str, Any]) -> str:
+    return f"{record.get('event', '')} {record.get('detail', '')}".lower()
+
+
+class EventLog:
+    """Append, rotate and read one JSONL event log."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = EVENT_LOG_MAX_BYTES,
+        max_segments: int = EVENT_LOG_MAX_SEGMENTS,
+        stride: int = EVENT_LOG_INDEX_STRIDE,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_segments = max(1, max_segments)
+        self.stride = max(1, stride)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self._pattern = re.compile(rf"^{re.escape(self.path.stem)}\.(\d+){re.escape(self.path.suffix)}$")
+        self._lock = threading.RLock()
+        # sparse time index: file key -> {"indexed": bytes, "marks": [[ts, offset], ...]}
+        self._marks: Optional[Dict[str, Dict[str, Any]]] = None
+        # trigram index: line id -> (file number, offset); trigram -> line ids
+        self._line_file = array("Q")
+        self._line_off = array("Q")
+        self._postings: Dict[str, array] = {}
+        self._text_files: Dict[str, int] = {}  # file key -> file number
+        self._text_indexed: Dict[str, int] = {}  # file key -> bytes indexed
+        self._next_file = 0
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    def _rotated_path(self, number: int) -> Path:
+        return self.path.with_name(f"{self.path.stem}.{number:05d}{self.path.suffix}")
+
+    def _rotated_numbers(self) -> List[int]:
+        if not self.path.parent.exists():
+            return []
+        return sorted(
+            int(m.group(1)) for m in (self._pattern.match(p.name) for p in self.path.parent.iterdir()) if m
+        )
+
+    @staticmethod
+    def _file_key(path: Path) -> Optional[str]:
+        """
+        ``"<inode>:<crc32 of first line>"``: stable across renames, and
+        different when a pruned segment's inode is reused by a new file.
+        None until the file has a complete first line.
+        """
+        with open(path, "rb") as fh:
+            ino = os.fstat(fh.fileno()).st_ino
+            first = fh.readline()
+        if not first.endswith(b"\n"):
+            return None
+        return f"{ino}:{zlib.crc32(first):08x}"
+
+    def files(self) -> List[Tuple[Optional[str], Path]]:
+        """``(key, path)`` for every file, oldest first (active file last)."""
+        out = []
+        for path in [self._rotated_path(n) for n in self._rotated_numbers()] + [self.path]:
+            try:
+                out.append((self._file_key(path), path))
+            except FileNotFoundError:
+                continue
+        return out
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, records: Iterable[Dict[str, Any]], fsync: bool = True) -> None:
+        """Append records as JSON lines in one ``O_APPEND`` write (rotating first if full)."""
+        payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8")
+        if not payload:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            try:
+                if self.path.stat().st_size >= self.max_bytes:
+                    self.rotate()
+            except FileNotFoundError:
+                pass
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, payload)
+                if fsync:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def rotate(self) -> Optional[Path]:
+        """Move the active file to the next numbered segment and prune old segments."""
+        with self._lock:
+            if not self.path.exists():
+                return None
+            numbers = self._rotated_numbers()
+            target = self._rotated_path((numbers[-1] if numbers else 0) + 1)
+            os.replace(self.path, target)
+            numbers = self._rotated_numbers()
+            for number in numbers[: max(0, len(numbers) - self.max_segments)]:
+                self._rotated_path(number).unlink(missing_ok=True)
+            return target
+
+    # ------------------------------------------------------------------
+    # Tail
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _reverse_lines(path: Path) -> Iterator[bytes]:
+        """Complete lines of ``path`` from last to first, reading blocks from EOF."""
+        with open(path, "rb") as fh:
+            fh.seek(0, os.SEEK_END)
+            pos = fh.tell()
+            remainder = b""
+            while pos > 0:
+                step = min(_BLOCK, pos)
+                pos -= step
+                fh.seek(pos)
+                lines = (fh.read(step) + remainder).split(b"\n")
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    if line.strip():
+                        yield line
+            if remainder.strip():
+                yield remainder
+
+    def tail(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Newest ``limit`` events, newest first."""
+        out: List[Dict[str, Any]] = []
+        for _, path in reversed(self.files()):
+            try:
+                for line in self._reverse_lines(path):
+                    try:
+                        out.append(json.loads(line))
+                    except ValueError:
+                        continue  # partial line from an in-flight append
+                    if len(out) >= limit:
+                        return out
+            except FileNotFoundError:
+                continue  # rotated away while reading
+        return out
+
+    # ------------------------------------------------------------------
+    # Incremental scanning
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _scan(path: Path, start: int) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """``(offset, end, record)`` for complete lines from ``start``; stops before a partial tail."""
+        with open(path, "rb") as fh:
+            fh.seek(start)
+            offset = start
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    return
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                end = offset + len(line)
+                yield offset, end, record if isinstance(record, dict) else {}
+                offset = end
+
+    def _read_at(self, path: Path, offset: int) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "rb") as fh:
+                fh.seek(offset)
+                return json.loads(fh.readline())
+        except (OSError, ValueError):
+            return None
+
+    # ------------------------------------------------------------------
+    # Time-range index (sidecar)
+    # ------------------------------------------------------------------
+
+    def _load_marks(self) -> Dict[str, Dict[str, Any]]:
+        if self._marks is None:
+            try:
+                raw = json.loads(self.index_path.read_text(encoding="utf-8"))
+                self._marks = dict(raw.get("files", {}))
+            except (OSError, ValueError, AttributeError):
+                self._marks = {}
+        return self._marks
+
+    def _refresh_marks(self, files: List[Tuple[Optional[str], Path]]) -> Dict[str, Dict[str, Any]]:
+        marks = self._load_marks()
+        live = {key for key, _ in files if key}
+        changed = False
+        for stale in set(marks) - live:
+            del marks[stale]
+            changed = True
+        for key, path in files:
+            if not key:
+                continue
+            entry = marks.setdefault(key, {"indexed": 0, "lines": 0, "marks": []})
+            try:
+                size = path.stat().st_size
+            except FileNotFoundError:
+                continue
+            if size < entry["indexed"]:  # truncated/replaced under the same inode
+                entry.update(indexed=0, lines=0, marks=[])
+            if size == entry["indexed"]:
+                continue
+            for offset, end, record in self._scan(path, entry["indexed"]):
+                if entry["lines"] % self.stride == 0:
+                    entry["marks"].append([_normalise_ts(record.get("ts")), offset])
+                entry["lines"] += 1
+                entry["indexed"] = end
+                changed = True
+        if changed:
+            self._save_marks(marks)
+        return marks
+
+    def _save_marks(self, marks: Dict[str, Dict[str, Any]]) -> None:
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps({"files": marks}), encoding="utf-8")
+            os.replace(tmp, self.index_path)
+        except OSError:
+            pass
+
+    def between(
+        self,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False,
+        contains: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Events with ``since <= ts < until``, assuming ``ts`` grows within a file.
+
+        Oldest first by default; with ``newest_first`` the files and their
+        index chunks are walked backwards, so ``limit`` bounds the reading.
+        ``contains`` filters on event/detail before the limit applies.
+        """
+        lo, hi = _normalise_ts(since), _normalise_ts(until)
+        needle = contains.lower() if contains else None
+        with self._lock:
+            files = self.files()
+            marks = self._refresh_marks(files)
+        if newest_first:
+            return self._between_newest(files, marks, lo, hi, limit, needle)
+        out: List[Dict[str, Any]] = []
+        for key, path in files:
+            entry = marks.get(key) if key else None
+            if not entry or not entry["marks"]:
+                continue
+            stamps = [m[0] for m in entry["marks"]]
+            if hi and stamps[0] and stamps[0] >= hi:
+                break
+            start = 0
+            if lo:
+                pos = bisect_left(stamps, lo)
+                start = entry["marks"][max(0, pos - 1)][1]
+            try:
+                for offset, _, record in self._scan(path, start):
+                    if offset >= entry["indexed"]:
+                        break
+                    ts = _normalise_ts(record.get("ts"))
+                    if lo and ts < lo:
+                        continue
+                    if hi and ts >= hi:
+                        break
+                    if needle and needle not in _haystack(record):
+                        continue
+                    out.append(record)
+                    if limit is not None and len(out) >= limit:
+                        return out
+            except FileNotFoundError:
+                continue
+        return out
+
+    def _between_newest(
+        self, files, marks, lo: str, hi: str, limit: Optional[int], needle: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for key, path in reversed(files):
+            entry = marks.get(key) if key else None
+            if not entry or not entry["marks"]:
+                continue
+            stamps = [m[0] for m in entry["marks"]]
+            # last chunk that can hold ts < hi
+            last = len(stamps) - 1
+            if hi:
+                last = bisect_left(stamps, hi) - 1
+                if last < 0:
+                    continue
+            for chunk in range(last, -1, -1):
+                start = entry["marks"][chunk][1]
+                end = entry["marks"][chunk + 1][1] if chunk + 1 < len(stamps) else entry["indexed"]
+                found = []
+                try:
+                    for offset, _, record in self._scan(path, start):
+                        if offset >= end:
+                            break
+                        ts = _normalise_ts(record.get("ts"))
+                        if (not lo or ts >= lo) and (not hi or ts < hi) and (not needle or needle in _haystack(record)):
+                            found.append(record)
+                except FileNotFoundError:
+                    break
+                for record in reversed(found):
+                    out.append(record)
+                    if limit is not None and len(out) >= limit:
+                        return out
+                if lo and stamps[chunk] and stamps[chunk] < lo:
+                    return out  # everything older is before ``since``
+        return out
+
+    # ------------------------------------------------------------------
+    # Substring search (trigram index, in memory)
+    # ------------------------------------------------------------------
+
+    def _prune_text_index(self, dead: set) -> None:
+        """Drop lines of files that are gone and renumber the rest."""
+        keep = array("q", [-1]) * len(self._line_off)
+        line_file, line_off = array("Q"), array("Q")
+        for line_id in range(len(self._line_off)):
+            if self._line_file[line_id] not in dead:
+                keep[line_id] = len(line_off)
+                line_file.append(self._line_file[line_id])
+                line_off.append(self._line_off[line_id])
+        for gram, postings in list(self._postings.items()):
+            remapped = array("Q", (keep[i] for i in postings if keep[i] >= 0))
+            if remapped:
+                self._postings[gram] = remapped
+            else:
+                del self._postings[gram]
+        self._line_file, self._line_off = line_file, line_off
+
+    def _refresh_text_index(self, files: List[Tuple[Optional[str], Path]]) -> None:
+        sizes = {}
+        for key, path in files:
+            if not key:
+                continue
+            try:
+                sizes[key] = path.stat().st_size
+            except FileNotFoundError:
+                continue
+        stale = [k for k in self._text_files if k not in sizes or sizes[k] < self._text_indexed.get(k, 0)]
+        if stale:
+            self._prune_text_index({self._text_files.pop(k) for k in stale})
+            for k in stale:
+                self._text_indexed.pop(k, None)
+        for key, path in files:
+            start = self._text_indexed.get(key, 0)
+            if key not in sizes or sizes[key] <= start:
+                continue
+            number = self._text_files.get(key)
+            if number is None:
+                number = self._text_files[key] = self._next_file
+                self._next_file += 1
+            for offset, end, record in self._scan(path, start):
+                line_id = len(self._line_off)
+                self._line_file.append(number)
+                self._line_off.append(offset)
+                for gram in _trigrams(_haystack(record)):
+                    postings = self._postings.get(gram)
+                    if postings is None:
+                        postings = self._postings[gram] = array("Q")
+                    postings.append(line_id)
+                self._text_indexed[key] = end
+
+    def search(self, text: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Newest ``limit`` events whose event/detail contain ``text`` (case-insensitive)."""
+        needle = text.lower()
+        if len(needle) < 3:
+            return self._scan_search(needle, limit)
+        with self._lock:
+            files = self.files()
+            self._refresh_text_index(files)
+            postings = [self._postings.get(g) for g in _trigrams(needle)]
+            if any(p is None for p in postings):
+                return []
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for other in postings[1:]:
+                candidates.intersection_update(other)
+            paths = {self._text_files[key]: path for key, path in files if key in self._text_files}
+            ordered = [(self._line_file[i], self._line_off[i]) for i in sorted(candidates, reverse=True)]
+        out: List[Dict[str, Any]] = []
+        for number, offset in ordered:
+            path = paths.get(number)
+            if path is None:
+                continue  # segment pruned
+            record = self._read_at(path, offset)
+            if record and needle in _haystack(record):
+                out.append(record)
+                if len(out) >= limit:
+                    break
+        return out
+
+    def _scan_search(self, needle: str, limit: int) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for _, path in reversed(self.files()):
+            try:
+                for line in self._reverse_lines(path):
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if needle in _haystack(record):
+                        out.append(record)
+                        if len(out) >= limit:
+                            return out
+            except FileNotFoundError:
+                continue
+        return out
+
+
+_logs: Dict[str, EventLog] = {}
+_logs_lock = threading.Lock()
+
+
+def get_event_log(path: str | Path) -> EventLog:
+    """Shared ``EventLog`` per file path (indexes are per process)."""
+    key = str(Path(path).resolve())
+    with _logs_lock:
+        log = _logs.get(key)
+        if log is None:
+            log = _logs[key] = EventLog(path)
+        return log
+
+
+def get_audit_log() -> EventLog:
+    return get_event_log(DIRS["logs"] / "project_audit.jsonl")
+
+
+def get_ledger_log() -> EventLog:
+    return get_event_log(MAURI_LEDGER)
+
+
+__all__ = [
+    "EventLog",
+    "get_event_log",
+    "get_audit_log",
+    "get_ledger_log",
+    "MAURI_LEDGER",
+    "EVENT_LOG_MAX_BYTES",
+]
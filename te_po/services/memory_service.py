@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import List, Dict, Any
 
 from te_po.services.local_storage import list_files, load
+from te_po.services.vector_index import get_index, index_available
 from te_po.services.vector_service import search_text
 
 
@@ -17,6 +18,16 @@ def _format_timestamp(raw: str | None) -> str | None:
 
 def list_memories(limit: int = 10) -> List[Dict[str, Any]]:
     """Return the most recent stored embeddings/logs as memory entries."""
+    if index_available():
+        return [
+            {
+                "id": meta.get("id"),
+                "content": meta.get("text"),
+                "created_at": _format_timestamp(meta.get("ts")),
+            }
+            for meta in get_index("openai").recent(limit)
+        ]
+
     entries: List[Dict[str, Any]] = []
     for filename in sorted(list_files("openai"), reverse=True):
         data_raw = load("openai", filename)
@@ -10,8 +10,9 @@ from typing import Any, Dict, List, Optional
 
 import openai
 
-from te_po.utils.supabase_client import get_client
+from te_po.utils.supabase_client import cached_fetch_records, get_client
 from te_po.utils.audit import log_event
+from te_po.utils.read_cache import invalidate_table
 
 
 def get_git_status() -> Dict[str, Any]:
@@ -96,6 +97,7 @@ def save_project_state(snapshot: Optional[Dict[str, Any]] = None) -> Dict[str, A
                 "updated_at": datetime.utcnow().isoformat(),
             }
         ).execute()
+        invalidate_table("kitenga_project_state")  # cached_fetch_records readers
         
         log_event(
             "project_state_saved",
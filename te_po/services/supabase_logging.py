@@ -1,5 +1,6 @@
 from .supabase_service import (
     log_audit_event,
+    log_audit_events,
     log_pipeline_run,
     log_chunks_metadata,
     log_vector_batch,
@@ -8,6 +9,7 @@ from .supabase_service import (
 
 __all__ = [
     "log_audit_event",
+    "log_audit_events",
     "log_pipeline_run",
     "log_chunks_metadata",
     "log_vector_batch",
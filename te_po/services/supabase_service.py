@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
+import atexit
 import json
 import os
+import threading
+import time
 from datetime import datetime, timezone
 from hashlib import sha256
 from mimetypes import guess_type
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from te_po.services.local_storage import DIRS
+from te_po.utils.read_cache import invalidate_table
 
 from te_po.utils.supabase_client import (
     get_client as _get_client,
@@ -73,9 +79,6 @@ def record_file_metadata(
     vector_batch_id: Optional[str],
     extra: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
-    client = get_client()
-    if client is None:
-        return {"status": "skipped", "reason": "supabase client not configured"}
     table = "kitenga_artifacts"
     payload = {
         "source": source,
@@ -91,11 +94,7 @@ def record_file_metadata(
             "extra": extra or {},
         },
     }
-    try:
-        resp = client.table(table).upsert(payload).execute()
-        return {"status": "ok", "table": table, "response": getattr(resp, "data", None)}
-    except Exception as exc:
-        return {"status": "error", "reason": str(exc)}
+    return queue_write(table, payload, op="upsert")
 
 
 def upload_file(local_path: str, dest_path: str, bucket: Optional[str] = None) -> Dict[str, Any]:
@@ -162,28 +161,38 @@ def _upsert(table: str, row: Dict[str, Any]) -> Dict[str, Any]:
         return {"status": "skipped", "reason": "supabase client not configured"}
     try:
         resp = client.table(table).upsert(row).execute()
+        invalidate_table(table)
         return {"status": "ok", "data": getattr(resp, "data", None)}
     except Exception as exc:
         return {"status": "error", "reason": str(exc)}
 
 
 def log_audit_event(event: str, detail: str, source: Optional[str] = None, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    client = get_client()
-    if client is None:
-        return {"status": "skipped", "reason": "supabase client not configured"}
-    try:
-        resp = client.table("kitenga_logs").insert(
-            {
-                "event": event,
-                "detail": detail,
-                "source": source,
-                "data": data or {},
-                "created_at": _now(),
-            }
-        ).execute()
-        return {"status": "ok", "data": getattr(resp, "data", None)}
-    except Exception as exc:
-        return {"status": "error", "reason": str(exc)}
+    return queue_write(
+        "kitenga_logs",
+        {
+            "event": event,
+            "detail": detail,
+            "source": source,
+            "data": data or {},
+            "created_at": _now(),
+        },
+    )
+
+
+def log_audit_events(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Bulk ``log_audit_event`` for already-built events (``event``/``detail``/``source``/``data``)."""
+    rows = [
+        {
+            "event": e.get("event"),
+            "detail": e.get("detail"),
+            "source": e.get("source"),
+            "data": e.get("data") or {},
+            "created_at": e.get("ts") or _now(),
+        }
+        for e in events
+    ]
+    return queue_writes("kitenga_logs", rows)
 
 
 def log_pipeline_run(
@@ -211,7 +220,7 @@ def log_pipeline_run(
         "metadata": metadata or {},
         "created_at": _now(),
     }
-    return _upsert("kitenga_pipeline_runs", row)
+    return queue_write("kitenga_pipeline_runs", row, op="upsert")
 
 
 def log_chunks_metadata(
@@ -240,7 +249,7 @@ def log_vector_batch(
         "updated_at": _now(),
         "created_at": _now(),
     }
-    return _upsert("kitenga_vector_batches", row)
+    return queue_write("kitenga_vector_batches", row, op="upsert")
 
 
 def log_chat_entry(
@@ -271,12 +280,13 @@ def log_chat_entry(
     return resp
 
 
-def _insert_row(table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+def _insert_row(table: str, row: Dict[str, Any] | List[Dict[str, Any]]) -> Dict[str, Any]:
     client = get_client()
     if client is None:
         return {"status": "skipped", "reason": "supabase client not configured"}
     try:
         resp = client.table(table).insert(row).execute()
+        invalidate_table(table)
         return {"status": "ok", "data": getattr(resp, "data", None)}
     except Exception as exc:
         return {"status": "error", "reason": str(exc)}
@@ -325,6 +335,259 @@ def _persist_taonga_metadata(client, tool_outputs: List[Dict[str, Any]], metadat
         pass
 
 
+# ---------------------------------------------------------------------------
+# Write-behind buffer for telemetry rows
+# ---------------------------------------------------------------------------
+
+SUPABASE_WRITE_BEHIND = os.getenv("SUPABASE_WRITE_BEHIND", "1").lower() not in {"0", "false", "no"}
+SUPABASE_BATCH_SIZE = int(os.getenv("SUPABASE_BATCH_SIZE", "100"))
+SUPABASE_FLUSH_INTERVAL = float(os.getenv("SUPABASE_FLUSH_INTERVAL", "2.0"))
+SUPABASE_MAX_RETRIES = int(os.getenv("SUPABASE_MAX_RETRIES", "4"))
+SUPABASE_MAX_BACKOFF = float(os.getenv("SUPABASE_MAX_BACKOFF", "8.0"))
+SUPABASE_SPILL_DIR = Path(
+    os.getenv("SUPABASE_SPILL_DIR", str(DIRS["logs"] / "supabase_spill"))
+)
+
+
+class WriteBehindBuffer:
+    """
+    Coalesce telemetry writes per table and send them in bulk off the request path.
+
+    ``insert``/``upsert`` rows with the same table and column set become one
+    bulk request; ``update`` calls for the same table and filters merge into
+    one (last write wins per column). A daemon thread flushes when a table
+    reaches ``batch_size`` rows or every ``interval`` seconds. Failed
+    flushes retry with capped exponential backoff, then spill to JSONL under
+    ``spill_dir``; spilled rows are replayed after the next successful flush.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = SUPABASE_BATCH_SIZE,
+        interval: float = SUPABASE_FLUSH_INTERVAL,
+        max_retries: int = SUPABASE_MAX_RETRIES,
+        max_backoff: float = SUPABASE_MAX_BACKOFF,
+        spill_dir: Path = SUPABASE_SPILL_DIR,
+        client_factory: Callable[[], Any] = None,
+    ):
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self.max_retries = max(0, max_retries)
+        self.max_backoff = max_backoff
+        self.spill_dir = Path(spill_dir)
+        self._client_factory = client_factory or get_client
+        self._pending: Dict[Tuple, List[Dict[str, Any]]] = {}
+        self._updates: Dict[Tuple, Dict[str, Any]] = {}
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.stats = {"queued": 0, "flushed": 0, "requests": 0, "retries": 0, "spilled": 0, "replayed": 0}
+
+    # -- producer side -------------------------------------------------
+
+    def _start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="supabase-write-behind", daemon=True)
+            self._thread.start()
+
+    def add(self, table: str, row: Dict[str, Any], op: str = "insert", on_conflict: Optional[str] = None) -> Dict[str, Any]:
+        key = (table, op, on_conflict, tuple(sorted(row)))
+        with self._cond:
+            self._pending.setdefault(key, []).append(row)
+            self.stats["queued"] += 1
+            self._start()
+            if len(self._pending[key]) >= self.batch_size:
+                self._cond.notify()
+        return {"status": "queued", "table": table, "op": op}
+
+    def update(self, table: str, filters: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, Any]:
+        key = (table, tuple(sorted(filters.items())))
+        with self._cond:
+            merged = self._updates.setdefault(key, {})
+            merged.update(values)
+            self.stats["queued"] += 1
+            self._start()
+        return {"status": "queued", "table": table, "op": "update"}
+
+    # -- flushing ------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed:
+                    self._cond.wait(timeout=self.interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def _drain(self) -> Tuple[Dict[Tuple, List[Dict[str, Any]]], Dict[Tuple, Dict[str, Any]]]:
+        with self._cond:
+            pending, updates = self._pending, self._updates
+            self._pending, self._updates = {}, {}
+        return pending, updates
+
+    def _send(self, client, table: str, op: str, rows, on_conflict: Optional[str] = None, filters=None) -> None:
+        """One request with bounded retries; raises after the last attempt."""
+        delay = 0.25
+        for attempt in range(self.max_retries + 1):
+            try:
+                if op == "update":
+                    q = client.table(table).update(rows)
+                    for col, value in filters:
+                        q = q.eq(col, value)
+                    q.execute()
+                elif op == "upsert":
+                    if on_conflict:
+                        client.table(table).upsert(rows, on_conflict=on_conflict).execute()
+                    else:
+                        client.table(table).upsert(rows).execute()
+                else:
+                    client.table(table).insert(rows).execute()
+                invalidate_table(table)
+                self.stats["requests"] += 1
+                return
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                self.stats["retries"] += 1
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+
+    def flush(self) -> Dict[str, int]:
+        """Send everything buffered now; returns counts of rows flushed and spilled."""
+        with self._flush_lock:
+            pending, updates = self._drain()
+            if not pending and not updates:
+                return {"flushed": 0, "spilled": 0}
+            client = self._client_factory()
+            flushed = spilled = 0
+            for (table, op, on_conflict, _), rows in pending.items():
+                if on_conflict:
+                    # A bulk upsert may not touch the same row twice; keep the last.
+                    conflict_cols = [c.strip() for c in on_conflict.split(",")]
+                    rows = list({tuple(r.get(c) for c in conflict_cols): r for r in rows}.values())
+                for start in range(0, len(rows), self.batch_size):
+                    part = rows[start:start + self.batch_size]
+                    try:
+                        if client is None:
+                            raise RuntimeError("supabase client not configured")
+                        self._send(client, table, op, part, on_conflict=on_conflict)
+                        flushed += len(part)
+                    except Exception:
+                        self._spill([{"table": table, "op": op, "on_conflict": on_conflict, "row": r} for r in part])
+                        spilled += len(part)
+            for (table, filters), values in updates.items():
+                try:
+                    if client is None:
+                        raise RuntimeError("supabase client not configured")
+                    self._send(client, table, "update", values, filters=filters)
+                    flushed += 1
+                except Exception:
+                    self._spill([{"table": table, "op": "update", "filters": dict(filters), "row": values}])
+                    spilled += 1
+            self.stats["flushed"] += flushed
+            self.stats["spilled"] += spilled
+            if flushed and not spilled:
+                self._replay_spill()
+            return {"flushed": flushed, "spilled": spilled}
+
+    # -- disk spill ----------------------------------------------------
+
+    def _spill(self, entries: List[Dict[str, Any]]) -> None:
+        try:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.spill_dir / "pending.jsonl", "a", encoding="utf-8") as fh:
+                for entry in entries:
+                    fh.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        except Exception:
+            return
+
+    def _replay_spill(self) -> None:
+        """Re-queue spilled rows once Supabase is reachable again."""
+        path = self.spill_dir / "pending.jsonl"
+        if not path.exists():
+            return
+        replay = path.with_name(f"replay_{int(time.time() * 1000)}.jsonl")
+        try:
+            path.rename(replay)
+            lines = replay.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("op") == "update":
+                self.update(entry["table"], entry.get("filters") or {}, entry["row"])
+            else:
+                self.add(entry["table"], entry["row"], op=entry.get("op", "insert"), on_conflict=entry.get("on_conflict"))
+            self.stats["replayed"] += 1
+        replay.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+        self.flush()
+
+
+_write_buffer: Optional[WriteBehindBuffer] = None
+_write_buffer_lock = threading.Lock()
+
+
+def get_write_buffer() -> WriteBehindBuffer:
+    global _write_buffer
+    with _write_buffer_lock:
+        if _write_buffer is None:
+            _write_buffer = WriteBehindBuffer()
+            atexit.register(_write_buffer.close)
+        return _write_buffer
+
+
+def flush_writes() -> Dict[str, int]:
+    """Flush buffered telemetry now (e.g. at the end of a worker job)."""
+    if _write_buffer is None:
+        return {"flushed": 0, "spilled": 0}
+    return _write_buffer.flush()
+
+
+def queue_write(table: str, row: Dict[str, Any], op: str = "insert", on_conflict: Optional[str] = None) -> Dict[str, Any]:
+    """Buffer a telemetry insert/upsert, or write it now when write-behind is off."""
+    if get_client() is None:
+        return {"status": "skipped", "reason": "supabase client not configured"}
+    if SUPABASE_WRITE_BEHIND:
+        return get_write_buffer().add(table, row, op=op, on_conflict=on_conflict)
+    return _upsert(table, row) if op == "upsert" else _insert_row(table, row)
+
+
+def queue_writes(table: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Buffer many telemetry inserts, or send them now as one bulk insert."""
+    if not rows:
+        return {"status": "ok", "data": []}
+    if get_client() is None:
+        return {"status": "skipped", "reason": "supabase client not configured"}
+    if SUPABASE_WRITE_BEHIND:
+        buffer = get_write_buffer()
+        for row in rows:
+            buffer.add(table, row)
+        return {"status": "queued", "table": table, "op": "insert", "rows": len(rows)}
+    return _insert_row(table, rows)
+
+
+def queue_update(table: str, filters: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, Any]:
+    """Buffer a telemetry update (coalesced per table+filters), or apply it now."""
+    if get_client() is None:
+        return {"status": "skipped", "reason": "supabase client not configured"}
+    if SUPABASE_WRITE_BEHIND:
+        return get_write_buffer().update(table, filters, values)
+    return update_record(table, filters, values)
+
+
 __all__ = [
     "get_client",
     "record_file_metadata",
@@ -333,6 +596,7 @@ __all__ = [
     "hash_file",
     "detect_content_type",
     "log_audit_event",
+    "log_audit_events",
     "log_pipeline_run",
     "log_chunks_metadata",
     "log_vector_batch",
@@ -343,4 +607,10 @@ __all__ = [
     "fetch_latest",
     "update_record",
     "delete_record",
+    "WriteBehindBuffer",
+    "get_write_buffer",
+    "flush_writes",
+    "queue_write",
+    "queue_writes",
+    "queue_update",
 ]
@@ -0,0 +1,417 @@
+"""
+Append-only on-disk vector index backed by a memory-mapped float32 matrix.
+
+Layout under ``te_po/storage/index/<name>/``:
+
+    header.json   {"dim": 1536, "version": 1}
+    vectors.f32   row-major float32 matrix, one L2-normalised row per record
+    meta.jsonl    one JSON object per row (id, text, timestamps, metadata)
+
+Rows are only ever appended, so writers never rewrite existing data and
+readers re-map the matrix when it grows. The API process and RQ workers
+both write, so each paired meta/vector append holds an ``flock`` on
+``.lock`` in the index directory. Search is a single matrix-vector
+product plus ``argpartition`` for the top-k.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not on Windows
+    fcntl = None
+
+from te_po.services.local_storage import BASE, list_files, load
+
+logger = logging.getLogger("te_po.vector_index")
+
+INDEX_ROOT = Path(os.getenv("VECTOR_INDEX_DIR") or (BASE / "index"))
+# "exact" (brute-force matrix scan) or "ann" (IVF-flat, see ann_index).
+SEARCH_MODE = os.getenv("VECTOR_SEARCH_MODE", "exact").strip().lower()
+_VERSION = 1
+
+
+def index_available() -> bool:
+    return np is not None
+
+
+class VectorIndex:
+    """Append-only float32 vector matrix with a side metadata table."""
+
+    def __init__(self, name: str, root: str | Path | None = None):
+        if np is None:
+            raise RuntimeError("numpy is required for the local vector index.")
+        self.name = name
+        self.path = Path(root or INDEX_ROOT) / name
+        self._lock = threading.RLock()
+        self._dim: Optional[int] = None
+        self._meta: List[Dict[str, Any]] = []
+        self._meta_offset = 0
+        self._matrix = None
+        self._matrix_rows = 0
+        self._ann = None
+        self._flock_depth = 0
+        self._load_header()
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    @property
+    def header_path(self) -> Path:
+        return self.path / "header.json"
+
+    @property
+    def vectors_path(self) -> Path:
+        return self.path / "vectors.f32"
+
+    @property
+    def meta_path(self) -> Path:
+        return self.path / "meta.jsonl"
+
+    @property
+    def lock_path(self) -> Path:
+        return self.path / ".lock"
+
+    def exists(self) -> bool:
+        return self.header_path.exists()
+
+    @contextmanager
+    def _file_lock(self):
+        """
+        Exclusive lock across processes writing this index. Re-entrant
+        within one instance (callers hold ``self._lock``), since a second
+        ``flock`` on a new descriptor would wait on our own lock.
+        """
+        if self._flock_depth:
+            self._flock_depth += 1
+            try:
+                yield
+            finally:
+                self._flock_depth -= 1
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a") as fh:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            self._flock_depth = 1
+            try:
+                yield
+            finally:
+                self._flock_depth = 0
+                if fcntl is not None:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+    def _load_header(self) -> None:
+        if self.header_path.exists():
+            try:
+                header = json.loads(self.header_path.read_text(encoding="utf-8"))
+                self._dim = int(header.get("dim") or 0) or None
+            except (OSError, ValueError):
+                self._dim = None
+
+    def _write_header(self, dim: int) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.header_path.write_text(json.dumps({"dim": dim, "version": _VERSION}), encoding="utf-8")
+        self.vectors_path.touch(exist_ok=True)
+        self.meta_path.touch(exist_ok=True)
+        self._dim = dim
+
+    def create(self, dim: int) -> None:
+        """Create an empty index (no-op if one already exists)."""
+        with self._lock, self._file_lock():
+            if not self.exists():
+                self._write_header(dim)
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._dim
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _rows_on_disk(self) -> int:
+        if not self._dim or not self.vectors_path.exists():
+            return 0
+        return self.vectors_path.stat().st_size // (self._dim * 4)
+
+    def _refresh_meta(self) -> None:
+        """Read any metadata lines appended since the last refresh."""
+        if not self.meta_path.exists():
+            return
+        with open(self.meta_path, "rb") as fh:
+            fh.seek(self._meta_offset)
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    break  # partial write in progress
+                self._meta_offset += len(line)
+                try:
+                    self._meta.append(json.loads(line))
+                except ValueError:
+                    self._meta.append({})
+
+    def _refresh(self) -> int:
+        """Sync in-memory views with disk; returns the usable row count."""
+        if self._dim is None:
+            self._load_header()
+        rows = self._rows_on_disk()
+        if rows != self._matrix_rows:
+            self._matrix = (
+                np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self._dim))
+                if rows
+                else None
+            )
+            self._matrix_rows = rows
+        if len(self._meta) < rows:
+            self._refresh_meta()
+        return min(rows, len(self._meta))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._refresh()
+
+    def metadata(self, row: int) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            return self._meta[row]
+
+    def vectors(self):
+        """Return the (possibly empty) memory-mapped matrix of normalised rows."""
+        with self._lock:
+            count = self._refresh()
+            if not count or self._matrix is None:
+                return np.zeros((0, self._dim or 0), dtype=np.float32)
+            return self._matrix[:count]
+
+    def recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Most recently appended metadata rows, newest first."""
+        with self._lock:
+            count = self._refresh()
+            return list(reversed(self._meta[max(0, count - limit):count]))
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalise(vectors) -> Any:
+        mat = np.asarray(vectors, dtype=np.float32)
+        if mat.ndim == 1:
+            mat = mat.reshape(1, -1)
+        norms = np.linalg.norm(mat, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return mat / norms
+
+    def add_many(self, records: Sequence[Tuple[Sequence[float], Dict[str, Any]]]) -> int:
+        """
+        Append ``(vector, metadata)`` pairs. Vectors whose dimension does not
+        match the index are skipped. Returns the number of rows written.
+        """
+        if not records:
+            return 0
+        with self._lock, self._file_lock():
+            if self._dim is None:
+                self._load_header()  # another process may have created it
+            if self._dim is None:
+                first = next((vec for vec, _ in records if vec is not None and len(vec)), None)
+                if first is None:
+                    return 0
+                self._write_header(len(first))
+            kept = [(vec, meta) for vec, meta in records if vec is not None and len(vec) == self._dim]
+            if len(kept) != len(records):
+                logger.warning(
+                    "vector index %s: skipped %d record(s) with dimension != %d",
+                    self.name,
+                    len(records) - len(kept),
+                    self._dim,
+                )
+            if not kept:
+                return 0
+            mat = self._normalise([vec for vec, _ in kept])
+            # Metadata first, vectors second: readers only expose rows present in both.
+            with open(self.meta_path, "a", encoding="utf-8") as fh:
+                fh.write("".join(json.dumps(meta, ensure_ascii=False) + "\n" for _, meta in kept))
+            with open(self.vectors_path, "ab") as fh:
+                fh.write(mat.tobytes())
+            return len(kept)
+
+    def add(self, vector: Sequence[float], metadata: Dict[str, Any]) -> int:
+        return self.add_many([(vector, metadata)])
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def scores(self, query: Sequence[float]):
+        """Cosine similarity of ``query`` against every row."""
+        mat = self.vectors()
+        if not len(mat) or len(query) != mat.shape[1]:
+            return np.zeros(0, dtype=np.float32)
+        q = self._normalise(query)[0]
+        return mat @ q
+
+    def ann(self):
+        """The IVF-flat ANN index over this matrix, persisted under ``ivf/``."""
+        with self._lock:
+            if self._ann is None:
+                from te_po.services.ann_index import IVFIndex
+
+                self._ann = IVFIndex(self, path=self.path / "ivf")
+            return self._ann
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int = 5,
+        where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        mode: Optional[str] = None,
+        nprobe: Optional[int] = None,
+    ) -> List[Tuple[int, float, Dict[str, Any]]]:
+        """
+        Top-k by cosine similarity. Returns ``(row, score, metadata)`` sorted
+        best-first. ``mode="ann"`` uses the IVF index (``nprobe`` trades
+        recall for latency); ``where`` filters on row metadata and always
+        runs exact.
+        """
+        if k <= 0:
+            return []
+        if (mode or SEARCH_MODE) == "ann" and where is None:
+            hits = self.ann().search(query, k, nprobe=nprobe)
+            with self._lock:
+                return [(row, score, self._meta[row]) for row, score in hits]
+
+        scores = self.scores(query)
+        if not len(scores):
+            return []
+        if where is not None:
+            with self._lock:
+                allowed = np.fromiter(
+                    (bool(where(meta)) for meta in self._meta[: len(scores)]),
+                    dtype=bool,
+                    count=len(scores),
+                )
+            scores = np.where(allowed, scores, -np.inf)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        with self._lock:
+            return [
+                (int(row), float(scores[row]), self._meta[row])
+                for row in top
+                if np.isfinite(scores[row])
+            ]
+
+
+# ----------------------------------------------------------------------
+# Shared indexes + migration from JSON records
+# ----------------------------------------------------------------------
+
+_indexes: Dict[str, VectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+# stage -> (record filter, record -> (vector, metadata))
+_MIGRATIONS: Dict[str, Tuple[Callable[[dict], bool], Callable[[dict], Tuple[Any, Dict[str, Any]]]]] = {
+    "openai": (
+        lambda rec: rec.get("type") == "embedding",
+        lambda rec: (
+            rec.get("vector"),
+            {"id": rec.get("id"), "text": rec.get("text"), "ts": rec.get("ts")},
+        ),
+    ),
+    "chunks": (
+        lambda rec: True,
+        lambda rec: (
+            rec.get("embedding"),
+            {
+                "id": rec.get("id"),
+                "text": rec.get("chunk_text"),
+                "metadata": rec.get("metadata", {}),
+                "ts": rec.get("saved_at"),
+            },
+        ),
+    ),
+}
+
+
+def migrate_json_records(index: VectorIndex, stage: str) -> int:
+    """One-shot import of the legacy per-record JSON files for ``stage``."""
+    accept, convert = _MIGRATIONS[stage]
+    records: List[Tuple[Any, Dict[str, Any]]] = []
+    for filename in sorted(list_files(stage)):
+        raw = load(stage, filename)
+        if not raw:
+            continue
+        try:
+            record = json.loads(raw)
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(record, dict) or not accept(record):
+            continue
+        vector, meta = convert(record)
+        if vector:
+            records.append((vector, meta))
+    written = index.add_many(records)
+    if not index.exists():
+        # Nothing to import yet; mark the migration as done anyway.
+        index.path.mkdir(parents=True, exist_ok=True)
+        index.header_path.write_text(json.dumps({"dim": None, "version": _VERSION}), encoding="utf-8")
+    logger.info("vector index %s: migrated %d JSON record(s)", index.name, written)
+    return written
+
+
+def _open_index(stage: str) -> Tuple[VectorIndex, set]:
+    """Return the shared index for ``stage`` plus ids imported if it was just migrated."""
+    with _indexes_lock:
+        index = _indexes.get(stage)
+        migrated: set = set()
+        if index is None:
+            index = VectorIndex(stage)
+            if not index.exists():
+                # Another process (API or worker) may be migrating the same
+                # stage; re-check once we hold the index's file lock.
+                with index._lock, index._file_lock():
+                    if not index.exists():
+                        migrate_json_records(index, stage)
+                        migrated = {meta.get("id") for meta in index.recent(len(index))}
+            _indexes[stage] = index
+        return index, migrated
+
+
+def get_index(stage: str) -> VectorIndex:
+    """Shared index for a storage stage (``openai`` or ``chunks``), migrated on first use."""
+    return _open_index(stage)[0]
+
+
+def index_record(stage: str, vector: Sequence[float], metadata: Dict[str, Any]) -> None:
+    """Best-effort append of a freshly stored record to the stage index."""
+    if np is None or not vector:
+        return
+    try:
+        index, migrated = _open_index(stage)
+        if metadata.get("id") in migrated:
+            return  # the first-use migration already picked this record up
+        index.add(vector, metadata)
+    except Exception as exc:  # pragma: no cover - disk failure
+        logger.warning("vector index %s: append failed: %s", stage, exc)
+
+
+__all__ = [
+    "VectorIndex",
+    "get_index",
+    "index_available",
+    "index_record",
+    "migrate_json_records",
+]
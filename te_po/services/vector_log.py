@@ -0,0 +1,323 @@
+"""
+Append-only, segmented JSONL log of vector pushes.
+
+Records live in ``te_po/storage/openai/<glyph>_log/<glyph>.<segment>.jsonl``,
+a directory of their own so that finding the current segment never lists
+the per-embedding ``vec_*.json`` files beside it. Writers
+append whole lines with a single ``O_APPEND`` write, so concurrent
+workers never clobber each other and a write costs O(record) rather
+than rewriting the whole history. A new segment starts once the current
+one passes ``VECTOR_LOG_SEGMENT_BYTES``.
+
+Readers get:
+- ``tail(limit)``: newest records first, read backwards from EOF in blocks;
+- ``find_chunk(chunk_id)`` / ``find_batch(batch_id)``: lookups through an
+  in-memory offset index that is built once and then extended
+  incrementally from where it left off.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from te_po.services.local_storage import DIRS
+
+VECTOR_LOG_SEGMENT_BYTES = int(os.getenv("VECTOR_LOG_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+_BLOCK = 64 * 1024
+
+Location = Tuple[int, int]  # (segment number, byte offset)
+
+
+class VectorLog:
+    """Segmented append-only JSONL log with chunk/batch lookups."""
+
+    def __init__(self, name: str, root: str | Path | None = None, segment_bytes: int = VECTOR_LOG_SEGMENT_BYTES):
+        self.name = name
+        self.root = Path(root) if root else Path(DIRS["openai"]) / f"{name}_log"
+        self.segment_bytes = segment_bytes
+        self._pattern = re.compile(rf"^{re.escape(name)}\.(\d+)\.jsonl$")
+        self._lock = threading.Lock()
+        self._by_chunk: Dict[str, Location] = {}
+        self._by_batch: Dict[str, List[Location]] = {}
+        self._indexed: Dict[int, int] = {}  # segment -> bytes indexed so far
+
+    # ------------------------------------------------------------------
+    # Segments
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, number: int) -> Path:
+        return self.root / f"{self.name}.{number:05d}.jsonl"
+
+    def segments(self) -> List[int]:
+        if not self.root.exists():
+            return []
+        found = []
+        for path in self.root.iterdir():
+            match = self._pattern.match(path.name)
+            if match:
+                found.append(int(match.group(1)))
+        return sorted(found)
+
+    def _current_segment(self) -> int:
+        segments = self.segments()
+        if not segments:
+            return 0
+        last = segments[-1]
+        try:
+            if self._segment_path(last).stat().st_size >= self.segment_bytes:
+                return last + 1
+        except FileNotFoundError:
+            pass
+        return last
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, records: List[Dict[str, Any]]) -> None:
+        """Append records as JSON lines in one write."""
+        if not records:
+            return
+        payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8")
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            path = self._segment_path(self._current_segment())
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _reverse_lines(self, path: Path) -> Iterator[bytes]:
+        """Yield complete lines of ``path`` from last to first, reading blocks from EOF."""
+        with open(path, "rb") as fh:
+            fh.seek(0, os.SEEK_END)
+            pos = fh.tell()
+            remainder = b""
+            while pos > 0:
+                step = min(_BLOCK, pos)
+                pos -= step
+                fh.seek(pos)
+                block = fh.read(step) + remainder
+                lines = block.split(b"\n")
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    if line.strip():
+                        yield line
+            if remainder.strip():
+                yield remainder
+
+    def tail(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Newest ``limit`` records, newest first."""
+        out: List[Dict[str, Any]] = []
+        for number in reversed(self.segments()):
+            for line in self._reverse_lines(self._segment_path(number)):
+                try:
+                    out.append(json.loads(line))
+                except ValueError:
+                    continue  # partial line from an in-flight append
+                if len(out) >= limit:
+                    return out
+        return out
+
+    def _read_at(self, location: Location) -> Optional[Dict[str, Any]]:
+        number, offset = location
+        try:
+            with open(self._segment_path(number), "rb") as fh:
+                fh.seek(offset)
+                return json.loads(fh.readline())
+        except (OSError, ValueError):
+            return None
+
+    def _refresh_index(self) -> None:
+        """Index bytes appended since the last refresh (all segments, any writer)."""
+        for number in self.segments():
+            path = self._segment_path(number)
+            start = self._indexed.get(number, 0)
+            try:
+                if path.stat().st_size <= start:
+                    continue
+            except FileNotFoundError:
+                continue
+            with open(path, "rb") as fh:
+                fh.seek(start)
+                offset = start
+                for line in fh:
+                    if not line.endswith(b"\n"):
+                        break  # in-flight append; pick it up next time
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        record = {}
+                    location = (number, offset)
+                    chunk_id = record.get("chunk_id") or record.get("id")
+                    if chunk_id:
+                        self._by_chunk[chunk_id] = location
+                    batch_id = (record.get("remote") or {}).get("batch_id")
+                    if batch_id:
+                        self._by_batch.setdefault(batch_id, []).append(location)
+                    offset += len(line)
+            self._indexed[number] = offset
+
+    def find_chunk(self, chunk_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._refresh_index()
+            location = self._by_chunk.get(chunk_id)
+        return self._read_at(location) if location else None
+
+    def find_batch(self, batch_id: str, limit: int | None = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._refresh_index()
+            locations = list(self._by_batch.get(batch_id, []))
+        if limit is not None:
+            locations = locations[-limit:]
+        return [r for r in (self._read_at(loc) for loc in locations) if r is not None]
+
+    def batch_summary(self, batch_id: str) -> Dict[str, Any]:
+        records = self.find_batch(batch_id)
+        latest = records[-1] if records else {}
+        remote = latest.get("remote") or {}
+        return {
+            "batch_id": batch_id,
+            "chunks": len(records),
+            "status": remote.get("batch_status"),
+            "vector_store_id": latest.get("vector_store_id"),
+            "file_ids": sorted({(r.get("remote") or {}).get("file_id") for r in records} - {None}),
+            "last_logged": latest.get("timestamp"),
+        }
+
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Every record, oldest first."""
+        for number in self.segments():
+            with open(self._segment_path(number), "rb") as fh:
+                for line in fh:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+    def compact(self, dedupe: bool = False) -> Dict[str, int]:
+        """
+        Rewrite the log into full-size segments, dropping unreadable lines
+        and, with ``dedupe``, all but the newest record per chunk/entry id.
+        Meant for offline maintenance: appends from other processes during
+        compaction are not preserved.
+        """
+        with self._lock:
+            records = list(self.iter_records())
+            before = self.segments()
+            if dedupe:
+                latest: Dict[str, int] = {}
+                for pos, record in enumerate(records):
+                    key = record.get("chunk_id") or record.get("id")
+                    if key:
+                        latest[key] = pos
+                records = [
+                    r for pos, r in enumerate(records)
+                    if latest.get(r.get("chunk_id") or r.get("id"), pos) == pos
+                ]
+
+            # Write the new generation beside the old one, then swap.
+            staging = self.root / f".{self.name}.compact"
+            staging.mkdir(parents=True, exist_ok=True)
+            number, size, fh = 0, 0, None
+            try:
+                for record in records:
+                    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+                    if fh is None or (size and size + len(line) > self.segment_bytes):
+                        if fh is not None:
+                            fh.close()
+                            number += 1
+                        fh = open(staging / self._segment_path(number).name, "wb")
+                        size = 0
+                    fh.write(line)
+                    size += len(line)
+            finally:
+                if fh is not None:
+                    fh.close()
+            for old in before:
+                self._segment_path(old).unlink(missing_ok=True)
+            written = sorted(staging.iterdir())
+            for path in written:
+                os.replace(path, self.root / path.name)
+            staging.rmdir()
+
+            self._by_chunk.clear()
+            self._by_batch.clear()
+            self._indexed.clear()
+        return {"records": len(records), "segments_before": len(before), "segments_after": len(written)}
+
+
+def migrate_array_log(log: VectorLog, array_path: Path) -> int:
+    """
+    Move a legacy ``<glyph>.json`` array into the segmented log (oldest
+    first) and rename the original to ``.json.migrated``. Returns the number
+    of records moved.
+    """
+    try:
+        records = json.loads(array_path.read_text(encoding="utf-8") or "[]")
+    except (OSError, ValueError):
+        return 0
+    if isinstance(records, dict):
+        records = [records]
+    if not isinstance(records, list):
+        return 0
+    for start in range(0, len(records), 1000):
+        log.append(records[start:start + 1000])
+    array_path.rename(array_path.with_name(array_path.name + ".migrated"))
+    return len(records)
+
+
+def migrate_flat_segments(log: VectorLog, parent: Path) -> int:
+    """
+    Move ``<glyph>.<segment>.jsonl`` files written straight into ``parent``
+    (the layout before segments got their own directory) into the log's
+    directory. Returns the number of segments moved.
+    """
+    if parent.resolve() == log.root.resolve() or not parent.exists():
+        return 0
+    flat = sorted(p for p in parent.iterdir() if log._pattern.match(p.name))
+    if not flat:
+        return 0
+    log.root.mkdir(parents=True, exist_ok=True)
+    with log._lock:
+        offset = (log.segments() or [-1])[-1] + 1
+        for path in flat:
+            number = int(log._pattern.match(path.name).group(1))
+            os.replace(path, log._segment_path(offset + number))
+    return len(flat)
+
+
+_logs: Dict[str, VectorLog] = {}
+_logs_lock = threading.Lock()
+
+
+def get_vector_log(name: str) -> VectorLog:
+    """Shared log for ``name`` (the glyph); folds in legacy layouts on first use."""
+    with _logs_lock:
+        log = _logs.get(name)
+        if log is None:
+            log = VectorLog(name)
+            parent = Path(DIRS["openai"])
+            migrate_flat_segments(log, parent)
+            legacy = parent / f"{name}.json"
+            if legacy.exists():
+                migrate_array_log(log, legacy)
+            _logs[name] = log
+        return log
+
+
+__all__ = ["VectorLog", "get_vector_log", "migrate_array_log", "migrate_flat_segments", "VECTOR_LOG_SEGMENT_BYTES"]
@@ -1,3 +1,4 @@
+import io
 import json
 import os
 import tempfile
@@ -7,10 +8,20 @@ from pathlib import Path
 
 from te_po.mauri import MAURI
 from te_po.services.local_storage import list_files, load, save, timestamp
+from te_po.services.vector_index import get_index, index_available, index_record
+from te_po.services.vector_log import get_vector_log
 from te_po.utils.audit import log_event
-from te_po.utils.openai_client import client, DEFAULT_EMBED_MODEL, last_openai_run_id, record_openai_run
+from te_po.utils.openai_client import (
+    client,
+    DEFAULT_EMBED_MODEL,
+    generate_embedding,
+    generate_embedding_with_run,
+    last_openai_run_id,
+)
 
 VECTOR_STORE_ID = os.getenv("OPENAI_VECTOR_STORE_ID")
+# Size cap per bulk JSONL upload (OpenAI allows far more; smaller files index faster).
+VECTOR_UPLOAD_MAX_BYTES = int(os.getenv("VECTOR_UPLOAD_MAX_BYTES", str(8 * 1024 * 1024)))
 GLYPH = (
     MAURI.get("identity", {}).get("glyph_id")
     or MAURI.get("openai", {}).get("glyph_id")
@@ -92,17 +103,13 @@ def embed_text(text: str, metadata: dict | None = None, record_type: str = "embe
     if client is None:
         return {"id": None, "vector": [], "saved": False, "error": "OpenAI client not configured."}
     try:
-        rsp = client.embeddings.create(
-            model=DEFAULT_EMBED_MODEL,
-            input=text,
-        )
-        record_openai_run(rsp)
-        vec = rsp.data[0].embedding
+        vec, openai_run_id = generate_embedding_with_run(text, model=DEFAULT_EMBED_MODEL)
+        vec = list(vec)
         entry_id = f"vec_{uuid.uuid4().hex}"
-        openai_run_id = last_openai_run_id()
 
         remote = _push_remote_vector(entry_id, text, vec, metadata=metadata)
 
+        ts = timestamp()
         save(
             "openai",
             f"{entry_id}.json",
@@ -111,7 +118,7 @@ def embed_text(text: str, metadata: dict | None = None, record_type: str = "embe
                     "id": entry_id,
                     "text": text,
                     "vector": vec,
-                    "ts": timestamp(),
+                    "ts": ts,
                     "type": record_type,
                     "metadata": metadata or {},
                     "remote": remote,
@@ -119,6 +126,8 @@ def embed_text(text: str, metadata: dict | None = None, record_type: str = "embe
                 indent=2,
             ),
         )
+        if record_type == "embedding":
+            index_record("openai", vec, {"id": entry_id, "text": text, "ts": ts})
         _log_remote(entry_id, text, vec, remote, metadata=metadata)
         return {
             "id": entry_id,
@@ -131,45 +140,58 @@ def embed_text(text: str, metadata: dict | None = None, record_type: str = "embe
         return {"id": None, "vector": [], "saved": False, "error": str(exc)}
 
 
-def search_text(query: str, top_k=5):
+def _scan_json_records(query_vec, top_k: int) -> list[dict]:
+    """Fallback brute-force scan over the JSON records (used when numpy is missing)."""
+    matches = []
+    for filename in list_files("openai"):
+        data_raw = load("openai", filename)
+        if not data_raw:
+            continue
+        try:
+            record = json.loads(data_raw)
+        except json.JSONDecodeError:
+            continue
+        if record.get("type") != "embedding":
+            continue
+        vector = record.get("vector")
+        if not vector:
+            continue
+        matches.append(
+            {
+                "id": record.get("id"),
+                "text": record.get("text"),
+                "score": _cosine(query_vec, vector),
+                "created_at": record.get("ts"),
+            }
+        )
+    matches.sort(key=lambda item: item["score"], reverse=True)
+    return matches[:top_k]
+
+
+def search_text(query: str, top_k=5, mode: str | None = None, nprobe: int | None = None):
     if client is None:
         return {"matches": [], "error": "OpenAI client not configured."}
     try:
-        rsp = client.embeddings.create(
-            model=DEFAULT_EMBED_MODEL,
-            input=query,
-        )
-        query_vec = rsp.data[0].embedding
-        matches = []
-        for filename in list_files("openai"):
-            data_raw = load("openai", filename)
-            if not data_raw:
-                continue
-            try:
-                record = json.loads(data_raw)
-            except json.JSONDecodeError:
-                continue
-            if record.get("type") != "embedding":
-                continue
-            vector = record.get("vector")
-            if not vector:
-                continue
-            score = _cosine(query_vec, vector)
-            matches.append(
-                {
-                    "id": record.get("id"),
-                    "text": record.get("text"),
-                    "score": score,
-                    "created_at": record.get("ts"),
-                }
-            )
-        matches.sort(key=lambda item: item["score"], reverse=True)
-        return {"matches": matches[:top_k]}
+        query_vec = generate_embedding(query, model=DEFAULT_EMBED_MODEL)
+        if index_available():
+            hits = get_index("openai").search(query_vec, top_k, mode=mode, nprobe=nprobe)
+            return {
+                "matches": [
+                    {
+                        "id": meta.get("id"),
+                        "text": meta.get("text"),
+                        "score": score,
+                        "created_at": meta.get("ts"),
+                    }
+                    for _, score, meta in hits
+                ]
+            }
+        return {"matches": _scan_json_records(query_vec, top_k)}
     except Exception as exc:
         return {"matches": [], "error": str(exc)}
 
 
-def _log_remote(
+def _remote_log_record(
     entry_id: str,
     text: str,
     vector,
@@ -177,19 +199,8 @@ def _log_remote(
     vector_store_id: str | None = None,
     chunk_id: str | None = None,
     metadata: dict | None = None,
-):
-    log_dir = Path(__file__).resolve().parents[1] / "storage" / "openai"
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / f"{GLYPH}.json"
-
-    try:
-        existing = []
-        if log_file.exists():
-            existing = json.loads(log_file.read_text(encoding="utf-8") or "[]")
-    except Exception:
-        existing = []
-
-    record = {
+) -> dict:
+    return {
         "id": entry_id,
         "text_length": len(text),
         "dimension": len(vector) if vector else 0,
@@ -201,8 +212,21 @@ def _log_remote(
         "chunk_id": chunk_id,
         "metadata": metadata or {},
     }
-    existing.append(record)
-    log_file.write_text(json.dumps(existing, indent=2), encoding="utf-8")
+
+
+def _log_remote(
+    entry_id: str,
+    text: str,
+    vector,
+    remote_result: dict,
+    vector_store_id: str | None = None,
+    chunk_id: str | None = None,
+    metadata: dict | None = None,
+):
+    """Append one push result to the glyph's vector log."""
+    get_vector_log(GLYPH).append([
+        _remote_log_record(entry_id, text, vector, remote_result, vector_store_id, chunk_id, metadata)
+    ])
 
 
 def push_chunk_embedding(
@@ -230,3 +254,109 @@ def push_chunk_embedding(
         chunk_id=chunk_id,
     )
     return remote
+
+
+def _bulk_segments(records: list[dict], max_bytes: int) -> list[tuple[bytes, list[str]]]:
+    """Pack chunk records into JSONL payloads no larger than ``max_bytes`` (one record minimum)."""
+    segments: list[tuple[bytes, list[str]]] = []
+    lines: list[bytes] = []
+    ids: list[str] = []
+    size = 0
+    for record in records:
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        if lines and size + len(line) > max_bytes:
+            segments.append((b"".join(lines), ids))
+            lines, ids, size = [], [], 0
+        lines.append(line)
+        ids.append(record["id"])
+        size += len(line)
+    if lines:
+        segments.append((b"".join(lines), ids))
+    return segments
+
+
+def push_chunk_embeddings(
+    chunks: list[dict],
+    metadata: dict | None = None,
+    run_id: str | None = None,
+    max_bytes: int = VECTOR_UPLOAD_MAX_BYTES,
+) -> dict:
+    """
+    Push every chunk of a pipeline run to the OpenAI vector store in bulk.
+
+    ``chunks`` are ``{"chunk_id", "text", "embedding"}`` dicts. Records are
+    streamed into one or more size-capped JSONL uploads (no temp files) and
+    attached with a single file batch. Returns the batch details plus a
+    ``chunk_files`` map of chunk id -> uploaded file id.
+    """
+    chunks = [c for c in chunks if c.get("embedding")]
+    if not chunks:
+        return {"pushed": False, "reason": "no embeddings", "chunk_files": {}}
+    if client is None or not VECTOR_STORE_ID:
+        remote = {"pushed": False, "reason": "vector store id missing or client offline", "chunk_files": {}}
+    elif not hasattr(client, "beta") or not hasattr(client.beta, "vector_stores"):
+        remote = {"pushed": False, "reason": "vector store API not available in this client", "chunk_files": {}}
+    else:
+        records = [
+            {"id": c["chunk_id"], "text": c["text"], "metadata": metadata or {}}
+            for c in chunks
+        ]
+        label = run_id or uuid.uuid4().hex
+        chunk_files: dict[str, str] = {}
+        file_ids: list[str] = []
+        try:
+            # The file_search store accepts .txt, not .jsonl; contents are JSON lines.
+            for idx, (payload, ids) in enumerate(_bulk_segments(records, max_bytes)):
+                file_resp = client.files.create(
+                    file=(f"chunks_{label}_{idx:03d}.txt", io.BytesIO(payload)),
+                    purpose="assistants",
+                )
+                file_ids.append(file_resp.id)
+                chunk_files.update({chunk_id: file_resp.id for chunk_id in ids})
+            batch_resp = client.beta.vector_stores.file_batches.create(
+                vector_store_id=VECTOR_STORE_ID,
+                file_ids=file_ids,
+            )
+            remote = {
+                "pushed": True,
+                "reason": None,
+                "vector_store_id": VECTOR_STORE_ID,
+                "file_ids": file_ids,
+                "batch_id": getattr(batch_resp, "id", None),
+                "batch_status": getattr(batch_resp, "status", None),
+                "chunk_files": chunk_files,
+                "openai_run_id": last_openai_run_id(),
+            }
+            log_event(
+                "vector_batch_enqueued",
+                f"{len(records)} chunk(s) attached to vector store in {len(file_ids)} file(s)",
+                source="vector_service",
+                data={
+                    "vector_store_id": VECTOR_STORE_ID,
+                    "file_ids": file_ids,
+                    "batch_id": remote["batch_id"],
+                    "status": remote["batch_status"],
+                    "chunks": len(records),
+                },
+            )
+        except Exception as exc:
+            remote = {
+                "pushed": False,
+                "reason": str(exc),
+                "file_ids": file_ids,
+                "chunk_files": chunk_files,
+            }
+
+    summary = {k: remote.get(k) for k in ("pushed", "reason", "vector_store_id", "batch_id", "batch_status")}
+    get_vector_log(GLYPH).append([
+        _remote_log_record(
+            entry_id=c["chunk_id"],
+            text=c["text"],
+            vector=c["embedding"],
+            remote_result={**summary, "file_id": remote["chunk_files"].get(c["chunk_id"])},
+            vector_store_id=VECTOR_STORE_ID,
+            chunk_id=c["chunk_id"],
+        )
+        for c in chunks
+    ])
+    return remote
@@ -1,4 +1,4 @@
 """Te Po State Module - Read and manage application state."""
-from .read_state import get_private_state, get_public_state, get_state_version
+from .read_state import get_private_state, get_public_state, get_state_response, get_state_version
 
-__all__ = ["get_private_state", "get_public_state", "get_state_version"]
+__all__ = ["get_private_state", "get_public_state", "get_state_response", "get_state_version"]
@@ -1,44 +1,128 @@
 """
 State reading utilities for Te Po.
 Reads from state.yaml and provides public/private state access.
+
+The parsed file is cached and re-read only when its mtime or size
+changes (checked at most every ``STATE_STAT_INTERVAL`` seconds). Each
+parse also precomputes the JSON response bytes and an ETag for the
+public, private and version views, so polling endpoints can answer from
+memory or with a 304.
 """
-import yaml
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+import yaml
 
 STATE_FILE = Path(__file__).resolve().parents[1] / "state.yaml"
+STATE_STAT_INTERVAL = float(os.getenv("STATE_STAT_INTERVAL", "0.5"))
+
+_EMPTY_STATE = {"version": "0.0.0", "public": {}, "private": {}}
 
 
-def _load_state() -> Dict[str, Any]:
+def _load_state(path: Optional[Path] = None) -> Dict[str, Any]:
     """Load state from YAML file."""
-    if not STATE_FILE.exists():
-        return {"version": "0.0.0", "public": {}, "private": {}}
-    
+    path = path or STATE_FILE
+    if not path.exists():
+        return copy.deepcopy(_EMPTY_STATE)
+
     try:
-        with open(STATE_FILE, "r", encoding="utf-8") as f:
+        with open(path, "r", encoding="utf-8") as f:
             return yaml.safe_load(f) or {}
     except Exception:
-        return {"version": "0.0.0", "public": {}, "private": {}}
+        return copy.deepcopy(_EMPTY_STATE)
+
+
+def _encode(value: Any) -> Tuple[bytes, str]:
+    body = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    return body, '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+@dataclass
+class StateSnapshot:
+    """One parse of state.yaml plus its serialised views."""
+
+    signature: Optional[Tuple[int, int]]
+    state: Dict[str, Any]
+    views: Dict[str, Tuple[bytes, str]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, signature: Optional[Tuple[int, int]], state: Dict[str, Any]) -> "StateSnapshot":
+        snapshot = cls(signature, state)
+        snapshot.views = {
+            "public": _encode(state.get("public", state)),
+            "private": _encode(state.get("private", {})),
+            "version": _encode(state.get("version", "0.0.0")),
+        }
+        return snapshot
+
+
+class StateCache:
+    def __init__(self, path: Path = STATE_FILE, interval: float = STATE_STAT_INTERVAL):
+        self.path = Path(path)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._snapshot: Optional[StateSnapshot] = None
+        self._checked_at = 0.0
+        self.loads = 0
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def snapshot(self) -> StateSnapshot:
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is not None and now - self._checked_at < self.interval:
+            return snapshot
+        signature = self._signature()
+        with self._lock:
+            self._checked_at = now
+            if self._snapshot is None or self._snapshot.signature != signature:
+                self._snapshot = StateSnapshot.build(signature, _load_state(self.path))
+                self.loads += 1
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = None
+
+
+_cache = StateCache()
+
+
+def get_state_response(view: str) -> Tuple[bytes, str]:
+    """Precomputed ``(json_bytes, etag)`` for ``"public"``, ``"private"`` or ``"version"``."""
+    return _cache.snapshot().views[view]
 
 
 def get_state_version() -> str:
     """Get current state version."""
-    state = _load_state()
+    state = _cache.snapshot().state
     return state.get("version", "0.0.0")
 
 
 def get_public_state() -> Dict[str, Any]:
     """Get public (shareable) state."""
-    state = _load_state()
-    return state.get("public", state)
+    state = _cache.snapshot().state
+    return copy.deepcopy(state.get("public", state))
 
 
 def get_private_state() -> Dict[str, Any]:
     """Get private (internal) state."""
-    state = _load_state()
-    return state.get("private", {})
+    state = _cache.snapshot().state
+    return copy.deepcopy(state.get("private", {}))
 
 
 def get_full_state() -> Dict[str, Any]:
     """Get full state object."""
-    return _load_state()
+    return copy.deepcopy(_cache.snapshot().state)
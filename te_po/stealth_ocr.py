@@ -7,12 +7,11 @@ import imghdr
 import json
 import os
 import re
-import subprocess
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from te_po.core.config import settings
+from te_po.pipeline.ocr.tesseract_pool import get_tesseract_pool
 from te_po.utils.openai_client import DEFAULT_VISION_MODEL, client
 
 class StealthOCR:
@@ -115,29 +114,13 @@ class StealthOCR:
 
     # --- Real OCR path for testing/backup (uses system tesseract + OpenAI vision) ---
     def _tesseract_available(self) -> bool:
-        try:
-            subprocess.run(
-                [settings.tesseract_path or "tesseract", "-v"],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=False,
-            )
-            return True
-        except Exception:
-            return False
+        return get_tesseract_pool().available()
 
     def _real_tesseract_scan(self, image_data: bytes) -> Dict[str, Any]:
         if not self._tesseract_available():
             return {"text_extracted": "", "confidence": 0, "method_used": "tesseract_missing"}
         try:
-            proc = subprocess.run(
-                [settings.tesseract_path or "tesseract", "stdin", "stdout", "-l", "eng+mri"],
-                input=image_data,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                check=False,
-            )
-            text = proc.stdout.decode(errors="ignore").strip()
+            text = get_tesseract_pool().scan(image_data)
             return {
                 "text_extracted": text,
                 "confidence": 85 if text else 0,
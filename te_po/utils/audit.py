@@ -1,25 +1,175 @@
 from __future__ import annotations
 
+import atexit
+import logging
+import os
+import threading
+from collections import deque
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from te_po.services.local_storage import append_audit
-from te_po.services.supabase_logging import log_audit_event
+from te_po.services.event_log import get_audit_log, get_ledger_log
+from te_po.services.supabase_logging import log_audit_events
 
-MAURI_LEDGER = Path(__file__).resolve().parents[2] / "mauri" / "state" / "te_po_carving_log.jsonl"
+logger = logging.getLogger("te_po.audit")
 
+AUDIT_ASYNC = os.getenv("AUDIT_ASYNC", "1").lower() not in {"0", "false", "no"}
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.5"))
+# drop_new | drop_oldest | sample
+AUDIT_OVERFLOW_POLICY = os.getenv("AUDIT_OVERFLOW_POLICY", "drop_oldest").strip().lower()
+# With the "sample" policy, keep 1 in N events once the queue is half full.
+AUDIT_SAMPLE_RATE = int(os.getenv("AUDIT_SAMPLE_RATE", "10"))
 
-def _append_mauri_ledger(event: dict) -> None:
-    """Best-effort append to the Mauri carving ledger."""
-    try:
-        MAURI_LEDGER.parent.mkdir(parents=True, exist_ok=True)
-        with open(MAURI_LEDGER, "a", encoding="utf-8") as fh:
-            import json
 
-            fh.write(json.dumps(event, ensure_ascii=False) + "\n")
-    except Exception:
+def write_audit_batch(events: List[dict]) -> None:
+    """Write ``events`` to the project audit log, the Mauri ledger and Supabase."""
+    if not events:
         return
+    for log in (get_audit_log(), get_ledger_log()):
+        try:
+            log.append(events)  # one write + one fsync per file
+        except Exception:
+            pass
+    try:
+        log_audit_events(events)
+    except Exception:
+        pass
+
+
+class AuditSink:
+    """
+    Bounded in-process audit queue drained by one background thread.
+
+    ``emit`` only appends to a deque, so callers pay microseconds. The
+    drainer writes up to ``batch_size`` events at a time via ``writer``
+    (one file append + fsync per file, one bulk Supabase insert). When the
+    queue is full, ``policy`` decides what is lost: ``drop_new`` rejects the
+    incoming event, ``drop_oldest`` evicts the oldest queued one, and
+    ``sample`` additionally keeps only 1 in ``sample_rate`` events once the
+    queue is half full.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = AUDIT_QUEUE_SIZE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        interval: float = AUDIT_FLUSH_INTERVAL,
+        policy: str = AUDIT_OVERFLOW_POLICY,
+        sample_rate: int = AUDIT_SAMPLE_RATE,
+        writer: Callable[[List[dict]], None] = write_audit_batch,
+    ):
+        if policy not in {"drop_new", "drop_oldest", "sample"}:
+            logger.warning("Unknown AUDIT_OVERFLOW_POLICY %r; using drop_oldest", policy)
+            policy = "drop_oldest"
+        self.maxsize = max(1, maxsize)
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self.policy = policy
+        self.sample_rate = max(1, sample_rate)
+        self._writer = writer
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._seen_under_pressure = 0
+        self.stats: Dict[str, int] = {"queued": 0, "written": 0, "batches": 0, "dropped": 0, "sampled_out": 0}
+
+    def _start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+            self._thread.start()
+
+    def emit(self, event: dict) -> bool:
+        """Queue ``event``; returns False if the overflow policy discarded it."""
+        with self._cond:
+            size = len(self._queue)
+            if self.policy == "sample" and size >= self.maxsize // 2:
+                self._seen_under_pressure += 1
+                if self._seen_under_pressure % self.sample_rate:
+                    self.stats["sampled_out"] += 1
+                    return False
+            if size >= self.maxsize:
+                if self.policy == "drop_oldest":
+                    self._queue.popleft()
+                    self.stats["dropped"] += 1
+                else:
+                    self.stats["dropped"] += 1
+                    return False
+            self._queue.append(event)
+            self.stats["queued"] += 1
+            self._start()
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+        return True
+
+    def _take(self) -> List[dict]:
+        with self._cond:
+            count = min(len(self._queue), self.batch_size)
+            batch = [self._queue.popleft() for _ in range(count)]
+            if len(self._queue) < self.maxsize // 2:
+                self._seen_under_pressure = 0
+            return batch
+
+    def flush(self) -> int:
+        """Write everything queued now; returns the number of events written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take()
+                if not batch:
+                    return written
+                try:
+                    self._writer(batch)
+                except Exception as exc:  # writer is best-effort; never kill the drainer
+                    logger.warning("Audit batch of %d events failed: %s", len(batch), exc)
+                written += len(batch)
+                self.stats["written"] += len(batch)
+                self.stats["batches"] += 1
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed and len(self._queue) < self.batch_size:
+                    self._cond.wait(timeout=self.interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+        self.flush()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+
+_sink: Optional[AuditSink] = None
+_sink_lock = threading.Lock()
+
+
+def get_audit_sink() -> AuditSink:
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            _sink = AuditSink()
+            atexit.register(_sink.close)
+        return _sink
+
+
+def flush_audit() -> int:
+    """Drain queued audit events now (shutdown hooks, end of worker jobs)."""
+    if _sink is None:
+        return 0
+    return _sink.flush()
 
 
 def log_event(
@@ -28,7 +178,7 @@ def log_event(
     source: Optional[str] = None,
     data: Optional[dict[str, Any]] = None,
 ) -> None:
-    """Best-effort project audit log entry (storage + Mauri ledger)."""
+    """Best-effort project audit log entry (storage + Mauri ledger + Supabase), queued off the request path."""
     event = {
         "ts": datetime.now(timezone.utc).isoformat(),
         "event": event_type,
@@ -36,12 +186,7 @@ def log_event(
         "source": source,
         "data": data or {},
     }
-    try:
-        append_audit(event)
-    except Exception:
-        pass
-    _append_mauri_ledger(event)
-    try:
-        log_audit_event(event_type, detail, source=source, data=data or {})
-    except Exception:
-        pass
+    if AUDIT_ASYNC:
+        get_audit_sink().emit(event)
+    else:
+        write_audit_batch([event])
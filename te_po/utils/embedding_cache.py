@@ -0,0 +1,297 @@
+"""Persistent, content-addressed embedding cache (SQLite, LRU eviction)."""
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence
+
+_DEFAULT_PATH = Path(__file__).resolve().parents[1] / "storage" / "cache" / "embeddings.sqlite3"
+_DEFAULT_MAX_ENTRIES = int(os.getenv("EMBED_CACHE_MAX_ENTRIES", "200000"))
+_DEFAULT_MAX_BYTES = int(os.getenv("EMBED_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+# Hits refresh ``last_used`` in batches: after this many, or this many seconds.
+_TOUCH_BATCH = int(os.getenv("EMBED_CACHE_TOUCH_BATCH", "256"))
+_TOUCH_INTERVAL = float(os.getenv("EMBED_CACHE_TOUCH_INTERVAL", "30"))
+# Eviction trims this fraction below the cap, so it runs once per burst of puts.
+_EVICT_SLACK = 0.05
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> list[float]:
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class EmbeddingCache:
+    """
+    Embedding cache keyed by ``(model, sha256(text))``.
+
+    Vectors are stored as float32 blobs in a single SQLite file. Row count
+    and total size are kept in ``embedding_cache_stats`` by triggers, so
+    writes never scan the table. Hits refresh ``last_used`` in batches;
+    when the cache grows past ``max_entries`` or ``max_bytes`` the least
+    recently used rows are evicted down to a little below the cap.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_entries: int = _DEFAULT_MAX_ENTRIES,
+        max_bytes: int = _DEFAULT_MAX_BYTES,
+    ):
+        self.path = Path(path or os.getenv("EMBED_CACHE_PATH") or _DEFAULT_PATH)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._touched: Dict[tuple, float] = {}  # (model, hash) -> last hit, not yet written
+        self._touch_flushed = time.monotonic()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embedding_cache (
+                    model TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (model, content_hash)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used ON embedding_cache (last_used)"
+            )
+            conn.executescript(
+                """
+                BEGIN;
+                CREATE TABLE IF NOT EXISTS embedding_cache_stats (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    entries INTEGER NOT NULL,
+                    bytes INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO embedding_cache_stats (id, entries, bytes)
+                    SELECT 1, COUNT(*), COALESCE(SUM(size), 0) FROM embedding_cache;
+                CREATE TRIGGER IF NOT EXISTS embedding_cache_ins AFTER INSERT ON embedding_cache BEGIN
+                    UPDATE embedding_cache_stats SET entries = entries + 1, bytes = bytes + new.size WHERE id = 1;
+                END;
+                CREATE TRIGGER IF NOT EXISTS embedding_cache_del AFTER DELETE ON embedding_cache BEGIN
+                    UPDATE embedding_cache_stats SET entries = entries - 1, bytes = bytes - old.size WHERE id = 1;
+                END;
+                CREATE TRIGGER IF NOT EXISTS embedding_cache_upd AFTER UPDATE OF size ON embedding_cache BEGIN
+                    UPDATE embedding_cache_stats SET bytes = bytes + new.size - old.size WHERE id = 1;
+                END;
+                COMMIT;
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, model: str, texts: Sequence[str]) -> Dict[int, list[float]]:
+        """Return ``{index: vector}`` for every text already cached under ``model``."""
+        if not texts:
+            return {}
+        hashes = [content_hash(text) for text in texts]
+        found: Dict[str, bytes] = {}
+        with self._lock:
+            conn = self._connect()
+            unique = list(dict.fromkeys(hashes))
+            # Stay under SQLite's bound-parameter limit.
+            for start in range(0, len(unique), 500):
+                part = unique[start:start + 500]
+                marks = ",".join("?" * len(part))
+                rows = conn.execute(
+                    f"SELECT content_hash, vector FROM embedding_cache WHERE model = ? AND content_hash IN ({marks})",
+                    [model, *part],
+                ).fetchall()
+                found.update(rows)
+            if found:
+                now = time.time()
+                self._touched.update({(model, digest): now for digest in found})
+                if (
+                    len(self._touched) >= _TOUCH_BATCH
+                    or time.monotonic() - self._touch_flushed >= _TOUCH_INTERVAL
+                ):
+                    self._flush_touches(conn)
+            result = {idx: _unpack(found[digest]) for idx, digest in enumerate(hashes) if digest in found}
+            self.hits += len(result)
+            self.misses += len(texts) - len(result)
+        return result
+
+    def get(self, model: str, text: str) -> Optional[list[float]]:
+        return self.get_many(model, [text]).get(0)
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        rows = []
+        now = time.time()
+        for text, vector in zip(texts, vectors):
+            if not vector:
+                continue
+            blob = _pack(vector)
+            rows.append((model, content_hash(text), blob, len(blob), now))
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connect()
+            # An upsert rather than INSERT OR REPLACE: REPLACE's implicit
+            # delete does not fire the stats triggers.
+            conn.executemany(
+                """
+                INSERT INTO embedding_cache (model, content_hash, vector, size, last_used) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (model, content_hash) DO UPDATE SET
+                    vector = excluded.vector, size = excluded.size, last_used = excluded.last_used
+                """,
+                rows,
+            )
+            self._evict(conn)
+
+    def put(self, model: str, text: str, vector: Sequence[float]) -> None:
+        self.put_many(model, [text], [vector])
+
+    def _flush_touches(self, conn: sqlite3.Connection) -> None:
+        """Write buffered hit times to ``last_used`` in one statement batch."""
+        if self._touched:
+            conn.executemany(
+                "UPDATE embedding_cache SET last_used = ? WHERE model = ? AND content_hash = ?",
+                [(ts, model, digest) for (model, digest), ts in self._touched.items()],
+            )
+            self._touched.clear()
+        self._touch_flushed = time.monotonic()
+
+    def _counters(self, conn: sqlite3.Connection) -> tuple:
+        return conn.execute("SELECT entries, bytes FROM embedding_cache_stats WHERE id = 1").fetchone()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        count, total = self._counters(conn)
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Recency has to be current before choosing what to drop.
+        self._flush_touches(conn)
+        target_entries = self.max_entries - int(self.max_entries * _EVICT_SLACK)
+        target_bytes = self.max_bytes - int(self.max_bytes * _EVICT_SLACK)
+        excess = count - target_entries
+        if total > target_bytes and count:
+            # Drop enough rows (by average size) to get back under the byte target.
+            avg = total / count
+            excess = max(excess, int((total - target_bytes) / avg) + 1)
+        conn.execute(
+            """
+            DELETE FROM embedding_cache WHERE rowid IN (
+                SELECT rowid FROM embedding_cache ORDER BY last_used ASC LIMIT ?
+            )
+            """,
+            (excess,),
+        )
+        self.evictions += excess
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            entries, total = self._counters(self._connect())
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._touched.clear()
+            self._connect().execute("DELETE FROM embedding_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._flush_touches(self._conn)
+                self._conn.close()
+                self._conn = None
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def cache_enabled() -> bool:
+    return os.getenv("EMBED_CACHE_DISABLED", "").strip().lower() not in {"1", "true", "yes", "on"}
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmbeddingCache()
+        return _cache
+
+
+def cached_embeddings(
+    texts: Sequence[str],
+    model: str,
+    embed_fn: Callable[[Sequence[str]], Sequence[Sequence[float]]],
+) -> list[list[float]]:
+    """
+    Resolve embeddings for ``texts`` from the cache, calling ``embed_fn`` only
+    for the misses (deduplicated) and storing what it returns.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    if not cache_enabled():
+        return [list(vec) for vec in embed_fn(texts)]
+
+    cache = get_embedding_cache()
+    try:
+        found = cache.get_many(model, texts)
+    except sqlite3.Error:
+        found = {}
+
+    pending: Dict[str, list[int]] = {}
+    for idx, text in enumerate(texts):
+        if idx not in found:
+            pending.setdefault(text, []).append(idx)
+
+    if pending:
+        missing = list(pending)
+        vectors = [list(vec) for vec in embed_fn(missing)]
+        for text, vector in zip(missing, vectors):
+            for idx in pending[text]:
+                found[idx] = vector
+        try:
+            cache.put_many(model, missing, vectors)
+        except sqlite3.Error:
+            pass
+
+    return [found.get(idx, []) for idx in range(len(texts))]
+
+
+__all__ = [
+    "EmbeddingCache",
+    "cache_enabled",
+    "cached_embeddings",
+    "content_hash",
+    "get_embedding_cache",
+]
@@ -1,14 +1,57 @@
 import os
+import threading
+from dataclasses import dataclass
+from typing import Optional
 
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from te_po.core.auth import load_tokens, classify_identity, require_token
+from te_po.core.auth import AuthTokens, classify_identity, get_tokens, reload_tokens, require_token
 from te_po.stealth_ocr import pipeline_token_hash
 
 
-class BearerAuthMiddleware(BaseHTTPMiddleware):
+@dataclass(frozen=True)
+class _AuthConfig:
+    tokens: AuthTokens
+    expected: Optional[str]
+    stealth_hash: Optional[str]
+    human_identity: Optional[str]
+    trace_id: Optional[str]
+
+
+_config: Optional[_AuthConfig] = None
+_config_lock = threading.Lock()
+
+
+def _auth_config() -> _AuthConfig:
+    global _config
+    if _config is None:
+        with _config_lock:
+            if _config is None:
+                tokens = get_tokens()
+                _config = _AuthConfig(
+                    tokens=tokens,
+                    # Prefer human token when configured, else pipeline/service for general protection.
+                    expected=tokens.human or tokens.pipeline or tokens.service,
+                    stealth_hash=pipeline_token_hash(),
+                    human_identity=os.getenv("HUMAN_IDENTITY"),
+                    trace_id=os.getenv("TRACE_ID"),
+                )
+    return _config
+
+
+def reload_auth() -> None:
+    """Re-read bearer tokens, the stealth hash and identity env vars (e.g. after a token rotation)."""
+    global _config
+    with _config_lock:
+        reload_tokens()
+        _config = None
+
+
+class BearerAuthMiddleware:
+    """Bearer auth as a plain ASGI middleware; token config is cached (see ``reload_auth``)."""
+
     UNPROTECTED_PATHS = {
         "/",
         "/heartbeat",
@@ -31,58 +74,64 @@ class BearerAuthMiddleware(BaseHTTPMiddleware):
         "/analysis/documents/latest",
         "/openai_tools.json",
     }
-    UNPROTECTED_PREFIXES = {"/static"}
+    UNPROTECTED_PREFIXES = ("/static",)
     STEALTH_AUTH_PATHS = {"/awa/protocol/event"}
-    STEALTH_HEADER = "x-stealth-token-hash"
+    STEALTH_HEADER = b"x-stealth-token-hash"
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Enforce bearer auth with explicit identity classification.
         Behaviour is preserved:
         - When no token envs are set, requests pass through (legacy mode).
         - STEALTH_AUTH_PATHS accept the hashed pipeline token via header.
         """
-        if request.method in ("OPTIONS", "HEAD"):
-            return await call_next(request)
-
-        path = request.url.path
-        if path in self.UNPROTECTED_PATHS:
-            return await call_next(request)
-
-        for p in self.UNPROTECTED_PREFIXES:
-            if path.startswith(p):
-                return await call_next(request)
+        if scope["type"] != "http" or scope["method"] in ("OPTIONS", "HEAD"):
+            return await self.app(scope, receive, send)
 
-        auth_header = request.headers.get("authorization")
-        stealth_header = request.headers.get(self.STEALTH_HEADER)
-        tokens = load_tokens()
-        expected_hash = pipeline_token_hash()
+        path = scope["path"]
+        if path in self.UNPROTECTED_PATHS or path.startswith(self.UNPROTECTED_PREFIXES):
+            return await self.app(scope, receive, send)
 
+        config = _auth_config()
         # No configured tokens: preserve previous implicit bypass.
-        if not tokens.any_active:
-            return await call_next(request)
+        if not config.tokens.any_active:
+            return await self.app(scope, receive, send)
 
+        auth_header = stealth_header = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                auth_header = value.decode("latin-1")
+            elif name == self.STEALTH_HEADER:
+                stealth_header = value.decode("latin-1")
+
+        state = scope.setdefault("state", {})
         if (
             path in self.STEALTH_AUTH_PATHS
-            and expected_hash
+            and config.stealth_hash
             and stealth_header
-            and stealth_header == expected_hash
+            and stealth_header == config.stealth_hash
         ):
-            request.state.identity_role = "pipeline-stealth"
-            request.state.human_identity = os.getenv("HUMAN_IDENTITY")
-            request.state.trace_id = os.getenv("TRACE_ID")
-            return await call_next(request)
-
-        # Prefer human token when configured, else pipeline/service for general protection.
-        expected = tokens.human or tokens.pipeline or tokens.service
-        require_token(auth_header, expected, token_label="global access")
-
-        role, token_used = classify_identity(tokens, auth_header)
-        request.state.identity_role = role
-        request.state.token_used = token_used
-        request.state.human_identity = os.getenv("HUMAN_IDENTITY")
-        request.state.trace_id = os.getenv("TRACE_ID")
-        return await call_next(request)
+            state["identity_role"] = "pipeline-stealth"
+            state["human_identity"] = config.human_identity
+            state["trace_id"] = config.trace_id
+            return await self.app(scope, receive, send)
+
+        try:
+            require_token(auth_header, config.expected, token_label="global access")
+        except HTTPException as exc:
+            response = JSONResponse({"detail": exc.detail}, status_code=exc.status_code)
+            return await response(scope, receive, send)
+
+        role, token_used = classify_identity(config.tokens, auth_header)
+        state["identity_role"] = role
+        state["token_used"] = token_used
+        state["human_identity"] = config.human_identity
+        state["trace_id"] = config.trace_id
+        return await self.app(scope, receive, send)
+
 
 def apply_bearer_middleware(app: ASGIApp) -> None:
     app.add_middleware(BearerAuthMiddleware)
@@ -2,16 +2,18 @@
 
 from __future__ import annotations
 
+import codecs
 import locale
 import os
+import sys
 import unicodedata
-from typing import Awaitable, Callable
+from functools import lru_cache
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 _MI_NZ_LOCALE = "mi_NZ.UTF-8"
+_CONTENT_LANGUAGE = (b"content-language", _MI_NZ_LOCALE.encode("latin-1"))
 
 
 def _ensure_locale() -> None:
@@ -25,34 +27,142 @@ def _ensure_locale() -> None:
         pass
 
 
-class UnicodeEnforcerMiddleware(BaseHTTPMiddleware):
-    """Normalize textual request bodies to NFC and enforce UTF-8 encoding."""
-
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        content_type = request.headers.get("content-type", "")
-        if content_type.startswith("text/") or "application/json" in content_type:
-            body = await request.body()
-            try:
-                text = body.decode("utf-8")
-            except UnicodeDecodeError:
-                return Response(
-                    status_code=400,
-                    content="Payload must be UTF-8 encoded.",
-                    media_type="text/plain",
-                )
-            normalised = unicodedata.normalize("NFC", text)
-            request._body = normalised.encode("utf-8")  # type: ignore[attr-defined]
-        _ensure_locale()
-        response = await call_next(request)
-        response.headers.setdefault("Content-Language", _MI_NZ_LOCALE)
-        return response
+def _is_textual(content_type: bytes) -> bool:
+    return content_type.startswith(b"text/") or b"application/json" in content_type
+
+
+@lru_cache(maxsize=1)
+def _composes_with_previous() -> frozenset:
+    """Starters (ccc 0) that NFC can merge into the character before them."""
+    found = set()
+    for cp in range(sys.maxunicode + 1):
+        decomposition = unicodedata.decomposition(chr(cp))
+        if decomposition and not decomposition.startswith("<"):
+            parts = decomposition.split()
+            if len(parts) == 2 and unicodedata.combining(chr(int(parts[1], 16))) == 0:
+                found.add(chr(int(parts[1], 16)))
+    # Hangul medial vowels and final consonants join the preceding jamo/syllable.
+    found.update(chr(cp) for cp in range(0x1161, 0x1176))
+    found.update(chr(cp) for cp in range(0x11A8, 0x11C3))
+    return frozenset(found)
+
+
+def _safe_split(text: str) -> int:
+    """
+    Index of the last position where NFC may split ``text``: a stable
+    starter that cannot compose with anything before it. Characters from
+    there on are held back until the next chunk (or end of body).
+    """
+    joiners = _composes_with_previous()
+    for i in range(len(text) - 1, 0, -1):
+        ch = text[i]
+        if (
+            ch not in joiners
+            and unicodedata.combining(ch) == 0
+            and unicodedata.is_normalized("NFC", ch)
+        ):
+            return i
+    return 0
+
+
+class _InvalidUTF8(Exception):
+    pass
+
+
+class _NFCStream:
+    """Incremental UTF-8 decode + NFC normalise of request body chunks."""
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")("strict")
+        self._pending = ""
+
+    def feed(self, chunk: bytes, final: bool) -> bytes:
+        if chunk.isascii() and not self._pending and not self._decoder.getstate()[0]:
+            # ASCII is already NFC; only the last byte may still take a combining mark.
+            if final or not chunk:
+                return chunk
+            self._pending = chr(chunk[-1])
+            return chunk[:-1]
+        try:
+            text = self._pending + self._decoder.decode(chunk, final)
+        except UnicodeDecodeError as exc:
+            raise _InvalidUTF8() from exc
+        if final:
+            cut = len(text)
+        else:
+            cut = _safe_split(text)
+        ready, self._pending = text[:cut], text[cut:]
+        if not unicodedata.is_normalized("NFC", ready):
+            ready = unicodedata.normalize("NFC", ready)
+        return ready.encode("utf-8")
+
+
+class UnicodeEnforcerMiddleware:
+    """Normalize textual request bodies to NFC and enforce UTF-8 encoding (streaming, pure ASGI)."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = False
+
+        async def send_with_language(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+                headers = list(message.get("headers", []))
+                if not any(name.lower() == b"content-language" for name, _ in headers):
+                    headers.append(_CONTENT_LANGUAGE)
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        content_type = b""
+        for name, value in scope["headers"]:
+            if name == b"content-type":
+                content_type = value
+                break
+        if not _is_textual(content_type):
+            return await self.app(scope, receive, send_with_language)
+
+        stream = _NFCStream()
+
+        async def normalised_receive() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                more = message.get("more_body", False)
+                message = {**message, "body": stream.feed(message.get("body", b""), final=not more)}
+            return message
+
+        # Most bodies arrive in one message: check it up front so invalid
+        # UTF-8 is rejected before the app runs, then replay it.
+        try:
+            first = await normalised_receive()
+        except _InvalidUTF8:
+            response = PlainTextResponse("Payload must be UTF-8 encoded.", status_code=400)
+            return await response(scope, receive, send_with_language)
+        replayed = False
+
+        async def replay_receive() -> Message:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return first
+            return await normalised_receive()
+
+        try:
+            await self.app(scope, replay_receive, send_with_language)
+        except _InvalidUTF8:
+            if started:
+                raise
+            response = PlainTextResponse("Payload must be UTF-8 encoded.", status_code=400)
+            await response(scope, receive, send_with_language)
 
 
 def apply_utf8_middleware(app: ASGIApp) -> None:
-    """Attach the Unicode enforcer middleware to the provided app."""
+    """Attach the Unicode enforcer middleware to the provided app (locale is set once, here)."""
     app.add_middleware(UnicodeEnforcerMiddleware)
     _ensure_locale()
+    _composes_with_previous()  # warm the table at startup, not on the first request
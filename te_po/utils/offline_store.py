@@ -1,11 +1,26 @@
-"""Local SQLite fallback store for offline mode."""
+"""Local SQLite fallback store for offline mode.
+
+Each thread keeps one WAL-mode connection per database file and the schema
+is created once per file, so inserts and reads are a single statement.
+Embeddings are stored as float32 BLOBs (rows written by older versions as
+JSON text are still read). Similarity search decodes the BLOBs into one
+NumPy matrix, cached per table until rows are added or removed.
+"""
 from __future__ import annotations
 
 import json
+import os
 import sqlite3
+import threading
 import uuid
+from array import array
 from pathlib import Path
-from typing import Any, Dict, Sequence
+from typing import Any, Dict, Iterable, List, Sequence
+
+try:  # pragma: no cover - numpy is a hard dependency in production
+    import numpy as np
+except Exception:  # pragma: no cover
+    np = None
 
 _DB_PATH = Path("data/kitenga.db")
 _SUPPORTED_TABLES = {
@@ -17,6 +32,10 @@ _SUPPORTED_TABLES = {
     "mauri_logs",
 }
 
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_ready: set[str] = set()
+
 
 def _normalize_table_name(table: str) -> str:
     parts = table.split(".")
@@ -26,10 +45,7 @@ def _normalize_table_name(table: str) -> str:
     return normalized
 
 
-def _ensure_database() -> sqlite3.Connection:
-    _DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(_DB_PATH)
-    conn.row_factory = sqlite3.Row
+def _create_schema(conn: sqlite3.Connection) -> None:
     for table in _SUPPORTED_TABLES:
         conn.execute(
             f"""
@@ -37,46 +53,91 @@ def _ensure_database() -> sqlite3.Connection:
                 id TEXT PRIMARY KEY,
                 content TEXT,
                 metadata TEXT,
-                embedding TEXT,
+                embedding BLOB,
                 status TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
             """
         )
     conn.commit()
+
+
+def _ensure_database() -> sqlite3.Connection:
+    """This thread's connection to ``_DB_PATH`` (opened and migrated once)."""
+    key = str(_DB_PATH)
+    conns: Dict[str, sqlite3.Connection] = getattr(_local, "conns", None) or {}
+    _local.conns = conns
+    conn = conns.get(key)
+    if conn is not None:
+        return conn
+
+    _DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(_DB_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _schema_lock:
+        if key not in _schema_ready:
+            _create_schema(conn)
+            _schema_ready.add(key)
+    conns[key] = conn
     return conn
 
 
+def _encode_embedding(embedding: Any) -> Any:
+    if embedding is None or isinstance(embedding, (bytes, str)):
+        return embedding
+    return array("f", embedding).tobytes()
+
+
+def _decode_embedding(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return array("f", value).tolist()
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value
+    return value
+
+
 def _normalize_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     item = dict(payload)
     item.setdefault("id", str(uuid.uuid4()))
     metadata = item.get("metadata")
     if metadata is not None and not isinstance(metadata, str):
         item["metadata"] = json.dumps(metadata)
-    embedding = item.get("embedding")
-    if embedding is not None and not isinstance(embedding, str):
-        item["embedding"] = json.dumps(embedding)
+    if "embedding" in item:
+        item["embedding"] = _encode_embedding(item["embedding"])
     return item
 
 
-def insert_record(table: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+def insert_records(table: str, payloads: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Insert many rows in one transaction (one prepared statement per column set)."""
     table_name = _normalize_table_name(table)
+    items = [_normalize_payload(p) for p in payloads]
+    if not items:
+        return []
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for item in items:
+        groups.setdefault(tuple(item.keys()), []).append(item)
     conn = _ensure_database()
-    item = _normalize_payload(payload)
-    columns = ", ".join(item.keys())
-    placeholders = ", ".join([":" + key for key in item.keys()])
-    conn.execute(
-        f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})",
-        item,
-    )
-    conn.commit()
-    return _row_to_dict(item)
+    with conn:
+        for keys, rows in groups.items():
+            columns = ", ".join(keys)
+            placeholders = ", ".join(":" + key for key in keys)
+            conn.executemany(f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})", rows)
+    return [_row_to_dict(item) for item in items]
+
+
+def insert_record(table: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return insert_records(table, [payload])[0]
 
 
 def fetch_records(table: str, limit: int | None = None) -> list[Dict[str, Any]]:
     table_name = _normalize_table_name(table)
     conn = _ensure_database()
-    query = f"SELECT * FROM {table_name} ORDER BY datetime(created_at) DESC"
+    query = f"SELECT * FROM {table_name} ORDER BY datetime(created_at) DESC, rowid DESC"
     if limit:
         query += f" LIMIT {int(limit)}"
     rows = conn.execute(query).fetchall()
@@ -89,15 +150,22 @@ def store_embedding(
     embedding: Sequence[float],
     metadata: Dict[str, Any] | None = None,
 ) -> str:
-    record = insert_record(
+    return store_embeddings(table, [(content, embedding, metadata)])[0]
+
+
+def store_embeddings(
+    table: str,
+    items: Iterable[tuple[str, Sequence[float], Dict[str, Any] | None]],
+) -> list[str]:
+    """Bulk ``store_embedding``: ``items`` are ``(content, embedding, metadata)``."""
+    records = insert_records(
         table,
-        {
-            "content": content,
-            "embedding": embedding,
-            "metadata": metadata or {},
-        },
+        (
+            {"content": content, "embedding": embedding, "metadata": metadata or {}}
+            for content, embedding, metadata in items
+        ),
     )
-    return str(record["id"])
+    return [str(record["id"]) for record in records]
 
 
 def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
@@ -114,25 +182,126 @@ def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
     return dot / (norm_a * norm_b)
 
 
+# table -> (version, dim, rowids, normalised matrix, IVF index or None)
+_ann_cache: Dict[str, tuple] = {}
+_cache_lock = threading.Lock()
+
+
+def _table_version(conn: sqlite3.Connection, table_name: str) -> tuple:
+    return tuple(conn.execute(f"SELECT COUNT(*), MAX(rowid) FROM {table_name}").fetchone())
+
+
+def _load_matrix(conn: sqlite3.Connection, table_name: str, dim: int):
+    """Row ids and an L2-normalised float32 matrix of every ``dim``-sized embedding."""
+    rowids: List[int] = []
+    blobs: List[bytes] = []
+    for rowid, blob in conn.execute(
+        f"SELECT rowid, embedding FROM {table_name} "
+        "WHERE typeof(embedding) = 'blob' AND length(embedding) = ? ORDER BY rowid",
+        (dim * 4,),
+    ):
+        rowids.append(rowid)
+        blobs.append(blob)
+    matrix = np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(len(blobs), dim)
+
+    # Rows written before BLOB storage hold JSON text.
+    legacy_ids: List[int] = []
+    legacy_vecs: List[List[float]] = []
+    for rowid, text in conn.execute(
+        f"SELECT rowid, embedding FROM {table_name} WHERE typeof(embedding) = 'text'"
+    ):
+        try:
+            vec = json.loads(text)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(vec, list) and len(vec) == dim:
+            legacy_ids.append(rowid)
+            legacy_vecs.append(vec)
+    if legacy_ids:
+        rowids.extend(legacy_ids)
+        matrix = np.vstack([matrix, np.asarray(legacy_vecs, dtype=np.float32)])
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.asarray(rowids, dtype=np.int64), matrix / norms
+
+
+def _cached_matrix(table_name: str, dim: int, with_ann: bool):
+    conn = _ensure_database()
+    version = _table_version(conn, table_name)
+    with _cache_lock:
+        cached = _ann_cache.get(table_name)
+        if cached is None or cached[0] != version or cached[1] != dim:
+            rowids, matrix = _load_matrix(conn, table_name, dim)
+            cached = (version, dim, rowids, matrix, None)
+        if with_ann and cached[4] is None:
+            from te_po.services.ann_index import ArraySource, IVFIndex
+
+            cached = cached[:4] + (IVFIndex(ArraySource(cached[3]), min_train_rows=1024),)
+        _ann_cache[table_name] = cached
+    return cached
+
+
+def _fetch_by_rowid(table_name: str, rowids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+    if not rowids:
+        return {}
+    conn = _ensure_database()
+    marks = ", ".join("?" for _ in rowids)
+    rows = conn.execute(f"SELECT rowid AS _rowid, * FROM {table_name} WHERE rowid IN ({marks})", list(rowids))
+    out = {}
+    for row in rows:
+        record = _row_to_dict(row)
+        out[record.pop("_rowid")] = record
+    return out
+
+
+def _python_top_k(table: str, query_vector: Sequence[float], top_k: int) -> list[tuple[float, Dict[str, Any]]]:
+    scored: list[tuple[float, Dict[str, Any]]] = []
+    for record in fetch_records(table):
+        embedding = record.get("embedding")
+        if not isinstance(embedding, list) or len(embedding) != len(query_vector):
+            continue
+        scored.append((cosine_similarity(query_vector, embedding), record))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return scored[:top_k]
+
+
 def top_k_embeddings(
     table: str,
     query_vector: Sequence[float],
     top_k: int = 5,
+    mode: str | None = None,
+    nprobe: int | None = None,
 ) -> list[Dict[str, Any]]:
-    records = fetch_records(table)
-    scored: list[tuple[float, Dict[str, Any]]] = []
-    for record in records:
-        embedding = record.get("embedding")
-        if isinstance(embedding, str):
-            embedding = json.loads(embedding)
-        if not isinstance(embedding, Sequence):
-            continue
-        # type: ignore[arg-type]
-        score = cosine_similarity(query_vector, embedding)
-        scored.append((score, record))
-    scored.sort(key=lambda item: item[0], reverse=True)
+    """
+    Rank stored embeddings by cosine similarity to ``query_vector``.
+    ``mode="ann"`` (or ``VECTOR_SEARCH_MODE=ann``) uses an IVF-flat index
+    that is rebuilt only when the table changes; ``nprobe`` tunes recall.
+    """
+    table_name = _normalize_table_name(table)
+    if not query_vector or top_k <= 0:
+        return []
+
+    if np is None:
+        hits = _python_top_k(table, query_vector, top_k)
+    else:
+        use_ann = (mode or os.getenv("VECTOR_SEARCH_MODE", "exact")).strip().lower() == "ann"
+        _, _, rowids, matrix, index = _cached_matrix(table_name, len(query_vector), use_ann)
+        if use_ann:
+            ranked = index.search(query_vector, top_k, nprobe=nprobe)
+        else:
+            from te_po.services.ann_index import _exact_top_k, _normalise
+
+            ranked = _exact_top_k(matrix @ _normalise(query_vector)[0], top_k) if len(matrix) else []
+        records = _fetch_by_rowid(table_name, [int(rowids[row]) for row, _ in ranked])
+        hits = [
+            (score, records[int(rowids[row])])
+            for row, score in ranked
+            if int(rowids[row]) in records
+        ]
+
     results: list[Dict[str, Any]] = []
-    for score, record in scored[:top_k]:
+    for score, record in hits:
         enriched = dict(record)
         enriched["similarity"] = float(score)
         results.append(enriched)
@@ -140,15 +309,20 @@ def top_k_embeddings(
 
 
 def prune_embeddings(table: str, keep: int) -> None:
-    records = fetch_records(table)
-    if len(records) <= keep:
-        return
-    to_delete = records[keep:]
-    conn = _ensure_database()
+    """Keep only the ``keep`` newest rows (one DELETE statement)."""
     table_name = _normalize_table_name(table)
-    for record in to_delete:
-        conn.execute(f"DELETE FROM {table_name} WHERE id = ?", (record["id"],))
-    conn.commit()
+    conn = _ensure_database()
+    with conn:
+        conn.execute(
+            f"""
+            DELETE FROM {table_name} WHERE rowid NOT IN (
+                SELECT rowid FROM {table_name}
+                ORDER BY datetime(created_at) DESC, rowid DESC
+                LIMIT ?
+            )
+            """,
+            (max(0, int(keep)),),
+        )
 
 
 def _row_to_dict(row: Any) -> Dict[str, Any]:
@@ -156,10 +330,11 @@ def _row_to_dict(row: Any) -> Dict[str, Any]:
         result = dict(row)
     else:
         result = {key: row[key] for key in row.keys()}
-    for field in ("metadata", "embedding"):
-        if field in result and isinstance(result[field], str):
-            try:
-                result[field] = json.loads(result[field])
-            except json.JSONDecodeError:
-                pass
+    if "embedding" in result:
+        result["embedding"] = _decode_embedding(result["embedding"])
+    if "metadata" in result and isinstance(result["metadata"], str):
+        try:
+            result["metadata"] = json.loads(result["metadata"])
+        except json.JSONDecodeError:
+            pass
     return result
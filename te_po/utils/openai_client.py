@@ -4,11 +4,13 @@ from __future__ import annotations
 
 import asyncio
 import os
+import threading
 from typing import Sequence, Any
 
 from openai import OpenAI
 
 from te_po.core.config import settings
+from te_po.utils.embedding_cache import cached_embeddings
 
 DEFAULT_BACKEND_MODEL = settings.backend_model or os.environ.get(
     "OPENAI_BACKEND_MODEL", "gpt-5.1"
@@ -31,6 +33,8 @@ except Exception:
 
 
 _last_openai_run_id: str | None = None
+# Per-thread copy, so callers can tell whether *their* call reached OpenAI.
+_thread_run = threading.local()
 
 
 def record_openai_run(response: Any) -> None:
@@ -42,6 +46,7 @@ def record_openai_run(response: Any) -> None:
         run_id = response.get("id") or response.get("request_id")
     if run_id:
         _last_openai_run_id = run_id
+        _thread_run.id = run_id
 
 
 def last_openai_run_id() -> str | None:
@@ -96,16 +101,50 @@ def translate_text(
     return response.output_text.strip()
 
 
-def generate_embedding(text: str) -> Sequence[float]:
+def _request_embeddings(texts: Sequence[str], model: str) -> list[Sequence[float]]:
+    response = client.embeddings.create(
+        model=model,
+        input=list(texts),
+    )
+    record_openai_run(response)
+    ordered = sorted(response.data, key=lambda item: item.index)
+    return [item.embedding for item in ordered]
+
+
+def generate_embedding(text: str, model: str | None = None) -> Sequence[float]:
     if client is None:
         # Deterministic pseudo embedding fallback
         return [float((idx % 7) / 10) for idx in range(32)]
-    response = client.embeddings.create(
-        model=DEFAULT_EMBED_MODEL,
-        input=text,
+    use_model = model or DEFAULT_EMBED_MODEL
+    return cached_embeddings(
+        [text], use_model, lambda batch: _request_embeddings(batch, use_model)
+    )[0]
+
+
+def generate_embedding_with_run(text: str, model: str | None = None) -> tuple[Sequence[float], str | None]:
+    """
+    ``generate_embedding`` plus the id of the OpenAI request that produced
+    the vector, or None when it came from the embedding cache (or the
+    offline fallback) and no request was made.
+    """
+    _thread_run.id = None
+    vector = generate_embedding(text, model=model)
+    return vector, _thread_run.id
+
+
+def generate_embeddings(texts: Sequence[str], model: str | None = None) -> list[Sequence[float]]:
+    """
+    Embed several texts in a single request; vectors come back in input order.
+    Texts already in the embedding cache are not sent to OpenAI.
+    """
+    if not texts:
+        return []
+    if client is None:
+        return [generate_embedding(text) for text in texts]
+    use_model = model or DEFAULT_EMBED_MODEL
+    return cached_embeddings(
+        texts, use_model, lambda batch: _request_embeddings(batch, use_model)
     )
-    record_openai_run(response)
-    return response.data[0].embedding
 
 
 def generate_text(messages: list[dict], model: str | None = None, max_tokens: int = 500) -> str:
@@ -148,3 +187,15 @@ def generate_text(messages: list[dict], model: str | None = None, max_tokens: in
     record_openai_run(resp)
     choice = resp.choices[0] if getattr(resp, "choices", None) else None
     return (choice.message.content or "").strip() if choice else ""
+
+
+def generate_text_with_run(
+    messages: list[dict], model: str | None = None, max_tokens: int = 500
+) -> tuple[str, str | None]:
+    """
+    ``generate_text`` plus the id of the OpenAI request made for it, read
+    from this thread so concurrent calls on a pool don't see each other's.
+    """
+    _thread_run.id = None
+    text = generate_text(messages, model=model, max_tokens=max_tokens)
+    return text, _thread_run.id
@@ -0,0 +1,219 @@
+"""Read-through cache for Supabase table reads (TTL, LRU bound, table invalidation).
+
+Keys are a hash of the canonical JSON of ``(table, filters, limit, order_by,
+desc)``, so dict filters work and equal queries share an entry regardless
+of key order. Each table has a generation number; writes bump it, which
+makes every cached read of that table miss without scanning for keys.
+
+With ``READ_CACHE_REDIS_URL`` set, generations and values also live in
+Redis so API and RQ worker processes share reads and see each other's
+invalidations. The in-process LRU stays in front of Redis.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from te_po.pipeline.metrics import read_cache_hits, read_cache_invalidations, read_cache_misses
+
+logger = logging.getLogger("te_po.read_cache")
+
+READ_CACHE_TTL = float(os.getenv("READ_CACHE_TTL", "30"))
+READ_CACHE_MAX_ENTRIES = int(os.getenv("READ_CACHE_MAX_ENTRIES", "1024"))
+# Per-table overrides, e.g. "kitenga_project_state=300,pipeline_jobs=2"
+READ_CACHE_TABLE_TTLS = os.getenv("READ_CACHE_TABLE_TTLS", "")
+READ_CACHE_DISABLED = os.getenv("READ_CACHE_DISABLED", "").lower() in {"1", "true", "yes"}
+_REDIS_PREFIX = "tepo:read_cache"
+
+
+def _parse_ttls(spec: str) -> Dict[str, float]:
+    ttls: Dict[str, float] = {}
+    for part in spec.split(","):
+        table, _, seconds = part.partition("=")
+        if table.strip() and seconds.strip():
+            try:
+                ttls[table.strip()] = float(seconds)
+            except ValueError:
+                logger.warning("Ignoring bad READ_CACHE_TABLE_TTLS entry %r", part)
+    return ttls
+
+
+def cache_key(table: str, **params: Any) -> str:
+    canonical = json.dumps([table, params], sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResult:
+    """Response-shaped wrapper (``.data`` / ``.count``) for cached rows."""
+
+    data: Any
+    count: Optional[int] = None
+
+
+class ReadThroughCache:
+    def __init__(
+        self,
+        ttl: float = READ_CACHE_TTL,
+        max_entries: int = READ_CACHE_MAX_ENTRIES,
+        table_ttls: Optional[Dict[str, float]] = None,
+        redis_client: Any = None,
+    ):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.table_ttls = dict(table_ttls or {})
+        self.redis = redis_client
+        self._entries: "OrderedDict[str, tuple[float, CachedResult]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, table: str) -> float:
+        return self.table_ttls.get(table, self.ttl)
+
+    # -- generations ---------------------------------------------------
+
+    def _generation(self, table: str) -> int:
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(f"{_REDIS_PREFIX}:gen:{table}")
+                return int(raw or 0)
+            except Exception:
+                pass  # fall back to the local generation
+        with self._lock:
+            return self._generations.get(table, 0)
+
+    def invalidate(self, table: str) -> None:
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+        if self.redis is not None:
+            try:
+                self.redis.incr(f"{_REDIS_PREFIX}:gen:{table}")
+            except Exception:
+                pass
+        read_cache_invalidations.labels(table=table).inc()
+
+    # -- lookups -------------------------------------------------------
+
+    def get_or_load(self, table: str, key: str, loader: Callable[[], Any]) -> Any:
+        generation = self._generation(table)
+        slot = f"{table}:{generation}:{key}"
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(slot)
+                self.hits += 1
+                read_cache_hits.labels(table=table, tier="local").inc()
+                return entry[1]
+
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(f"{_REDIS_PREFIX}:val:{slot}")
+            except Exception:
+                raw = None
+            if raw is not None:
+                value = CachedResult(**json.loads(raw))
+                self._store(slot, value, now + self.ttl_for(table))
+                with self._lock:
+                    self.hits += 1
+                read_cache_hits.labels(table=table, tier="redis").inc()
+                return value
+
+        with self._lock:
+            self.misses += 1
+        read_cache_misses.labels(table=table).inc()
+        result = loader()
+        data = getattr(result, "data", None)
+        if data is None:
+            return result  # errors / empty client results are not cached
+        value = CachedResult(data=data, count=getattr(result, "count", None))
+        ttl = self.ttl_for(table)
+        self._store(slot, value, now + ttl)
+        if self.redis is not None:
+            try:
+                payload = json.dumps({"data": value.data, "count": value.count}, default=str)
+                self.redis.set(f"{_REDIS_PREFIX}:val:{slot}", payload, ex=max(1, int(ttl)))
+            except Exception:
+                pass
+        return value
+
+    def _store(self, slot: str, value: CachedResult, expires_at: float) -> None:
+        with self._lock:
+            self._entries[slot] = (expires_at, value)
+            self._entries.move_to_end(slot)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "redis": self.redis is not None,
+            }
+
+
+def _build_redis():
+    url = os.getenv("READ_CACHE_REDIS_URL")
+    if not url:
+        return None
+    try:
+        from redis import Redis
+
+        client = Redis.from_url(url, socket_timeout=0.25)
+        client.ping()
+        return client
+    except Exception as exc:
+        logger.warning("Read cache Redis tier unavailable (%s); using in-process cache only", exc)
+        return None
+
+
+_cache: Optional[ReadThroughCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_read_cache() -> ReadThroughCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ReadThroughCache(
+                table_ttls=_parse_ttls(READ_CACHE_TABLE_TTLS),
+                redis_client=_build_redis(),
+            )
+        return _cache
+
+
+def invalidate_table(table: str) -> None:
+    """Drop cached reads of ``table`` (call after any write to it)."""
+    get_read_cache().invalidate(table)
+
+
+__all__ = [
+    "CachedResult",
+    "ReadThroughCache",
+    "cache_key",
+    "get_read_cache",
+    "invalidate_table",
+    "READ_CACHE_DISABLED",
+]
@@ -8,7 +8,7 @@ from typing import Any, Dict, List, Optional
 
 from te_po.database.supabase import get_client, insert_with_realm
 from te_po.schema.realms import RealmConfig
-from te_po.utils.openai_client import client as openai_client
+from te_po.utils.openai_client import client as openai_client, generate_embedding
 
 EMBEDDING_MODEL = "text-embedding-3-small"
 OPENAI_VECTOR_FLAG = "ENABLE_OPENAI_VECTOR_RECALL"
@@ -71,8 +71,7 @@ class RecallService:
     def _embed_query(self, query: str) -> List[float]:
         if openai_client is None:
             raise RuntimeError("OpenAI client not configured for recall embeddings.")
-        response = openai_client.embeddings.create(model=EMBEDDING_MODEL, input=query)
-        return response.data[0].embedding  # type: ignore[attr-defined]
+        return list(generate_embedding(query, model=EMBEDDING_MODEL))
 
     def _search_supabase(self, embedding: List[float], top_k: int) -> List[Dict[str, Any]]:
         client = get_client()
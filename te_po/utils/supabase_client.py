@@ -5,9 +5,9 @@ Lightweight Supabase client helpers with safe fallbacks.
 from __future__ import annotations
 
 from typing import Any, Dict, Optional
-from functools import lru_cache
 import logging
 from te_po.core.config import settings
+from te_po.utils.read_cache import READ_CACHE_DISABLED, cache_key, get_read_cache, invalidate_table
 
 try:
     from supabase import create_client  # type: ignore
@@ -52,7 +52,9 @@ def insert_record(table: str, record: Dict[str, Any], upsert: bool = False):
         return {"data": None, "error": "supabase client not configured"}
     try:
         q = supabase.table(table)
-        return (q.upsert(record) if upsert else q.insert(record)).execute()
+        resp = (q.upsert(record) if upsert else q.insert(record)).execute()
+        invalidate_table(table)
+        return resp
     except Exception as exc:
         return {"data": None, "error": str(exc)}
 
@@ -77,10 +79,14 @@ def fetch_records(
         return {"data": None, "error": str(exc)}
 
 
-@lru_cache(maxsize=128)
 def cached_fetch_records(table: str, filters: Optional[Dict[str, Any]] = None, limit: int = 100, order_by: Optional[str] = None, desc: bool = True):
-    """Cached version of fetch_records to reduce latency."""
-    return fetch_records(table, filters, limit, order_by, desc)
+    """Read-through cached fetch_records (per-table TTL, invalidated by writes below)."""
+    if READ_CACHE_DISABLED:
+        return fetch_records(table, filters, limit, order_by, desc)
+    key = cache_key(table, filters=filters, limit=limit, order_by=order_by, desc=desc)
+    return get_read_cache().get_or_load(
+        table, key, lambda: fetch_records(table, filters, limit, order_by, desc)
+    )
 
 
 def fetch_latest(table: str, order_by: str = "created_at"):
@@ -93,7 +99,9 @@ def update_record(table: str, filters: Dict[str, Any], values: Dict[str, Any]):
     try:
         q = supabase.table(table).update(values)
         q = _apply_filters(q, filters)
-        return q.execute()
+        resp = q.execute()
+        invalidate_table(table)
+        return resp
     except Exception as exc:
         return {"data": None, "error": str(exc)}
 
@@ -104,7 +112,9 @@ def delete_record(table: str, filters: Dict[str, Any]):
     try:
         q = supabase.table(table).delete()
         q = _apply_filters(q, filters)
-        return q.execute()
+        resp = q.execute()
+        invalidate_table(table)
+        return resp
     except Exception as exc:
         return {"data": None, "error": str(exc)}
 
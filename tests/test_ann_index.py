@@ -0,0 +1,40 @@
+import numpy as np
+
+from te_po.services.ann_index import ArraySource, IVFIndex, recall_at_k
+from te_po.services.vector_index import VectorIndex
+
+
+def _clustered(rows, dim=32, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim))
+    data = centres[rng.integers(0, clusters, size=rows)] + 0.3 * rng.normal(size=(rows, dim))
+    return data.astype(np.float32), centres
+
+
+def test_ivf_recall_against_exact():
+    data, centres = _clustered(5000)
+    source = ArraySource(data)
+    index = IVFIndex(source, nlist=40, min_train_rows=1)
+    index.sync()
+    assert index.trained
+
+    recall = recall_at_k(source, index, centres, k=10, nprobe=8)
+    assert recall >= 0.9
+    assert recall_at_k(source, index, centres, k=10, nprobe=40) == 1.0
+
+
+def test_ivf_incremental_insert_and_persistence(tmp_path):
+    data, _ = _clustered(600)
+    store = VectorIndex("ann", root=tmp_path)
+    store.add_many([(vec, {"id": f"r{i}"}) for i, vec in enumerate(data[:500])])
+    ann = IVFIndex(store, path=tmp_path / "ivf", nlist=10, min_train_rows=100)
+    assert ann.sync() == 500
+
+    store.add_many([(vec, {"id": f"r{i}"}) for i, vec in enumerate(data[500:], start=500)])
+    row, score = ann.search(data[550], k=1, nprobe=10)[0]
+    assert row == 550 and score > 0.99
+
+    reloaded = IVFIndex(store, path=tmp_path / "ivf", min_train_rows=100)
+    assert reloaded.stats()["indexed_rows"] == 600
+    assert reloaded.search(data[550], k=1)[0][0] == 550
+    assert store.search(data[550], k=1, mode="ann")[0][2]["id"] == "r550"
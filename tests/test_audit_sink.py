@@ -0,0 +1,59 @@
+import json
+import threading
+
+from te_po.services.event_log import EventLog
+from te_po.utils import audit
+from te_po.utils.audit import AuditSink
+
+
+def test_emit_batches_through_background_drainer():
+    batches = []
+    done = threading.Event()
+
+    def writer(batch):
+        batches.append(list(batch))
+        if sum(len(b) for b in batches) >= 5:
+            done.set()
+
+    sink = AuditSink(maxsize=100, batch_size=2, interval=0.05, writer=writer)
+    for i in range(5):
+        assert sink.emit({"event": i})
+    assert done.wait(2)
+    sink.close()
+    assert [e["event"] for b in batches for e in b] == [0, 1, 2, 3, 4]
+    assert all(len(b) <= 2 for b in batches)
+    assert sink.stats["written"] == 5
+
+
+def test_overflow_policies():
+    oldest = AuditSink(maxsize=3, batch_size=100, interval=60, policy="drop_oldest", writer=lambda b: None)
+    newest = AuditSink(maxsize=3, batch_size=100, interval=60, policy="drop_new", writer=lambda b: None)
+    for i in range(5):
+        oldest.emit({"event": i})
+        newest.emit({"event": i})
+    assert [e["event"] for e in oldest._queue] == [2, 3, 4]
+    assert [e["event"] for e in newest._queue] == [0, 1, 2]
+    assert oldest.stats["dropped"] == newest.stats["dropped"] == 2
+
+    sampled = AuditSink(maxsize=100, batch_size=1000, interval=60, policy="sample", sample_rate=4, writer=lambda b: None)
+    for i in range(90):
+        sampled.emit({"event": i})
+    # first 50 are kept, then 1 in 4 of the remaining 40
+    assert sampled.pending() == 60
+    assert sampled.stats["sampled_out"] == 30
+
+
+def test_write_audit_batch_appends_both_files(tmp_path, monkeypatch):
+    audit_log = EventLog(tmp_path / "logs" / "project_audit.jsonl")
+    ledger_log = EventLog(tmp_path / "mauri" / "ledger.jsonl")
+    monkeypatch.setattr(audit, "get_audit_log", lambda: audit_log)
+    monkeypatch.setattr(audit, "get_ledger_log", lambda: ledger_log)
+    sent = []
+    monkeypatch.setattr(audit, "log_audit_events", sent.extend)
+
+    audit.write_audit_batch([{"event": "a"}, {"event": "b"}])
+
+    for log in (audit_log, ledger_log):
+        lines = log.path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["event"] for line in lines] == ["a", "b"]
+    assert [e["event"] for e in sent] == ["a", "b"]
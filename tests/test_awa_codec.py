@@ -0,0 +1,79 @@
+import pytest
+
+from te_hau.awa import codec
+from te_hau.awa.router import Message, MessageType
+from te_hau.core.protocol import AwaEnvelope
+
+
+def _message(payload=None):
+    return Message.create("te_ao", "te_po", MessageType.MEMORY_QUERY, payload or {"query": "kia ora", "top_k": 5})
+
+
+def test_sign_verify_and_tamper_detection():
+    message = _message()
+    message.sign("secret")
+    assert message.auth["alg"] == "hmac-sha256"
+    assert message.verify("secret")
+    assert not message.verify("other")
+
+    message.payload = {"query": "tampered", "top_k": 5}
+    assert not message.verify("secret")
+
+
+def test_legacy_signatures_still_verify():
+    message = _message()
+    message.auth = {
+        "bearer_hash": codec.get_signer("secret").key_id,
+        "signature": message._legacy_signature("secret"),
+    }
+    assert message.verify("secret")
+    assert Message.verify_batch([message, _message()], "secret") == [True, False]
+
+
+def test_payload_serialised_once_per_hop(monkeypatch):
+    calls = []
+    real = codec.canonical_json
+    monkeypatch.setattr(codec, "canonical_json", lambda value: calls.append(value) or real(value))
+
+    message = _message({"text": "ā" * 1000})
+    message.sign("secret")
+    frame = message.to_wire()
+    payload_calls = [c for c in calls if c is message.payload]
+    assert len(payload_calls) == 1
+
+    decoded = Message.from_wire(frame)
+    assert decoded.payload == message.payload
+    assert decoded.verify("secret")
+
+
+@pytest.mark.parametrize("fmt", [codec.MSGPACK, codec.CBOR])
+def test_binary_wire_formats(fmt):
+    pytest.importorskip({"msgpack": "msgpack", "cbor": "cbor2"}[fmt])
+    message = _message({"values": list(range(50))})
+    message.sign("secret")
+    frame = message.to_wire(fmt)
+    assert len(frame) < len(message.to_wire())
+    assert Message.from_wire(frame).verify("secret")
+
+
+def test_frame_errors_are_value_errors():
+    with pytest.raises(ValueError):
+        codec.unpack_frame(b"\x00\x00")
+    with pytest.raises(ValueError):
+        codec.unpack_frame(codec.pack_frame(b"{}")[:-1])
+    with pytest.raises(ValueError):
+        codec.unpack_frame(b"\x09" + codec.pack_frame(b"{}")[1:])
+
+
+def test_envelope_verify_seal_detects_changes():
+    envelope = AwaEnvelope(payload={"task": "translate"})
+    envelope.seal("secret")
+    assert envelope.verify_seal("secret")
+    assert AwaEnvelope.verify_seals([envelope], "wrong") == [False]
+
+    envelope.payload = {"task": "delete"}
+    assert not envelope.verify_seal("secret")
+
+    legacy = AwaEnvelope(payload={"task": "translate"})
+    legacy.mauri_seal = legacy._legacy_seal()
+    assert legacy.verify_seal()
@@ -0,0 +1,130 @@
+import asyncio
+import os
+
+import pytest
+
+from te_hau.awa.router import Message, MessageType, Router
+from te_hau.awa.transport import RedisStreamsTransport, UnixSocketTransport
+
+
+def _echo_router(name, transport):
+    router = Router(name, transport=transport)
+
+    async def on_query(message):
+        reply = Message.create(
+            source_realm=name,
+            target_realm=message.source.realm,
+            msg_type=MessageType.MEMORY_RESULT,
+            payload={"results": [message.payload["query"].upper()]},
+            reply_to=message.id,
+        )
+        await router.send(reply)
+
+    router.on(MessageType.MEMORY_QUERY, on_query)
+    return router
+
+
+async def _round_trip(make_transport):
+    te_po = _echo_router("te_po", make_transport("te_po"))
+    te_ao = Router("te_ao", transport=make_transport("te_ao"))
+    await te_po.start()
+    await te_ao.start()
+    try:
+        results = await asyncio.gather(*(te_ao.query_memory("te_po", f"q{i}") for i in range(20)))
+        assert results == [[f"Q{i}"] for i in range(20)]
+        assert te_ao.pending_responses == {}
+    finally:
+        await te_ao.stop()
+        await te_po.stop()
+
+
+def test_unix_socket_request_response(tmp_path):
+    asyncio.run(asyncio.wait_for(_round_trip(lambda realm: UnixSocketTransport(tmp_path)), 10))
+
+
+def test_unix_socket_reconnects_after_peer_restart(tmp_path):
+    async def run():
+        received = []
+        sender = Router("te_ao", transport=UnixSocketTransport(tmp_path))
+        await sender.start()
+
+        async def start_receiver():
+            router = Router("te_po", transport=UnixSocketTransport(tmp_path))
+            router.on(MessageType.HEARTBEAT, lambda m: received.append(m.payload["n"]))
+            await router.start()
+            return router
+
+        receiver = await start_receiver()
+        await sender.send(Message.create("te_ao", "te_po", MessageType.HEARTBEAT, {"n": 1}))
+        while received != [1]:
+            await asyncio.sleep(0.01)
+        await receiver.stop()
+
+        receiver = await start_receiver()
+        await sender.send(Message.create("te_ao", "te_po", MessageType.HEARTBEAT, {"n": 2}))
+        while 2 not in received:
+            await asyncio.sleep(0.01)
+        peer = sender.transport._peers["te_po"]
+        while peer.unacked:
+            await asyncio.sleep(0.01)
+        await receiver.stop()
+        await sender.stop()
+
+    asyncio.run(asyncio.wait_for(run(), 10))
+
+
+def test_send_without_route_or_transport_still_raises():
+    router = Router("te_ao")
+    with pytest.raises(NotImplementedError):
+        asyncio.run(router.send(Message.create("te_ao", "elsewhere", MessageType.HEARTBEAT, {})))
+
+
+def _redis_client_factory():
+    url = os.getenv("AWA_TEST_REDIS_URL")
+    if url:
+        from redis import asyncio as aioredis
+
+        return lambda: aioredis.from_url(url)
+    fakeredis = pytest.importorskip("fakeredis", reason="needs fakeredis or AWA_TEST_REDIS_URL")
+    server = fakeredis.FakeServer()
+    return lambda: fakeredis.FakeAsyncRedis(server=server)
+
+
+def test_redis_streams_request_response():
+    client = _redis_client_factory()
+    prefix = f"awa:test:{os.getpid()}"
+    asyncio.run(asyncio.wait_for(
+        _round_trip(lambda realm: RedisStreamsTransport(client=client(), prefix=prefix, consumer=realm, block_ms=20)),
+        10,
+    ))
+
+
+def test_redis_streams_redelivers_unacked_entries():
+    client = _redis_client_factory()
+    prefix = f"awa:test:redeliver:{os.getpid()}"
+
+    async def run():
+        sender = Router("te_ao", transport=RedisStreamsTransport(client=client(), prefix=prefix, consumer="te_ao", block_ms=20))
+        await sender.start()
+
+        # A consumer that reads but dies before acking.
+        crashed = RedisStreamsTransport(client=client(), prefix=prefix, consumer="te_po-1", block_ms=20)
+        stream = crashed.stream_for("te_po")
+        await crashed.redis.xgroup_create(stream, crashed.group, id="0", mkstream=True)
+        await sender.send(Message.create("te_ao", "te_po", MessageType.HEARTBEAT, {"n": 1}))
+        await crashed.redis.xreadgroup(crashed.group, "te_po-1", {stream: ">"})
+
+        received = []
+        receiver = Router("te_po", transport=RedisStreamsTransport(
+            client=client(), prefix=prefix, consumer="te_po-2", block_ms=20, claim_idle_ms=0
+        ))
+        receiver.on(MessageType.HEARTBEAT, lambda m: received.append(m.payload["n"]))
+        await receiver.start()
+        while not received:
+            await asyncio.sleep(0.01)
+        await receiver.stop()
+        assert received == [1]
+        assert (await crashed.redis.xpending(stream, crashed.group))["pending"] == 0
+        await sender.stop()
+
+    asyncio.run(asyncio.wait_for(run(), 10))
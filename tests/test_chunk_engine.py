@@ -0,0 +1,43 @@
+from te_po.pipeline.chunker.chunk_engine import chunk_text, iter_chunks
+
+
+TEXT = "\n\n".join(
+    " ".join(f"Sentence {p}.{i} has a few words." for i in range(10)) for p in range(4)
+)
+
+
+def test_chunks_respect_size_and_sentence_boundaries():
+    chunks = chunk_text(TEXT, max_len=120)
+    assert all(len(c) <= 120 for c in chunks)
+    assert all(c.endswith(".") for c in chunks)
+    assert " ".join(" ".join(chunks).split()) == " ".join(TEXT.split())
+
+
+def test_overlap_repeats_trailing_sentences():
+    chunks = list(iter_chunks(TEXT, max_size=120, overlap=40))
+    first_tail = chunks[0].split(". ")[-1]
+    assert chunks[1].startswith(first_tail.rstrip(".").split(" has")[0])
+
+
+def test_streamed_pieces_match_whole_text():
+    pieces = [TEXT[i:i + 37] for i in range(0, len(TEXT), 37)]
+    assert list(iter_chunks(iter(pieces), max_size=150)) == list(iter_chunks(TEXT, max_size=150))
+
+
+def test_token_unit_and_oversized_words():
+    assert all(len(c) <= 40 for c in iter_chunks("x" * 100 + " tail", max_size=40))
+    token_chunks = list(iter_chunks(TEXT, max_size=30, unit="tokens"))
+    assert all((len(c) + 3) // 4 <= 30 for c in token_chunks)
+
+
+def test_te_hau_chunk_text_falls_back_without_te_po(monkeypatch):
+    import sys
+
+    from te_hau.core import ai
+
+    assert ai.chunk_text(TEXT, chunk_size=120) == list(iter_chunks(TEXT, max_size=120, overlap=100))
+
+    monkeypatch.setitem(sys.modules, "te_po.pipeline.chunker.chunk_engine", None)  # import raises ImportError
+    chunks = ai.chunk_text(TEXT, chunk_size=120)
+    assert chunks and all(len(c) <= 120 for c in chunks)
+    assert " ".join(" ".join(chunks).split()) == " ".join(TEXT.split())
@@ -0,0 +1,22 @@
+from te_po.pipeline.embedder import embed_engine
+
+
+def test_plan_batches_caps_size_and_tokens():
+    texts = ["a" * 40] * 5 + ["b" * 400]
+    batches = embed_engine.plan_batches(texts, max_batch_size=2, max_batch_tokens=25)
+    assert batches == [[0, 1], [2, 3], [4], [5]]
+
+
+def test_embed_texts_preserves_input_order(monkeypatch):
+    calls = []
+
+    def fake_generate(inputs, model=None):
+        calls.append(list(inputs))
+        return [[float(len(text))] for text in inputs]
+
+    monkeypatch.setattr(embed_engine, "generate_embeddings", fake_generate)
+    texts = ["x" * n for n in range(1, 11)]
+    vectors = embed_engine.embed_texts(texts, max_batch_size=3, max_concurrency=4)
+
+    assert vectors == [[float(n)] for n in range(1, 11)]
+    assert len(calls) == 4
@@ -0,0 +1,88 @@
+from te_po.utils import embedding_cache
+from te_po.utils.embedding_cache import EmbeddingCache
+
+
+def test_cache_hit_skips_embed_call(tmp_path, monkeypatch):
+    cache = EmbeddingCache(tmp_path / "emb.sqlite3")
+    monkeypatch.setattr(embedding_cache, "_cache", cache)
+    calls = []
+
+    def fake_embed(batch):
+        calls.append(list(batch))
+        return [[float(len(text)), 0.5] for text in batch]
+
+    first = embedding_cache.cached_embeddings(["aa", "bbb", "aa"], "m", fake_embed)
+    second = embedding_cache.cached_embeddings(["bbb", "aa"], "m", fake_embed)
+
+    assert first == [[2.0, 0.5], [3.0, 0.5], [2.0, 0.5]]
+    assert second == [[3.0, 0.5], [2.0, 0.5]]
+    assert calls == [["aa", "bbb"]]
+    assert cache.stats()["hits"] == 2
+
+
+def test_cache_is_keyed_by_model_and_evicts_lru(tmp_path):
+    cache = EmbeddingCache(tmp_path / "emb.sqlite3", max_entries=2)
+    cache.put("m1", "a", [1.0])
+    cache.put("m1", "b", [2.0])
+    assert cache.get("m2", "a") is None
+    assert cache.get("m1", "a") == [1.0]
+    cache.put("m1", "c", [3.0])
+
+    assert cache.get("m1", "b") is None
+    assert cache.get("m1", "a") == [1.0]
+    assert cache.stats()["entries"] == 2
+
+
+def test_run_id_is_none_when_embedding_comes_from_cache(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from te_po.utils import openai_client
+
+    monkeypatch.setattr(embedding_cache, "_cache", EmbeddingCache(tmp_path / "emb.sqlite3"))
+    monkeypatch.setattr(embedding_cache, "cache_enabled", lambda: True)
+    monkeypatch.setattr(openai_client, "_last_openai_run_id", None)
+    responses = iter(["emb-run-1", "emb-run-2"])
+
+    def create(model, input):
+        data = [SimpleNamespace(index=i, embedding=[1.0, float(i)]) for i in range(len(input))]
+        return SimpleNamespace(id=next(responses), data=data)
+
+    monkeypatch.setattr(openai_client, "client", SimpleNamespace(embeddings=SimpleNamespace(create=create)))
+    assert openai_client.generate_embedding_with_run("kia ora", "m") == ([1.0, 0.0], "emb-run-1")
+    assert openai_client.generate_embedding_with_run("kia ora", "m") == ([1.0, 0.0], None)
+    assert openai_client.last_openai_run_id() == "emb-run-1"
+
+
+def test_counters_track_writes_without_scanning(tmp_path):
+    cache = EmbeddingCache(tmp_path / "emb.sqlite3", max_entries=100)
+    cache.put_many("m", ["a", "b", "c"], [[1.0], [2.0], [3.0]])
+    cache.put("m", "a", [1.0, 1.0])  # replace with a bigger vector
+    cache._connect().execute("DELETE FROM embedding_cache WHERE content_hash = ?", (embedding_cache.content_hash("b"),))
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"]) == (2, 12)
+    assert stats["bytes"] == cache._connect().execute("SELECT SUM(size) FROM embedding_cache").fetchone()[0]
+    cache.close()
+
+    reopened = EmbeddingCache(tmp_path / "emb.sqlite3")
+    assert reopened.stats()["entries"] == 2
+
+
+def test_hits_touch_last_used_in_batches_and_eviction_trims_below_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_cache, "_TOUCH_BATCH", 3)
+    cache = EmbeddingCache(tmp_path / "emb.sqlite3", max_entries=40)
+    cache.put_many("m", [str(i) for i in range(40)], [[float(i)] for i in range(40)])
+    last_used = lambda text: cache._connect().execute(
+        "SELECT last_used FROM embedding_cache WHERE content_hash = ?", (embedding_cache.content_hash(text),)
+    ).fetchone()[0]
+    before = last_used("0")
+
+    cache.get_many("m", ["0", "1"])
+    assert last_used("0") == before  # buffered
+    cache.get("m", "2")
+    assert last_used("0") > before  # batch of three written
+
+    cache.get("m", "3")  # buffered, but flushed before eviction picks victims
+    cache.put("m", "new", [1.0])
+    stats = cache.stats()
+    assert stats["entries"] == 38 and stats["evictions"] == 3
+    assert all(cache.get("m", t) is not None for t in ("0", "1", "2", "3", "new"))
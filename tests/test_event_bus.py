@@ -0,0 +1,159 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from te_hau.awa.bus import Event, EventBus, EventHistory, Subscription, SubscriptionIndex
+
+
+def _sub(pattern, realm=None, tags=None):
+    return Subscription(id=pattern + str(realm) + str(tags), pattern=pattern, handler=lambda e: None, realm=realm, tags=tags or set())
+
+
+def test_index_matches_same_as_linear_scan():
+    subs = [
+        _sub("*"),
+        _sub("realm.connected"),
+        _sub("realm.*"),
+        _sub("re*"),
+        _sub("*.completed"),
+        _sub("task.*.done.*"),
+        _sub("realm.*", realm="te_po"),
+        _sub("realm.*", realm="te_ao"),
+        _sub("memory.*", tags={"vector"}),
+    ]
+    index = SubscriptionIndex()
+    for sub in subs:
+        index.add(sub)
+
+    events = [
+        Event.create("realm.connected", "te_po", {}),
+        Event.create("realm.connected", "te_ao", {}),
+        Event.create("task.completed", "te_po", {}),
+        Event.create("task.x.done.y", "te_po", {}),
+        Event.create("memory.stored", "te_po", {}, tags={"vector"}),
+        Event.create("memory.stored", "te_po", {}, tags={"text"}),
+        Event.create("r", "te_po", {}),
+    ]
+    for event in events:
+        expected = {s.id for s in subs if s.matches(event)}
+        assert {s.id for s in index.match(event)} == expected, event.name
+
+    for sub in subs:
+        index.remove(sub)
+    assert all(index.match(e) == [] for e in events)
+    assert index._realms[None]["trie"] == {}
+
+
+def test_slow_subscriber_does_not_block_others_and_reports_lag():
+    async def run():
+        bus = EventBus("te_po", queue_size=2)
+        fast, slow = [], []
+        release = asyncio.Event()
+
+        async def slow_handler(event):
+            await release.wait()
+            slow.append(event.name)
+
+        bus.subscribe("task.*", fast.append)
+        slow_id = bus.subscribe("task.*", slow_handler)
+
+        await bus.publish("task.a", {})
+        await bus.publish("task.b", {})
+        await bus.publish("task.c", {})
+        await asyncio.sleep(0.01)
+        assert [e.name for e in fast] == ["task.a", "task.b", "task.c"]
+        assert bus.stats()[slow_id]["queued"] == 2
+
+        # The slow queue is full, so the next publish waits for it.
+        blocked = asyncio.create_task(bus.publish("task.d", {}))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        release.set()
+        await blocked
+        await bus.drain()
+        assert slow == ["task.a", "task.b", "task.c", "task.d"]
+        stats = bus.stats()[slow_id]
+        assert stats["delivered"] == 4 and stats["queued"] == 0
+        assert stats["max_lag_ms"] > 0
+
+        bus.unsubscribe(slow_id)
+        await bus.publish("task.e", {})
+        await bus.drain()
+        assert slow_id not in bus.stats()
+        assert slow[-1] == "task.d"
+
+    asyncio.run(asyncio.wait_for(run(), 5))
+
+
+def test_handler_errors_keep_worker_running():
+    async def run():
+        bus = EventBus("te_po")
+        seen = []
+
+        def handler(event):
+            if event.payload.get("fail"):
+                raise ValueError("boom")
+            seen.append(event.name)
+
+        sub_id = bus.subscribe("x", handler)
+        await bus.publish("x", {"fail": True})
+        await bus.publish("x", {})
+        await bus.drain()
+        assert seen == ["x"]
+        assert bus.stats()[sub_id]["errors"] == 1
+
+    asyncio.run(run())
+
+
+def _event(name, realm, ts, tags=None):
+    event = Event.create(name, realm, {"n": ts}, tags=tags)
+    event.timestamp = datetime(2026, 1, 1) + timedelta(seconds=ts)
+    return event
+
+
+def test_history_ring_buffer_indexes_match_linear_scan():
+    history = EventHistory(capacity=50)
+    events = []
+    for i in range(200):
+        event = _event(f"task.{i % 4}", f"realm{i % 3}", i, tags={f"t{i % 5}"})
+        events.append(event)
+        history.append(event)
+    live = events[-50:]
+    assert list(history) == live
+    assert sum(len(v) for v in history._by_name.values()) == 50
+
+    cases = [
+        dict(),
+        dict(pattern="task.1"),
+        dict(pattern="task.*", realm="realm2"),
+        dict(tags={"t0", "t3"}),
+        dict(pattern="task.2", tags={"t1"}, since=datetime(2026, 1, 1, 0, 2, 40)),
+        dict(since=datetime(2026, 1, 1, 0, 2, 45), until=datetime(2026, 1, 1, 0, 3, 0)),
+    ]
+    for case in cases:
+        since, until = case.get("since"), case.get("until")
+        sub = Subscription(id="q", pattern=case.get("pattern", "*"), handler=None, realm=case.get("realm"), tags=case.get("tags") or set())
+        expected = [
+            e for e in live
+            if sub.matches(e) and (since is None or e.timestamp >= since) and (until is None or e.timestamp <= until)
+        ]
+        assert history.query(limit=7, **case) == expected[-7:], case
+
+
+def test_history_spills_to_segments_and_reloads(tmp_path):
+    path = tmp_path / "awa" / "history.jsonl"
+    bus = EventBus("te_po", max_history=10, history_path=path)
+    bus.event_history.segment_bytes = 2000
+    for i in range(40):
+        bus.event_history.append(_event("pipeline.completed" if i % 2 else "memory.stored", "te_po", i))
+    assert len(bus.get_history(limit=100)) == 10
+    assert (tmp_path / "awa" / "history.jsonl.1").exists()
+
+    replayed = list(bus.replay_history(pattern="pipeline.*"))
+    assert [e.payload["n"] for e in replayed] == list(range(1, 40, 2))
+    bus.event_history.close()
+
+    restarted = EventHistory(capacity=5, spill_path=path)
+    restarted.load()
+    assert [e.payload["n"] for e in restarted] == list(range(35, 40))
+    assert len(list(restarted.replay())) == 40  # loading does not re-spill
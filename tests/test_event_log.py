@@ -0,0 +1,79 @@
+import json
+
+from te_po.services.event_log import EventLog
+
+
+def _events(n, start=0):
+    return [
+        {"ts": f"2026-01-01T00:{(start + i) // 60:02d}:{(start + i) % 60:02d}+00:00", "event": f"ev{start + i}", "detail": "vector push" if (start + i) % 3 == 0 else "chat"}
+        for i in range(n)
+    ]
+
+
+def test_tail_reads_newest_first_across_rotation(tmp_path):
+    log = EventLog(tmp_path / "project_audit.jsonl", max_bytes=2000, max_segments=50)
+    for i in range(0, 100, 10):
+        log.append(_events(10, i), fsync=False)
+    assert len(log.files()) > 2
+    assert (tmp_path / "project_audit.00001.jsonl").exists()
+    assert [e["event"] for e in log.tail(25)] == [f"ev{i}" for i in range(99, 74, -1)]
+
+
+def test_rotation_prunes_old_segments(tmp_path):
+    log = EventLog(tmp_path / "a.jsonl", max_bytes=100, max_segments=2)
+    for i in range(10):
+        log.append(_events(2, i * 2), fsync=False)
+    assert len(log.files()) == 3  # two rotated + active
+
+
+def test_between_uses_sidecar_index(tmp_path):
+    path = tmp_path / "ledger.jsonl"
+    log = EventLog(path, max_bytes=3000, stride=7)
+    log.append(_events(120), fsync=False)
+    got = log.between("2026-01-01T00:01:00Z", "2026-01-01T00:01:10+00:00")
+    assert [e["event"] for e in got] == [f"ev{i}" for i in range(60, 70)]
+    assert log.index_path.exists()
+
+    # a fresh reader picks the sidecar up and extends it incrementally
+    log.append(_events(5, 120), fsync=False)
+    fresh = EventLog(path, max_bytes=3000, stride=7)
+    assert [e["event"] for e in fresh.between("2026-01-01T00:02:00+00:00")] == [f"ev{i}" for i in range(120, 125)]
+    index = json.loads(log.index_path.read_text())
+    assert sum(f["lines"] for f in index["files"].values()) == 125
+
+
+def test_search_uses_trigrams_and_matches_scan(tmp_path):
+    log = EventLog(tmp_path / "audit.jsonl", max_bytes=1500)
+    log.append(_events(60), fsync=False)
+    hits = log.search("VECTOR", limit=5)
+    assert [e["event"] for e in hits] == ["ev57", "ev54", "ev51", "ev48", "ev45"]
+    assert log.search("nothing like this") == []
+
+    log.append(_events(3, 60), fsync=False)  # picked up incrementally
+    assert log.search("ev61", limit=5)[0]["event"] == "ev61"
+    assert [e["event"] for e in log.search("ev", limit=2)] == ["ev62", "ev61"]  # short needle: scan
+
+
+def test_search_survives_segment_prune_and_inode_reuse(tmp_path):
+    log = EventLog(tmp_path / "audit.jsonl", max_bytes=2000, max_segments=3)
+    for i in range(0, 2000, 10):
+        batch = _events(10, i)
+        for e in batch:
+            e["event"] = f"evt{int(e['event'][2:]):05d}"
+        log.append(batch, fsync=False)
+        log.search("evt00000")  # keep the index warm while segments are pruned
+
+    live = [e["event"] for e in log._scan_search("evt", 10_000)]
+    assert "evt01999" in live and "evt00000" not in live
+    missed = [name for name in live if [e["event"] for e in log.search(name, limit=1)] != [name]]
+    assert missed == []
+    assert len(log._text_files) == len(log.files())
+
+
+def test_between_newest_first_stops_at_limit(tmp_path):
+    log = EventLog(tmp_path / "ledger.jsonl", max_bytes=1500, stride=5)
+    log.append(_events(120), fsync=False)
+    got = log.between("2026-01-01T00:00:30Z", "2026-01-01T00:01:40Z", limit=4, newest_first=True)
+    assert [e["event"] for e in got] == ["ev99", "ev98", "ev97", "ev96"]
+    got = log.between("2026-01-01T00:00:30Z", limit=3, newest_first=True, contains="vector")
+    assert [e["event"] for e in got] == ["ev117", "ev114", "ev111"]
@@ -0,0 +1,149 @@
+from contextlib import contextmanager
+
+from te_po.database import kitenga_db
+
+
+class _Copy:
+    def __init__(self, sink):
+        self.sink = sink
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write_row(self, row):
+        self.sink.append(row)
+
+
+class _Cursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def copy(self, statement):
+        self.conn.statements.append(statement)
+        return _Copy(self.conn.rows)
+
+
+class _Conn:
+    def __init__(self):
+        self.statements, self.rows, self.commits = [], [], 0
+
+    def cursor(self, **kwargs):
+        return _Cursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+class FakePool:
+    def __init__(self):
+        self.conn = _Conn()
+        self.borrowed = 0
+
+    @contextmanager
+    def connection(self):
+        self.borrowed += 1
+        yield self.conn
+
+
+def test_bulk_writers_use_one_pooled_copy(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(kitenga_db, "get_pool", lambda: pool)
+
+    count = kitenga_db.log_events(
+        {"event": f"e{i}", "detail": "d", "data": {"i": i}} for i in range(3)
+    )
+
+    assert count == 3
+    assert pool.borrowed == 1
+    assert pool.conn.statements == ["COPY kitenga.logs (event, detail, source, data) FROM STDIN"]
+    assert [row[0] for row in pool.conn.rows] == ["e0", "e1", "e2"]
+    assert pool.conn.rows[0][2] == "kitenga_whiro"
+    assert pool.conn.rows[1][3].obj == {"i": 1}
+
+
+def test_missing_pool_reports_disconnected(monkeypatch):
+    monkeypatch.setattr(kitenga_db, "get_pool", lambda: None)
+    assert kitenga_db.test_connection()["connected"] is False
+
+
+def test_search_pages_with_keyset_cursor(monkeypatch):
+    seen = {}
+
+    class _SearchCursor:
+        def execute(self, sql, params):
+            seen["sql"], seen["params"] = sql, params
+
+        def fetchall(self):
+            return [
+                {"id": "00000000-0000-0000-0000-000000000001", "score": 0.75, "content": "kia ora"},
+                {"id": "00000000-0000-0000-0000-000000000002", "score": 0.5, "content": "ora"},
+            ]
+
+    @contextmanager
+    def fake_cursor(conn=None):
+        yield _SearchCursor()
+
+    monkeypatch.setattr(kitenga_db, "get_cursor", fake_cursor)
+
+    rows = kitenga_db.search_memory("kia ora", limit=2)
+    assert seen["params"]["after_score"] is None
+    assert "ts_rank_cd" in seen["sql"] and "ts_headline" in seen["sql"]
+
+    cursor = kitenga_db.next_cursor(rows, limit=2)
+    kitenga_db.search_memory("kia ora", limit=2, after=cursor)
+    assert seen["params"]["after_score"] == 0.5
+    assert seen["params"]["after_id"] == "00000000-0000-0000-0000-000000000002"
+
+    kitenga_db.search_memory("kia ora", limit=2, mode="hybrid", query_embedding=[0.5] * 1536)
+    assert "<=>" in seen["sql"] and seen["params"]["emb"].startswith("[0.5,0.5,")
+
+    # an embedding that does not fit vector(1536) falls back to ranked FTS
+    kitenga_db.search_memory("kia ora", limit=2, mode="hybrid", query_embedding=[0.1, 0.2])
+    assert "<=>" not in seen["sql"] and "emb" not in seen["params"]
+
+    assert kitenga_db.next_cursor(rows[:1], limit=2) is None
+
+
+def test_memory_routes_embed_on_write_and_fall_back_to_fts(monkeypatch):
+    from types import SimpleNamespace
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from te_po.routes import kitenga_db as routes
+    from te_po.utils import openai_client
+
+    stored, searched = [], []
+    monkeypatch.setattr(routes, "store_memory", lambda content, metadata, embedding=None: stored.append(embedding) or "m1")
+    monkeypatch.setattr(routes, "search_memory", lambda *a, **kw: searched.append(kw) or [])
+    monkeypatch.setattr(openai_client, "generate_embedding", lambda text, model=None: [0.25] * 1536)
+    monkeypatch.setattr(openai_client, "client", object())
+    app = FastAPI()
+    app.include_router(routes.router)
+    client = TestClient(app)
+
+    assert client.post("/kitenga/db/memory", json={"content": "kia ora"}).json()["embedded"] is True
+    assert len(stored[-1]) == 1536
+    assert client.post("/kitenga/db/memory/search", json={"query": "ora", "mode": "hybrid"}).json()["mode"] == "hybrid"
+    assert searched[-1]["mode"] == "hybrid" and len(searched[-1]["query_embedding"]) == 1536
+
+    # offline: no embedding call, memory stored without one, search degrades to FTS
+    monkeypatch.setattr(openai_client, "client", None)
+    assert client.post("/kitenga/db/memory", json={"content": "kia ora"}).json()["embedded"] is False
+    assert stored[-1] is None
+    assert client.post("/kitenga/db/memory/search", json={"query": "ora", "mode": "hybrid"}).json()["mode"] == "fts"
+    assert searched[-1]["query_embedding"] is None
+
+    # wrong width (e.g. a 3072-dim model) is treated like offline
+    monkeypatch.setattr(openai_client, "client", SimpleNamespace())
+    monkeypatch.setattr(openai_client, "generate_embedding", lambda text, model=None: [0.1] * 3072)
+    assert client.post("/kitenga/db/memory/search", json={"query": "ora", "mode": "hybrid"}).json()["mode"] == "fts"
@@ -0,0 +1,81 @@
+import unicodedata
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from te_po.utils.middleware import auth_middleware
+from te_po.utils.middleware.auth_middleware import BearerAuthMiddleware, reload_auth
+from te_po.utils.middleware.utf8_enforcer import UnicodeEnforcerMiddleware, _NFCStream
+
+
+def _app():
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        body = await request.body()
+        return {"text": body.decode("utf-8"), "role": getattr(request.state, "identity_role", None)}
+
+    @app.get("/private")
+    async def private(request: Request):
+        return {"role": request.state.identity_role}
+
+    app.add_middleware(BearerAuthMiddleware)
+    app.add_middleware(UnicodeEnforcerMiddleware)
+    return app
+
+
+def test_bearer_auth_is_cached_until_reload(monkeypatch):
+    monkeypatch.setenv("HUMAN_BEARER_KEY", "human")
+    monkeypatch.setenv("PIPELINE_TOKEN", "pipe")
+    reload_auth()
+    client = TestClient(_app())
+
+    assert client.get("/private").status_code == 401
+    assert client.get("/private", headers={"Authorization": "Bearer nope"}).status_code == 403
+    assert client.get("/private", headers={"Authorization": "Bearer human"}).json() == {"role": "human"}
+    config = auth_middleware._auth_config()
+
+    monkeypatch.setenv("HUMAN_BEARER_KEY", "rotated")
+    assert client.get("/private", headers={"Authorization": "Bearer human"}).status_code == 200
+    assert auth_middleware._auth_config() is config
+    reload_auth()
+    assert client.get("/private", headers={"Authorization": "Bearer human"}).status_code == 403
+    assert client.get("/private", headers={"Authorization": "Bearer rotated"}).status_code == 200
+
+    monkeypatch.delenv("HUMAN_BEARER_KEY")
+    monkeypatch.delenv("PIPELINE_TOKEN")
+    monkeypatch.delenv("SERVICE_BEARER_KEY", raising=False)
+    reload_auth()
+    assert client.post("/echo", content=b"{}").json()["role"] is None  # no tokens: legacy bypass
+
+
+def test_unicode_enforcer_normalises_and_rejects_bad_utf8(monkeypatch):
+    monkeypatch.delenv("HUMAN_BEARER_KEY", raising=False)
+    monkeypatch.delenv("PIPELINE_TOKEN", raising=False)
+    monkeypatch.delenv("SERVICE_BEARER_KEY", raising=False)
+    reload_auth()
+    client = TestClient(_app())
+
+    decomposed = "Māori"
+    resp = client.post("/echo", content=decomposed.encode("utf-8"), headers={"content-type": "text/plain"})
+    assert resp.json()["text"] == "M\u0101ori"
+    assert resp.headers["content-language"] == "mi_NZ.UTF-8"
+
+    bad = client.post("/echo", content=b"\xff\xfe", headers={"content-type": "text/plain"})
+    assert bad.status_code == 400
+    assert bad.text == "Payload must be UTF-8 encoded."
+
+    raw = client.post("/echo", content=decomposed.encode("utf-8"), headers={"content-type": "application/octet-stream"})
+    assert raw.json()["text"] == decomposed
+
+
+def test_nfc_stream_matches_whole_body_across_chunk_boundaries():
+    text = "kia ora Māori é 각 " * 50
+    data = text.encode("utf-8")
+    expected = unicodedata.normalize("NFC", text).encode("utf-8")
+    for size in (1, 2, 3, 7, 64):
+        stream = _NFCStream()
+        chunks = [data[i:i + size] for i in range(0, len(data), size)]
+        out = b"".join(stream.feed(c, final=(i == len(chunks) - 1)) for i, c in enumerate(chunks))
+        assert out == expected
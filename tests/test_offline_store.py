@@ -0,0 +1,47 @@
+import json
+import sqlite3
+
+import numpy as np
+
+from te_po.utils import offline_store
+
+
+def _use_db(monkeypatch, tmp_path):
+    monkeypatch.setattr(offline_store, "_DB_PATH", tmp_path / "kitenga.db")
+    offline_store._ann_cache.clear()
+
+
+def test_bulk_store_and_exact_top_k(monkeypatch, tmp_path):
+    _use_db(monkeypatch, tmp_path)
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    ids = offline_store.store_embeddings(
+        "embeddings", [(f"text {i}", vec.tolist(), {"i": i}) for i, vec in enumerate(vectors)]
+    )
+    assert len(ids) == 50
+
+    hits = offline_store.top_k_embeddings("embeddings", vectors[7].tolist(), top_k=3)
+    assert hits[0]["metadata"] == {"i": 7}
+    assert hits[0]["similarity"] > 0.999
+    assert np.allclose(hits[0]["embedding"], vectors[7], atol=1e-6)
+
+    raw = sqlite3.connect(tmp_path / "kitenga.db").execute("SELECT typeof(embedding) FROM embeddings LIMIT 1")
+    assert raw.fetchone()[0] == "blob"
+
+
+def test_legacy_json_rows_and_prune(monkeypatch, tmp_path):
+    _use_db(monkeypatch, tmp_path)
+    conn = offline_store._ensure_database()
+    with conn:
+        conn.execute(
+            "INSERT INTO embeddings (id, content, embedding, created_at) VALUES (?, ?, ?, ?)",
+            ("legacy", "old", json.dumps([1.0, 0.0]), "2024-01-01 00:00:00"),
+        )
+    offline_store.store_embedding("embeddings", "new", [0.0, 1.0])
+    offline_store.store_embedding("embeddings", "other dim", [1.0, 0.0, 0.0])
+
+    hits = offline_store.top_k_embeddings("embeddings", [1.0, 0.1], top_k=5)
+    assert [h["content"] for h in hits] == ["old", "new"]
+
+    offline_store.prune_embeddings("embeddings", keep=1)
+    assert [r["content"] for r in offline_store.fetch_records("embeddings")] == ["other dim"]
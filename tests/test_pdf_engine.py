@@ -0,0 +1,48 @@
+from te_po.pipeline.ocr.pdf_engine import extract_pdf_text, iter_pdf_pages
+
+
+def _make_pdf(texts):
+    """Minimal multi-page PDF with one line of Helvetica text per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_ref} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{off:010d} 00000 n \n" for off in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return out
+
+
+def test_all_pages_in_order_past_old_cap():
+    texts = [f"Page number {i} of the document" for i in range(14)]
+    pdf = _make_pdf(texts)
+
+    pages = list(iter_pdf_pages(pdf, workers=1, pages_per_task=3))
+    assert [p.number for p in pages] == list(range(14))
+    assert [p.text for p in pages] == texts
+    assert all(p.method == "text" for p in pages)
+
+
+def test_process_pool_matches_inline(tmp_path):
+    texts = [f"Kupu {i} mo te whakamatautau" for i in range(6)]
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(_make_pdf(texts))
+
+    assert extract_pdf_text(path) == "\n\n".join(texts)
+    parallel = [p.text for p in iter_pdf_pages(path, workers=2, pages_per_task=2)]
+    assert parallel == texts
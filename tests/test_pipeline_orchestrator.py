@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+from te_po.pipeline.orchestrator import pipeline_orchestrator as orchestrator
+
+
+def test_unsupported_files_wait_for_raw_upload(monkeypatch):
+    finished = threading.Event()
+
+    def slow_persist(file_bytes, filename, source, allow_supabase=True):
+        finished.wait(0.05)
+        finished.set()
+        return "raw.bin", None, None
+
+    monkeypatch.setattr(orchestrator, "_persist_raw", slow_persist)
+    result = orchestrator.run_pipeline(b"ID3", "song.mp3")
+    assert result["status"] == "unsupported"
+    assert finished.is_set()
+
+
+def test_unsupported_files_surface_raw_upload_errors(monkeypatch):
+    def failing_persist(file_bytes, filename, source, allow_supabase=True):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(orchestrator, "_persist_raw", failing_persist)
+    with pytest.raises(OSError, match="disk full"):
+        orchestrator.run_pipeline(b"\x00\x01", "blob.xyz")
+
+
+def test_concurrent_summaries_keep_their_own_run_ids(monkeypatch):
+    from types import SimpleNamespace
+
+    from te_po.utils import openai_client
+
+    both_started = threading.Barrier(2, timeout=5)
+
+    def create(model, input, max_output_tokens):
+        run_id = f"run-{max_output_tokens}"
+        openai_client.record_openai_run(SimpleNamespace(id=run_id))
+        both_started.wait()  # the other summary records its run before we return
+        return SimpleNamespace(id=run_id, output_text=f"summary {max_output_tokens}")
+
+    monkeypatch.setattr(openai_client, "client", SimpleNamespace(responses=SimpleNamespace(create=create)))
+    monkeypatch.setattr(openai_client, "_last_openai_run_id", None)
+    short, long = orchestrator._start_summaries("he kōrero")
+    assert short.result() == ("summary 500", "run-500")
+    assert long.result() == ("summary 1800", "run-1800")
+
+    meta = {}
+    for future in (short, long):
+        orchestrator._note_openai_run(meta, future.result()[1])
+    assert meta["openai_run_ids"] == ["run-500", "run-1800"]
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from te_po.pipeline import progress
+from te_po.pipeline.progress import InProcessProgressBroker, make_event
+
+
+def test_in_process_broker_streams_snapshot_then_events():
+    broker = InProcessProgressBroker()
+    broker.publish(make_event("job-1", "queued", 0, status="queued"))
+
+    async def collect():
+        seen = []
+        stream = broker.subscribe(["job-1"], heartbeat=0.05)
+
+        def worker():
+            broker.publish(make_event("job-1", "pipeline", 25, status="running"))
+            broker.publish(make_event("job-1", "embedded", 70))
+            broker.publish(make_event("job-1", "complete", 100, status="done"))
+
+        started = False
+        async for event in stream:
+            if event is None:  # idle heartbeat: subscription is live, start the "worker"
+                if not started:
+                    started = True
+                    threading.Thread(target=worker).start()
+                continue
+            seen.append(event)
+        return seen
+
+    seen = asyncio.run(asyncio.wait_for(collect(), 5))
+    assert [(e["stage"], e["status"]) for e in seen] == [
+        ("queued", "queued"),
+        ("pipeline", "running"),
+        ("embedded", "running"),  # status carried forward from the last transition
+        ("complete", "done"),
+    ]
+    assert broker._subscribers == {}
+
+
+def test_sse_endpoint_ends_for_finished_jobs(monkeypatch):
+    from te_po.routes import pipeline as pipeline_routes
+
+    broker = InProcessProgressBroker()
+    monkeypatch.setattr(progress, "_broker", broker)
+    broker.publish(make_event("a", "complete", 100, status="done"))
+    broker.publish(make_event("b", "error", 100, status="error"))
+    broker.register_batch("batch-1", ["a", "b"])
+
+    app = FastAPI()
+    app.include_router(pipeline_routes.router)
+    client = TestClient(app)
+
+    resp = client.get("/pipeline/batch/batch-1/stream")
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = [json.loads(line[6:]) for line in resp.text.splitlines() if line.startswith("data: {\"")]
+    assert [e["job_id"] for e in events] == ["a", "b"]
+    assert resp.text.rstrip().endswith("event: end\ndata: {}")
+    assert client.get("/pipeline/batch/missing/stream").status_code == 404
+
+
+def test_batch_route_registers_every_file(monkeypatch):
+    from te_po.routes import pipeline as pipeline_routes
+
+    broker = InProcessProgressBroker()
+    monkeypatch.setattr(progress, "_broker", broker)
+    monkeypatch.setattr(pipeline_routes, "SUPA", None)
+    ids = iter(["j1", "j2", "j3"])
+
+    async def fake_enqueue(file):
+        job_id = next(ids)
+        broker.publish(make_event(job_id, "complete", 100, status="done"))
+        return {"job_id": job_id}
+
+    monkeypatch.setattr(pipeline_routes, "enqueue_pipeline", fake_enqueue)
+    app = FastAPI()
+    app.include_router(pipeline_routes.router)
+    client = TestClient(app)
+
+    files = [("files", (f"{n}.txt", b"kia ora", "text/plain")) for n in "abc"]
+    body = client.post("/pipeline/batch", files=files).json()
+    assert body["job_ids"] == ["j1", "j2", "j3"]
+    assert broker.batch_jobs(body["batch_id"]) == ["j1", "j2", "j3"]
+
+    resp = client.get(f"/pipeline/batch/{body['batch_id']}/stream")
+    events = [json.loads(line[6:]) for line in resp.text.splitlines() if line.startswith("data: {\"")]
+    assert [e["job_id"] for e in events] == ["j1", "j2", "j3"]
+
+
+def test_in_process_broker_expires_idle_jobs_and_batches(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(progress, "PROGRESS_TTL", 10)
+    monkeypatch.setattr(progress.time, "monotonic", lambda: clock[0])
+    broker = InProcessProgressBroker()
+    broker.publish(make_event("old", "complete", 100, status="done"))
+    broker.register_batch("b", ["old"])
+    broker.register_batch("b", ["older"])
+    assert broker.batch_jobs("b") == ["old", "older"]
+
+    clock[0] = 5.0
+    broker.publish(make_event("old", "complete", 100, status="done"))  # refreshes "old"
+    clock[0] = 12.0
+    broker.publish(make_event("new", "queued", 0, status="queued"))
+    assert broker.latest("old") is not None and broker.batch_jobs("b") == []
+    clock[0] = 16.0
+    broker.publish(make_event("new", "pipeline", 10))
+    assert broker.latest("old") is None and broker.latest("new")["status"] == "queued"
@@ -0,0 +1,141 @@
+from types import SimpleNamespace
+
+from te_po.utils import supabase_client
+from te_po.utils.read_cache import ReadThroughCache, cache_key
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    def incr(self, key):
+        self.store[key] = int(self.store.get(key, 0)) + 1
+        return self.store[key]
+
+
+def _loader(calls, rows):
+    def load():
+        calls.append(1)
+        return SimpleNamespace(data=rows, count=len(rows))
+
+    return load
+
+
+def test_cache_key_is_canonical_for_dict_filters():
+    a = cache_key("t", filters={"a": 1, "b": 2}, limit=10)
+    b = cache_key("t", limit=10, filters={"b": 2, "a": 1})
+    assert a == b
+    assert a != cache_key("t", filters={"a": 1, "b": 3}, limit=10)
+
+
+def test_hits_ttl_and_invalidation():
+    cache = ReadThroughCache(ttl=60, table_ttls={"fast": 0})
+    calls = []
+    first = cache.get_or_load("t", "k", _loader(calls, [{"id": 1}]))
+    second = cache.get_or_load("t", "k", _loader(calls, [{"id": 2}]))
+    assert first.data == second.data == [{"id": 1}]
+    assert len(calls) == 1
+
+    cache.invalidate("t")
+    assert cache.get_or_load("t", "k", _loader(calls, [{"id": 2}])).data == [{"id": 2}]
+    assert len(calls) == 2
+
+    cache.get_or_load("fast", "k", _loader(calls, [1]))
+    cache.get_or_load("fast", "k", _loader(calls, [1]))
+    assert len(calls) == 4  # zero TTL never hits
+    assert cache.stats()["hits"] == 1
+
+
+def test_errors_are_not_cached_and_lru_bound():
+    cache = ReadThroughCache(ttl=60, max_entries=2)
+    error = {"data": None, "error": "down"}
+    assert cache.get_or_load("t", "k", lambda: error) is error
+    assert cache.stats()["entries"] == 0
+
+    calls = []
+    for key in ("a", "b", "c"):
+        cache.get_or_load("t", key, _loader(calls, [key]))
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["evictions"] == 1
+    cache.get_or_load("t", "a", _loader(calls, ["a"]))
+    assert len(calls) == 4
+
+
+def test_redis_tier_shares_values_and_invalidations():
+    redis = FakeRedis()
+    api, worker = ReadThroughCache(ttl=60, redis_client=redis), ReadThroughCache(ttl=60, redis_client=redis)
+    calls = []
+    api.get_or_load("t", "k", _loader(calls, [{"id": 1}]))
+    assert worker.get_or_load("t", "k", _loader(calls, [{"id": 9}])).data == [{"id": 1}]
+    assert len(calls) == 1
+
+    worker.invalidate("t")
+    assert api.get_or_load("t", "k", _loader(calls, [{"id": 2}])).data == [{"id": 2}]
+
+
+def test_client_writes_invalidate_cached_reads(monkeypatch):
+    rows = [{"id": 1}]
+
+    class Query:
+        def __init__(self, op):
+            self.op = op
+
+        def __getattr__(self, name):
+            return lambda *a, **k: self
+
+        def execute(self):
+            if self.op == "update":
+                rows[0] = {"id": 1, "v": "new"}
+            return SimpleNamespace(data=list(rows), count=len(rows))
+
+    class Client:
+        def table(self, name):
+            return SimpleNamespace(
+                select=lambda *a: Query("select"),
+                update=lambda values: Query("update"),
+            )
+
+    monkeypatch.setattr(supabase_client, "supabase", Client())
+    first = supabase_client.cached_fetch_records("cache_test", filters={"id": 1})
+    supabase_client.update_record("cache_test", {"id": 1}, {"v": "new"})
+    after = supabase_client.cached_fetch_records("cache_test", filters={"id": 1})
+    assert first.data == [{"id": 1}]
+    assert after.data == [{"id": 1, "v": "new"}]
+
+
+def test_project_state_save_invalidates_cached_state(monkeypatch):
+    from te_po.services import project_state_service
+
+    rows = [{"id": "current", "snapshot": {"timestamp": "old"}}]
+
+    class Query:
+        def __init__(self, op, record=None):
+            self.op, self.record = op, record
+
+        def __getattr__(self, name):
+            return lambda *a, **k: self
+
+        def execute(self):
+            if self.op == "upsert":
+                rows[0] = self.record
+            return SimpleNamespace(data=list(rows), count=len(rows))
+
+    class Client:
+        def table(self, name):
+            return SimpleNamespace(select=lambda *a: Query("select"), upsert=lambda record: Query("upsert", record))
+
+    client = Client()
+    monkeypatch.setattr(supabase_client, "supabase", client)
+    monkeypatch.setattr(project_state_service, "get_client", lambda: client)
+    monkeypatch.setattr(project_state_service, "log_event", lambda *a, **k: None)
+
+    read = lambda: supabase_client.cached_fetch_records("kitenga_project_state", filters={"id": "current"})
+    assert read().data[0]["snapshot"] == {"timestamp": "old"}
+    project_state_service.save_project_state({"timestamp": "new"})
+    assert read().data[0]["snapshot"] == {"timestamp": "new"}
@@ -0,0 +1,50 @@
+import threading
+import time
+
+import pytest
+
+from te_po.pipeline.staged import Stage, StagedPipeline
+
+
+def test_results_keep_source_order_across_workers():
+    def slow_double(x):
+        time.sleep(0.001 * (x % 3))
+        return x * 2
+
+    pipeline = StagedPipeline([Stage("double", slow_double, workers=4), Stage("inc", lambda x: x + 1, workers=3)])
+    assert pipeline.run(range(50)) == [x * 2 + 1 for x in range(50)]
+    assert [s["processed"] for s in pipeline.stats()] == [50, 50]
+
+
+def test_bounded_queue_applies_backpressure():
+    produced = []
+    gate = threading.Event()
+
+    def source():
+        for i in range(20):
+            produced.append(i)
+            yield i
+
+    def blocked(x):
+        gate.wait(2)
+        return x
+
+    pipeline = StagedPipeline([Stage("blocked", blocked, workers=1)], queue_size=2)
+    runner = threading.Thread(target=pipeline.run, args=(source(),))
+    runner.start()
+    time.sleep(0.1)
+    # One item in the worker, two queued, one waiting in put().
+    assert len(produced) <= 4
+    gate.set()
+    runner.join()
+    assert len(produced) == 20
+
+
+def test_stage_error_is_raised_in_caller():
+    def boom(x):
+        if x == 3:
+            raise ValueError("bad chunk")
+        return x
+
+    with pytest.raises(ValueError, match="bad chunk"):
+        StagedPipeline([Stage("boom", boom, workers=2)]).run(range(10))
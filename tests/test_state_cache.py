@@ -0,0 +1,50 @@
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from te_po.routes import state as state_routes
+from te_po.state import read_state
+from te_po.state.read_state import StateCache
+
+
+def _write(path, version, mtime):
+    path.write_text(f"version: '{version}'\npublic:\n  realm: te_po\nprivate:\n  key: secret\n", encoding="utf-8")
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_reparses_only_when_file_changes(tmp_path):
+    path = tmp_path / "state.yaml"
+    _write(path, "1.0.0", 1_000_000_000)
+    cache = StateCache(path, interval=0)
+    first = cache.snapshot()
+    assert cache.snapshot() is first
+    assert cache.loads == 1
+
+    _write(path, "1.0.1", 2_000_000_000)
+    second = cache.snapshot()
+    assert cache.loads == 2
+    assert second.state["version"] == "1.0.1"
+    assert second.views["version"][0] == b'"1.0.1"'
+    assert second.views["public"][1] == first.views["public"][1]  # unchanged view keeps its ETag
+    assert second.views["version"][1] != first.views["version"][1]
+
+
+def test_routes_send_etag_and_304(tmp_path, monkeypatch):
+    path = tmp_path / "state.yaml"
+    _write(path, "2.0.0", 1_000_000_000)
+    monkeypatch.setattr(read_state, "_cache", StateCache(path, interval=0))
+    app = FastAPI()
+    app.include_router(state_routes.router)
+    client = TestClient(app)
+
+    resp = client.get("/logs/state/public")
+    assert resp.status_code == 200
+    assert resp.json() == {"realm": "te_po"}
+    etag = resp.headers["etag"]
+
+    cached = client.get("/logs/state/public", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    assert client.get("/logs/state/version").json() == "2.0.0"
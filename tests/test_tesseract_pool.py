@@ -0,0 +1,31 @@
+from te_po.pipeline.ocr.tesseract_pool import TesseractPool
+
+
+def _pool(monkeypatch, **kwargs):
+    pool = TesseractPool(binary="tesseract", use_api=False, **kwargs)
+    runs = []
+
+    def fake_group(group):
+        runs.append(len(group))
+        return [image.decode() for image in group]
+
+    monkeypatch.setattr(pool, "available", lambda: True)
+    monkeypatch.setattr(pool, "_scan_group", fake_group)
+    return pool, runs
+
+
+def test_small_requests_share_one_cli_run(monkeypatch):
+    pool, runs = _pool(monkeypatch, workers=4, batch_size=16)
+    assert pool.scan_many([b"a", b"b", b"c", b"d"]) == ["a", "b", "c", "d"]
+    assert runs == [4]
+
+
+def test_larger_requests_spread_across_workers_in_order(monkeypatch):
+    pool, runs = _pool(monkeypatch, workers=4, batch_size=16)
+    images = [str(i).encode() for i in range(40)]
+    assert pool.scan_many(images) == [str(i) for i in range(40)]
+    assert sorted(runs) == [10, 10, 10, 10]
+
+    runs.clear()
+    pool.scan_many([str(i).encode() for i in range(100)])
+    assert max(runs) == 16
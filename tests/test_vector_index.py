@@ -0,0 +1,93 @@
+import numpy as np
+
+from te_po.services.vector_index import VectorIndex
+
+
+def test_append_and_search_matches_brute_force(tmp_path):
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(200, 16)).astype(np.float32)
+    index = VectorIndex("test", root=tmp_path)
+    index.add_many([(vec.tolist(), {"id": f"r{i}"}) for i, vec in enumerate(vectors[:150])])
+    index.add_many([(vec.tolist(), {"id": f"r{i}"}) for i, vec in enumerate(vectors[150:], start=150)])
+
+    query = rng.normal(size=16)
+    hits = index.search(query.tolist(), k=5)
+
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normed @ (query / np.linalg.norm(query))))[:5]
+    assert [meta["id"] for _, _, meta in hits] == [f"r{i}" for i in expected]
+    assert hits[0][1] >= hits[-1][1]
+
+
+def test_reopen_and_recent(tmp_path):
+    index = VectorIndex("test", root=tmp_path)
+    index.add([1.0, 0.0], {"id": "a"})
+    index.add([0.0, 1.0], {"id": "b"})
+    index.add([1.0, 0.0, 0.0], {"id": "wrong-dim"})
+
+    reopened = VectorIndex("test", root=tmp_path)
+    assert len(reopened) == 2
+    assert [m["id"] for m in reopened.recent(5)] == ["b", "a"]
+    assert reopened.search([0.1, 0.9], k=1)[0][2]["id"] == "b"
+
+
+def _write_rows(root, writer, batches):
+    index = VectorIndex("shared", root=root)
+    for b in range(batches):
+        ids = [writer * 1000 + b * 10 + i for i in range(10)]
+        index.add_many([([k, 1.0, 0.0, 0.0], {"id": k}) for k in ids])
+
+
+def test_concurrent_processes_keep_meta_and_vectors_aligned(tmp_path):
+    import multiprocessing
+
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_write_rows, args=(tmp_path, w, 30)) for w in range(1, 5)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(30)
+        assert p.exitcode == 0
+
+    index = VectorIndex("shared", root=tmp_path)
+    mat = index.vectors()
+    assert len(mat) == 4 * 30 * 10
+    recovered = np.rint(mat[:, 0] / mat[:, 1]).astype(int)
+    assert recovered.tolist() == [index.metadata(row)["id"] for row in range(len(mat))]
+
+
+def _open_shared(start):
+    from te_po.services import vector_index
+
+    start.wait(10)
+    vector_index._open_index("openai")
+
+
+def test_first_use_migration_runs_once_across_processes(tmp_path, monkeypatch):
+    import json
+    import multiprocessing
+    import time
+
+    from te_po.services import vector_index
+
+    records = {f"vec_{i}.json": {"id": f"vec_{i}", "type": "embedding", "text": "t", "vector": [i, 1.0]} for i in range(20)}
+
+    def slow_load(stage, filename):
+        time.sleep(0.005)  # widen the race between the two importers
+        return json.dumps(records[filename])
+
+    monkeypatch.setattr(vector_index, "INDEX_ROOT", tmp_path)
+    monkeypatch.setattr(vector_index, "list_files", lambda stage: list(records))
+    monkeypatch.setattr(vector_index, "load", slow_load)
+    monkeypatch.setattr(vector_index, "_indexes", {})
+
+    ctx = multiprocessing.get_context("fork")
+    start = ctx.Barrier(2)
+    procs = [ctx.Process(target=_open_shared, args=(start,)) for _ in range(2)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(30)
+        assert p.exitcode == 0
+
+    assert len(VectorIndex("openai", root=tmp_path)) == 20
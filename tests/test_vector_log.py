@@ -0,0 +1,60 @@
+import json
+
+from te_po.services.vector_log import VectorLog, migrate_array_log, migrate_flat_segments
+
+
+def _record(i, batch=None):
+    return {"id": f"c{i}", "chunk_id": f"c{i}", "remote": {"batch_id": batch, "file_id": f"f{i % 2}"}}
+
+
+def test_tail_spans_segments_newest_first(tmp_path):
+    log = VectorLog("glyph", root=tmp_path, segment_bytes=200)
+    for i in range(20):
+        log.append([_record(i)])
+
+    assert len(log.segments()) > 1
+    assert [r["id"] for r in log.tail(5)] == ["c19", "c18", "c17", "c16", "c15"]
+    assert len(log.tail(100)) == 20
+
+
+def test_lookups_pick_up_new_appends(tmp_path):
+    log = VectorLog("glyph", root=tmp_path, segment_bytes=300)
+    log.append([_record(i, batch="b1") for i in range(5)])
+    assert log.find_chunk("c3")["id"] == "c3"
+    assert len(log.find_batch("b1")) == 5
+
+    # A second writer (separate instance) appends; the first sees it incrementally.
+    VectorLog("glyph", root=tmp_path, segment_bytes=300).append([_record(i, batch="b2") for i in range(5, 8)])
+    assert log.find_chunk("c7")["remote"]["batch_id"] == "b2"
+    summary = log.batch_summary("b2")
+    assert summary["chunks"] == 3
+    assert summary["file_ids"] == ["f0", "f1"]
+
+
+def test_migrate_and_compact(tmp_path):
+    legacy = tmp_path / "glyph.json"
+    legacy.write_text(json.dumps([_record(i) for i in range(4)] + [_record(1)]), encoding="utf-8")
+    log = VectorLog("glyph", root=tmp_path, segment_bytes=150)
+
+    assert migrate_array_log(log, legacy) == 5
+    assert not legacy.exists()
+    assert (tmp_path / "glyph.json.migrated").exists()
+
+    result = log.compact(dedupe=True)
+    assert result["records"] == 4
+    assert [r["id"] for r in log.iter_records()] == ["c0", "c2", "c3", "c1"]
+    assert log.find_chunk("c1") is not None
+
+
+def test_flat_segments_move_into_log_directory(tmp_path):
+    flat = VectorLog("glyph", root=tmp_path, segment_bytes=150)
+    flat.append([_record(i) for i in range(6)])
+    (tmp_path / "vec_abc.json").write_text("{}", encoding="utf-8")
+    moved = len(flat.segments())
+
+    log = VectorLog("glyph", root=tmp_path / "glyph_log", segment_bytes=150)
+    assert migrate_flat_segments(log, tmp_path) == moved
+    assert flat.segments() == [] and (tmp_path / "vec_abc.json").exists()
+    assert [r["id"] for r in log.iter_records()] == [f"c{i}" for i in range(6)]
+    log.append([_record(6)])
+    assert log.tail(1)[0]["id"] == "c6"
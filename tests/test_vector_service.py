@@ -0,0 +1,76 @@
+import json
+from types import SimpleNamespace
+
+from te_po.services import vector_service
+from te_po.services.vector_log import VectorLog
+
+
+class FakeOpenAI:
+    def __init__(self):
+        self.uploads, self.batches = [], []
+        self.files = SimpleNamespace(create=self._create_file)
+        self.beta = SimpleNamespace(vector_stores=SimpleNamespace(file_batches=SimpleNamespace(create=self._create_batch)))
+
+    def _create_file(self, file, purpose):
+        name, stream = file
+        self.uploads.append((name, stream.read()))
+        return SimpleNamespace(id=f"file-{len(self.uploads)}")
+
+    def _create_batch(self, vector_store_id, file_ids):
+        self.batches.append((vector_store_id, list(file_ids)))
+        return SimpleNamespace(id="vsfb-1", status="in_progress")
+
+
+def _chunks(n):
+    return [{"chunk_id": f"c{i}", "text": f"kōrero {i} " * 10, "embedding": [0.1, 0.2]} for i in range(n)]
+
+
+def test_bulk_push_splits_uploads_and_attaches_one_batch(tmp_path, monkeypatch):
+    fake = FakeOpenAI()
+    log = VectorLog("glyph", root=tmp_path)
+    monkeypatch.setattr(vector_service, "client", fake)
+    monkeypatch.setattr(vector_service, "VECTOR_STORE_ID", "vs-1")
+    monkeypatch.setattr(vector_service, "get_vector_log", lambda name: log)
+    monkeypatch.setattr(vector_service, "log_event", lambda *a, **kw: None)
+
+    result = vector_service.push_chunk_embeddings(_chunks(12), metadata={"source": "t"}, run_id="run", max_bytes=600)
+
+    assert len(fake.uploads) > 1
+    for name, payload in fake.uploads:
+        assert name.startswith("chunks_run_") and name.endswith(".txt")
+        assert len(payload) <= 600
+    lines = [json.loads(line) for _, payload in fake.uploads for line in payload.decode().splitlines()]
+    assert [r["id"] for r in lines] == [f"c{i}" for i in range(12)]
+    assert lines[0]["metadata"] == {"source": "t"}
+
+    file_ids = [f"file-{n}" for n in range(1, len(fake.uploads) + 1)]
+    assert fake.batches == [("vs-1", file_ids)]
+    assert result["pushed"] is True and result["batch_id"] == "vsfb-1"
+
+    expected = {}
+    for file_id, (_, payload) in zip(file_ids, fake.uploads):
+        expected.update({json.loads(line)["id"]: file_id for line in payload.decode().splitlines()})
+    assert result["chunk_files"] == expected
+
+    logged = {r["chunk_id"]: r["remote"] for r in log.iter_records()}
+    assert {cid: remote["file_id"] for cid, remote in logged.items()} == expected
+    assert all(remote["batch_id"] == "vsfb-1" for remote in logged.values())
+
+
+def test_bulk_push_offline_still_logs_each_chunk(tmp_path, monkeypatch):
+    log = VectorLog("glyph", root=tmp_path)
+    monkeypatch.setattr(vector_service, "client", None)
+    monkeypatch.setattr(vector_service, "get_vector_log", lambda name: log)
+
+    result = vector_service.push_chunk_embeddings(_chunks(3) + [{"chunk_id": "empty", "text": "", "embedding": []}])
+
+    assert result["pushed"] is False and result["chunk_files"] == {}
+    assert [r["chunk_id"] for r in log.iter_records()] == ["c0", "c1", "c2"]
+    assert all(r["remote"]["file_id"] is None for r in log.iter_records())
+
+
+def test_bulk_segments_keep_oversized_records_whole():
+    records = [{"id": "a", "text": "x"}, {"id": "big", "text": "y" * 500}, {"id": "b", "text": "z"}]
+    segments = vector_service._bulk_segments(records, max_bytes=100)
+    assert [ids for _, ids in segments] == [["a"], ["big"], ["b"]]
+    assert b"".join(payload for payload, _ in segments).count(b"\n") == 3
@@ -0,0 +1,65 @@
+import random
+
+from te_hau.awa.whakapapa import WhakapapaGraph
+
+
+def _naive_descendant(graph, ancestor_id, realm_id):
+    current = graph.nodes[realm_id].parent_id
+    while current:
+        if current == ancestor_id:
+            return True
+        current = graph.nodes[current].parent_id if current in graph.nodes else None
+    return False
+
+
+def test_interval_labels_match_parent_chains(tmp_path, monkeypatch):
+    graph = WhakapapaGraph(storage_path=tmp_path / "whakapapa.json")
+    monkeypatch.setattr(graph, "save", lambda: None)
+    rng = random.Random(7)
+    ids = []
+    for i in range(300):
+        parent = rng.choice(ids) if ids and rng.random() < 0.9 else None
+        if ids and rng.random() < 0.3:
+            parent = ids[-1]  # deep chains exhaust label gaps and force rebuilds
+        graph.add_realm(f"r{i}", f"realm {i}", parent_id=parent)
+        ids.append(f"r{i}")
+        if i % 50 == 0:
+            leaves = [r for r in ids if not graph.get_children(r)]
+            victim = rng.choice(leaves)
+            graph.remove_realm(victim)
+            ids.remove(victim)
+
+    for _ in range(3000):
+        a, b = rng.choice(ids), rng.choice(ids)
+        assert graph.is_ancestor(a, b) == _naive_descendant(graph, a, b), (a, b)
+        assert graph.can_access(a, b) == (a == b or _naive_descendant(graph, a, b))
+
+    root = graph.get_children(None)[0].realm_id
+    assert {n.realm_id for n in graph.get_descendants(root)} == {r for r in ids if _naive_descendant(graph, root, r)}
+
+
+def test_link_index_and_permissions(tmp_path):
+    path = tmp_path / "whakapapa.json"
+    graph = WhakapapaGraph(storage_path=path)
+    graph.add_realm("te_po", "Te Pō")
+    graph.add_realm("te_ao", "Te Ao")
+    graph.add_realm("child", "Child", parent_id="te_po")
+    graph.add_link("te_ao", "child", "reference", permissions={"read"})
+    graph.add_link("te_ao", "child", "trust", permissions={"write"})
+    graph.add_link("te_po", "te_ao", "trust", permissions={"*"}, bidirectional=True)
+
+    assert graph.can_access("te_ao", "child", "write")  # any link between the pair counts
+    assert not graph.can_access("te_ao", "child", "admin")
+    assert not graph.can_access("child", "te_ao")
+    assert graph.can_access("te_ao", "te_po", "anything")  # bidirectional wildcard
+    assert [n.realm_id for n in graph.get_linked("te_ao")] == ["child", "child", "te_po"]
+
+    graph.remove_link("te_ao", "child", "trust")
+    assert not graph.can_access("te_ao", "child", "write")
+
+    reloaded = WhakapapaGraph(storage_path=path)
+    assert reloaded.can_access("te_po", "child")
+    assert reloaded.can_access("te_ao", "child", "read")
+    reloaded.remove_realm("child")
+    assert reloaded.get_link_permissions("te_ao", "child") is None
+    assert len(reloaded.links) == 1
@@ -0,0 +1,92 @@
+from te_po.services.supabase_service import WriteBehindBuffer
+
+
+class _Query:
+    def __init__(self, client, table, op, payload):
+        self.client, self.table, self.op, self.payload = client, table, op, payload
+        self.filters = []
+
+    def eq(self, col, value):
+        self.filters.append((col, value))
+        return self
+
+    def execute(self):
+        if self.client.failures:
+            self.client.failures -= 1
+            raise RuntimeError("supabase down")
+        self.client.calls.append((self.table, self.op, self.payload, self.filters))
+
+
+class _Table:
+    def __init__(self, client, name):
+        self.client, self.name = client, name
+
+    def insert(self, rows):
+        return _Query(self.client, self.name, "insert", rows)
+
+    def upsert(self, rows, on_conflict=None):
+        return _Query(self.client, self.name, "upsert", rows)
+
+    def update(self, values):
+        return _Query(self.client, self.name, "update", values)
+
+
+class FakeClient:
+    def __init__(self, failures=0):
+        self.calls = []
+        self.failures = failures
+
+    def table(self, name):
+        return _Table(self, name)
+
+
+def _buffer(client, tmp_path, **kwargs):
+    kwargs.setdefault("interval", 60)
+    return WriteBehindBuffer(spill_dir=tmp_path, max_backoff=0, client_factory=lambda: client, **kwargs)
+
+
+def test_rows_coalesce_into_bulk_requests(tmp_path):
+    client = FakeClient()
+    buf = _buffer(client, tmp_path)
+    for i in range(5):
+        buf.add("kitenga_logs", {"event": f"e{i}"})
+    buf.add("kitenga_pipeline_runs", {"source": "a"}, op="upsert")
+    buf.update("pipeline_jobs", {"id": "j1"}, {"status": "running"})
+    buf.update("pipeline_jobs", {"id": "j1"}, {"progress": 50})
+
+    assert buf.flush() == {"flushed": 7, "spilled": 0}
+    by_table = {call[0]: call for call in client.calls}
+    assert len(client.calls) == 3
+    assert len(by_table["kitenga_logs"][2]) == 5
+    assert by_table["pipeline_jobs"][2] == {"status": "running", "progress": 50}
+    assert by_table["pipeline_jobs"][3] == [("id", "j1")]
+
+
+def test_retry_then_spill_and_replay(tmp_path):
+    client = FakeClient(failures=1)
+    buf = _buffer(client, tmp_path, max_retries=2)
+    buf.add("kitenga_logs", {"event": "retried"})
+    assert buf.flush() == {"flushed": 1, "spilled": 0}
+    assert buf.stats["retries"] == 1
+
+    client.failures = 10
+    buf.add("kitenga_logs", {"event": "spilled"})
+    assert buf.flush() == {"flushed": 0, "spilled": 1}
+    assert (tmp_path / "pending.jsonl").exists()
+
+    client.failures = 0
+    buf.add("kitenga_logs", {"event": "next"})
+    buf.flush()  # succeeds and re-queues the spilled row
+    buf.flush()
+    events = [row["event"] for call in client.calls for row in call[2]]
+    assert events == ["retried", "next", "spilled"]
+    assert not (tmp_path / "pending.jsonl").exists()
+
+
+def test_background_flush_on_batch_size(tmp_path):
+    client = FakeClient()
+    buf = _buffer(client, tmp_path, batch_size=3)
+    for i in range(3):
+        buf.add("kitenga_logs", {"event": i})
+    buf.close()
+    assert sum(len(call[2]) for call in client.calls) == 3